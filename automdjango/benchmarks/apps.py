@@ -0,0 +1,6 @@
+from django.apps import AppConfig
+
+
+class BenchmarksConfig(AppConfig):
+    name = "automdjango.benchmarks"
+    verbose_name = "Driver benchmarks"
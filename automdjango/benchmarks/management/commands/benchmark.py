@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand, CommandError
+from automdjango.benchmarks.suite import (
+    DEFAULT_THRESHOLD,
+    SCENARIOS,
+    BenchmarkRunner,
+    FixtureServer,
+    compare,
+    load_baseline,
+    save_baseline,
+)
+
+
+class Command(BaseCommand):
+    help = "Benchmark driver operations against the local fixture site and compare with a saved baseline"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=20, help="repetitions of every warm scenario")
+        parser.add_argument("--cold-iterations", type=int, default=3, help="sessions started for cold start/teardown")
+        parser.add_argument("--baseline", default=".automd_benchmark.json", help="baseline JSON to compare with")
+        parser.add_argument("--save-baseline", action="store_true", help="store this run as the new baseline")
+        parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                            help="allowed median slowdown as a fraction (0.1 = 10%%)")
+
+    def handle(self, *args, **options):
+        with FixtureServer() as site:
+            results = BenchmarkRunner(site.url, options["iterations"], options["cold_iterations"]).run()
+
+        self.stdout.write(f"{'scenario':<18}{'median':>10}{'p95':>10}{'stddev':>10}{'ops/s':>10}  (ms)")
+        for name in SCENARIOS:
+            summary = results[name]
+            self.stdout.write(
+                f"{name:<18}{summary['median']:>10.2f}{summary['p95']:>10.2f}{summary['stddev']:>10.2f}"
+                f"{summary['perSecond'] or 0:>10.1f}"
+            )
+
+        baseline = load_baseline(options["baseline"])
+        if options["save_baseline"]:
+            save_baseline(options["baseline"], results, options["iterations"])
+            self.stdout.write(self.style.SUCCESS(f"Baseline saved to {options['baseline']}"))
+        if baseline is None:
+            return
+        regressions = compare(results, baseline, options["threshold"])
+        for regression in regressions:
+            self.stdout.write(self.style.ERROR(
+                f"{regression['scenario']}: median {regression['baseline']:.2f} -> {regression['current']:.2f} ms "
+                f"(+{regression['change']:.0%})"
+            ))
+        if regressions and not options["save_baseline"]:
+            raise CommandError(f"{len(regressions)} scenario(s) slower than the baseline by more than {options['threshold']:.0%}")
+        if not regressions:
+            self.stdout.write(self.style.SUCCESS(f"No regressions beyond {options['threshold']:.0%} of {options['baseline']}"))
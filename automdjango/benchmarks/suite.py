@@ -0,0 +1,196 @@
+"""Driver-operation benchmarks against the fixture site served by this Django project.
+
+``FixtureServer`` serves ``automdjango.urls`` on localhost; ``BenchmarkRunner``
+points sessions at it through the AUTOMD_PROTOCOL/URL/PATH overrides, so even
+the initial navigation of a cold start never leaves the machine. Timings are in
+milliseconds. ``compare`` flags scenarios whose median got slower than a saved
+baseline by more than a threshold.
+"""
+import os
+import json
+import time
+import logging
+import platform
+import statistics
+import threading
+from contextlib import contextmanager
+from socketserver import ThreadingMixIn
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+from django.core.wsgi import get_wsgi_application
+from django.utils import timezone
+from selenium.webdriver.common.by import By
+from automdjango.srcode.drivers.instrumentation import percentile
+
+SCENARIOS = ("cold_start", "warm_navigation", "find_element", "click", "script_roundtrip", "teardown")
+DEFAULT_THRESHOLD = 0.10
+ITEMS_ON_PAGE = 200
+
+
+def summarize(samples: list) -> dict:
+    """Median, p95, standard deviation and throughput of millisecond samples."""
+    ordered = sorted(samples)
+    if not ordered:
+        return {"n": 0}
+    return {
+        "n": len(ordered),
+        "median": round(statistics.median(ordered), 3),
+        "p95": round(percentile(ordered, 0.95), 3),
+        "stddev": round(statistics.stdev(ordered), 3) if len(ordered) > 1 else 0.0,
+        "min": round(ordered[0], 3),
+        "max": round(ordered[-1], 3),
+        "perSecond": round(1000 * len(ordered) / sum(ordered), 2) if sum(ordered) else None,
+    }
+
+
+class _ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+
+class _QuietHandler(WSGIRequestHandler):
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FixtureServer:
+    """The Django project on an ephemeral localhost port, in a background thread."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.server = make_server(
+            host, port, get_wsgi_application(), server_class=_ThreadingWSGIServer, handler_class=_QuietHandler
+        )
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/bench/"
+
+    def start(self) -> "FixtureServer":
+        self._thread = threading.Thread(target=self.server.serve_forever, name="bench-fixtures", daemon=True)
+        self._thread.start()
+        logging.info(f"🏁 Benchmark fixture site serving at {self.url}")
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+@contextmanager
+def _site(url: str):
+    """Make PropertiesLoader().getWebsite() return ``url`` for sessions started inside the block."""
+    protocol, _, rest = url.partition("://")
+    host, _, path = rest.partition("/")
+    overrides = {"AUTOMD_PROTOCOL": f"{protocol}://", "AUTOMD_URL": host, "AUTOMD_PATH": f"/{path}"}
+    previous = {name: os.environ.get(name) for name in overrides}
+    os.environ.update(overrides)
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def _timed(samples: list, operation, *args):
+    start = time.perf_counter()
+    result = operation(*args)
+    samples.append((time.perf_counter() - start) * 1000)
+    return result
+
+
+def _default_factory():
+    from automdjango.srcode.drivers.driverpreparation import DriverPreparation
+
+    return DriverPreparation()
+
+
+class BenchmarkRunner:
+    """Runs every scenario against ``baseUrl`` and returns a summary per scenario.
+
+    Cold start and teardown are measured over ``coldIterations`` fresh sessions;
+    the warm scenarios repeat ``iterations`` times on the last one.
+    """
+
+    def __init__(self, baseUrl: str, iterations: int = 20, coldIterations: int = 3, factory=None):
+        if iterations < 1 or coldIterations < 1:
+            raise ValueError("iterations and coldIterations must be at least 1")
+        self.baseUrl = baseUrl
+        self.iterations = iterations
+        self.coldIterations = coldIterations
+        self.factory = factory or _default_factory
+
+    def run(self) -> dict:
+        samples = {name: [] for name in SCENARIOS}
+        with _site(self.baseUrl):
+            for cold in range(self.coldIterations):
+                session = _timed(samples["cold_start"], self.factory)
+                if cold < self.coldIterations - 1:
+                    _timed(samples["teardown"], session.quit)
+        try:
+            self.__warm(session, samples)
+        finally:
+            _timed(samples["teardown"], session.quit)
+        return {name: summarize(values) for name, values in samples.items()}
+
+    def __warm(self, session, samples: dict):
+        for i in range(self.iterations):
+            _timed(samples["warm_navigation"], session.navigateTo, f"{self.baseUrl}page/{i % 10}/")
+
+        session.navigateTo(f"{self.baseUrl}items/?n={ITEMS_ON_PAGE}")
+        for i in range(self.iterations):
+            # stride through the list so consecutive lookups hit different elements
+            _timed(samples["find_element"], session.find_element, (By.ID, f"item-{i * 37 % ITEMS_ON_PAGE}"))
+
+        session.navigateTo(f"{self.baseUrl}click/")
+        counter = session.find_element((By.ID, "counter"))
+        for _ in range(self.iterations):
+            _timed(samples["click"], session.click_on_element, counter)
+
+        driver = session.getDriver()
+        for _ in range(self.iterations):
+            _timed(samples["script_roundtrip"], driver.execute_script, "return document.readyState;")
+
+
+def compare(results: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> list:
+    """Scenarios whose median is more than ``threshold`` (a fraction) slower than the baseline's."""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous or not previous.get("median") or not current.get("n"):
+            continue
+        change = current["median"] / previous["median"] - 1
+        if change > threshold:
+            regressions.append({
+                "scenario": name, "baseline": previous["median"], "current": current["median"],
+                "change": round(change, 3),
+            })
+    return regressions
+
+
+def save_baseline(path: str, results: dict, iterations: int):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as handle:
+        json.dump({
+            "createdAt": timezone.now().isoformat(),
+            "host": platform.node(),
+            "iterations": iterations,
+            "results": results,
+        }, handle, indent=2, sort_keys=True)
+
+
+def load_baseline(path: str):
+    try:
+        with open(path) as handle:
+            return json.load(handle)
+    except FileNotFoundError:
+        return None
@@ -0,0 +1,11 @@
+from django.urls import path
+from automdjango.benchmarks import views
+
+app_name = "benchmarks"
+
+urlpatterns = [
+    path("", views.index, name="index"),
+    path("page/<int:number>/", views.article, name="page"),
+    path("items/", views.items, name="items"),
+    path("click/", views.click, name="click"),
+]
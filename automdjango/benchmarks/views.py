@@ -0,0 +1,51 @@
+"""Deterministic fixture pages for the driver benchmarks.
+
+Every page is generated from its URL alone (no database, no randomness, no
+external assets), so timings depend on the driver and Chrome, not on the content.
+"""
+from django.http import HttpResponse
+from django.views.decorators.http import require_GET
+
+MAX_ITEMS = 5000
+
+_PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head><meta charset="utf-8"><title>{title}</title></head>
+<body>
+<h1 id="title">{title}</h1>
+{body}
+</body>
+</html>
+"""
+
+
+def _page(title: str, body: str) -> HttpResponse:
+    response = HttpResponse(_PAGE.format(title=title, body=body))
+    response["Cache-Control"] = "no-store"
+    return response
+
+
+@require_GET
+def index(request):
+    links = "\n".join(f'<a id="page-{n}" href="page/{n}/">page {n}</a>' for n in range(10))
+    return _page("Benchmark fixtures", f"<nav>{links}</nav>")
+
+
+@require_GET
+def article(request, number: int):
+    paragraphs = "\n".join(f"<p class=\"para\">Paragraph {i} of page {number}.</p>" for i in range(20))
+    return _page(f"Page {number}", f'<article id="article-{number}">{paragraphs}</article>')
+
+
+@require_GET
+def items(request):
+    count = min(int(request.GET.get("n", 200)), MAX_ITEMS)
+    rows = "\n".join(f'<li id="item-{i}" class="item" data-index="{i}">Item {i}</li>' for i in range(count))
+    return _page(f"{count} items", f'<ul id="items">{rows}</ul>')
+
+
+@require_GET
+def click(request):
+    return _page("Click target", """<button id="counter" type="button"
+ onclick="this.dataset.clicks = Number(this.dataset.clicks || 0) + 1; this.textContent = this.dataset.clicks;">0</button>
+<form id="search"><input id="query" name="q"><input id="submit" type="submit" value="Search"></form>""")
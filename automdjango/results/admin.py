@@ -0,0 +1,20 @@
+from django.contrib import admin
+from automdjango.results.models import Artifact, StepTiming, TestCaseResult, TestRun
+
+
+@admin.register(TestRun)
+class TestRunAdmin(admin.ModelAdmin):
+    list_display = ("key", "name", "environment", "started_at", "finished_at")
+    search_fields = ("key", "name")
+
+
+@admin.register(TestCaseResult)
+class TestCaseResultAdmin(admin.ModelAdmin):
+    list_display = ("nodeid", "outcome", "duration", "worker", "started_at")
+    list_filter = ("outcome",)
+    search_fields = ("nodeid",)
+    raw_id_fields = ("run",)
+
+
+admin.site.register(StepTiming)
+admin.site.register(Artifact)
@@ -0,0 +1,18 @@
+from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+
+
+def _enable_sqlite_wal(sender, connection, **kwargs):
+    # WAL lets dashboard reads proceed while workers are writing batches
+    if connection.vendor == "sqlite":
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA journal_mode=WAL;")
+            cursor.execute("PRAGMA synchronous=NORMAL;")
+
+
+class ResultsConfig(AppConfig):
+    name = "automdjango.results"
+    verbose_name = "Test results"
+
+    def ready(self):
+        connection_created.connect(_enable_sqlite_wal, dispatch_uid="automdjango.results.sqlite_wal")
@@ -0,0 +1,81 @@
+# Generated by Django 4.2.30 on 2026-10-17 17:23
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TestRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=64, unique=True)),
+                ('name', models.CharField(blank=True, max_length=200)),
+                ('environment', models.CharField(blank=True, max_length=100)),
+                ('started_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['-started_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='TestCaseResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('uid', models.UUIDField(default=uuid.uuid4, editable=False, unique=True)),
+                ('nodeid', models.CharField(max_length=500)),
+                ('outcome', models.CharField(choices=[('passed', 'Passed'), ('failed', 'Failed'), ('error', 'Error'), ('skipped', 'Skipped')], max_length=10)),
+                ('duration', models.FloatField(help_text='seconds')),
+                ('worker', models.CharField(blank=True, max_length=50)),
+                ('started_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('message', models.TextField(blank=True)),
+                ('run', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='results', to='results.testrun')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='StepTiming',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveIntegerField()),
+                ('name', models.CharField(max_length=200)),
+                ('duration', models.FloatField(help_text='seconds')),
+                ('result', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='steps', to='results.testcaseresult', to_field='uid')),
+            ],
+            options={
+                'ordering': ['result', 'position'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Artifact',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=50)),
+                ('path', models.CharField(max_length=500)),
+                ('sha256', models.CharField(db_index=True, max_length=64)),
+                ('size', models.PositiveBigIntegerField()),
+                ('result', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='artifacts', to='results.testcaseresult', to_field='uid')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='testcaseresult',
+            index=models.Index(fields=['nodeid', 'started_at'], name='result_nodeid_started'),
+        ),
+        migrations.AddIndex(
+            model_name='testcaseresult',
+            index=models.Index(fields=['started_at'], name='result_started'),
+        ),
+        migrations.AddIndex(
+            model_name='testcaseresult',
+            index=models.Index(fields=['run', 'outcome'], name='result_run_outcome'),
+        ),
+    ]
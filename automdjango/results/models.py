@@ -0,0 +1,64 @@
+import uuid
+from django.db import models
+from django.utils import timezone
+
+
+class TestRun(models.Model):
+    """One pytest invocation; parallel workers share it through its ``key``."""
+    key = models.CharField(max_length=64, unique=True)
+    name = models.CharField(max_length=200, blank=True)
+    environment = models.CharField(max_length=100, blank=True)
+    started_at = models.DateTimeField(default=timezone.now, db_index=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-started_at"]
+
+    def __str__(self):
+        return f"{self.name or self.key} ({self.started_at:%Y-%m-%d %H:%M})"
+
+
+class TestCaseResult(models.Model):
+    PASSED = "passed"
+    FAILED = "failed"
+    ERROR = "error"
+    SKIPPED = "skipped"
+    OUTCOMES = [(PASSED, "Passed"), (FAILED, "Failed"), (ERROR, "Error"), (SKIPPED, "Skipped")]
+
+    # generated client-side so steps and artifacts can be bulk-inserted in the same batch
+    uid = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+    run = models.ForeignKey(TestRun, on_delete=models.CASCADE, related_name="results")
+    nodeid = models.CharField(max_length=500)
+    outcome = models.CharField(max_length=10, choices=OUTCOMES)
+    duration = models.FloatField(help_text="seconds")
+    worker = models.CharField(max_length=50, blank=True)
+    started_at = models.DateTimeField(default=timezone.now)
+    message = models.TextField(blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["nodeid", "started_at"], name="result_nodeid_started"),
+            models.Index(fields=["started_at"], name="result_started"),
+            models.Index(fields=["run", "outcome"], name="result_run_outcome"),
+        ]
+
+    def __str__(self):
+        return f"{self.nodeid}: {self.outcome}"
+
+
+class StepTiming(models.Model):
+    result = models.ForeignKey(TestCaseResult, to_field="uid", on_delete=models.CASCADE, related_name="steps")
+    position = models.PositiveIntegerField()
+    name = models.CharField(max_length=200)
+    duration = models.FloatField(help_text="seconds")
+
+    class Meta:
+        ordering = ["result", "position"]
+
+
+class Artifact(models.Model):
+    result = models.ForeignKey(TestCaseResult, to_field="uid", on_delete=models.CASCADE, related_name="artifacts")
+    kind = models.CharField(max_length=50)
+    path = models.CharField(max_length=500)
+    sha256 = models.CharField(max_length=64, db_index=True)
+    size = models.PositiveBigIntegerField()
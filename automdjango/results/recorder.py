@@ -0,0 +1,138 @@
+import queue
+import atexit
+import logging
+import threading
+import time
+import uuid
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from automdjango.results.models import Artifact, StepTiming, TestCaseResult, TestRun
+
+_STOP = object()
+
+# recorders still running; one exit hook closes them all
+_open = set()
+_openLock = threading.Lock()
+
+
+@atexit.register
+def _close_open_recorders():
+    with _openLock:
+        recorders = list(_open)
+    for recorder in recorders:
+        recorder.close()
+
+
+class ResultRecorder:
+    """Buffers test outcomes and writes them in batches from one background thread.
+
+    ``record`` only enqueues; the flush thread drains up to ``batch_size`` rows or
+    whatever arrived within ``flush_interval`` seconds and inserts results, steps and
+    artifacts with one ``bulk_create`` each inside a single transaction. A bounded
+    queue applies back-pressure instead of growing without limit when the database
+    falls behind.
+    """
+
+    def __init__(self, run: TestRun, batch_size: int = 500, flush_interval: float = 1.0, max_queue: int = 20000):
+        self.run = run
+        self.batchSize = batch_size
+        self.flushInterval = flush_interval
+        self.written = 0
+        self.failedBatches = 0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self.__run, name="result-recorder", daemon=True)
+        self._thread.start()
+        with _openLock:
+            _open.add(self)
+
+    @classmethod
+    def for_run(cls, key: str = None, name: str = "", environment: str = "", **kwargs) -> "ResultRecorder":
+        """Join the run identified by ``key`` (shared by parallel workers) or start a new one."""
+        run, _ = TestRun.objects.get_or_create(
+            key=key or uuid.uuid4().hex, defaults={"name": name, "environment": environment}
+        )
+        return cls(run, **kwargs)
+
+    def record(self, nodeid: str, outcome: str, duration: float, worker: str = "", message: str = "",
+               started_at=None, steps=(), artifacts=()):
+        """Queue one result. ``steps`` are ``(name, seconds)`` pairs; ``artifacts`` are dicts
+        with ``kind``, ``path``, ``sha256`` and ``size``."""
+        self._queue.put({
+            "uid": uuid.uuid4(),
+            "nodeid": nodeid,
+            "outcome": outcome,
+            "duration": duration,
+            "worker": worker,
+            "message": message,
+            "started_at": started_at or timezone.now(),
+            "steps": list(steps),
+            "artifacts": list(artifacts),
+        })
+
+    def flush(self):
+        """Block until everything queued so far has been written."""
+        self._queue.join()
+
+    def close(self):
+        with _openLock:
+            _open.discard(self)
+        if not self._thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        self._thread.join()
+        TestRun.objects.filter(pk=self.run.pk).update(finished_at=timezone.now())
+        logging.info(f"🗄️ Recorded {self.written} results for run {self.run.key}")
+
+    def __run(self):
+        stopping = False
+        while not stopping:
+            batch = []
+            item = self._queue.get()
+            deadline = time.monotonic() + self.flushInterval
+            while True:
+                if item is _STOP:
+                    stopping = True
+                    self._queue.task_done()
+                    break
+                batch.append(item)
+                if len(batch) >= self.batchSize:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            if batch:
+                try:
+                    self.__write(batch)
+                except Exception as e:
+                    self.failedBatches += 1
+                    logging.error(f"❌ Failed to write {len(batch)} test results: {e}")
+                finally:
+                    for _ in batch:
+                        self._queue.task_done()
+        close_old_connections()
+
+    def __write(self, batch: list):
+        close_old_connections()
+        results, steps, artifacts = [], [], []
+        for row in batch:
+            results.append(TestCaseResult(
+                uid=row["uid"], run_id=self.run.pk, nodeid=row["nodeid"], outcome=row["outcome"],
+                duration=row["duration"], worker=row["worker"], message=row["message"],
+                started_at=row["started_at"],
+            ))
+            steps.extend(
+                StepTiming(result_id=row["uid"], position=position, name=name, duration=seconds)
+                for position, (name, seconds) in enumerate(row["steps"])
+            )
+            artifacts.extend(Artifact(result_id=row["uid"], **artifact) for artifact in row["artifacts"])
+        with transaction.atomic():
+            TestCaseResult.objects.bulk_create(results, batch_size=self.batchSize)
+            if steps:
+                StepTiming.objects.bulk_create(steps, batch_size=self.batchSize)
+            if artifacts:
+                Artifact.objects.bulk_create(artifacts, batch_size=self.batchSize)
+        self.written += len(results)
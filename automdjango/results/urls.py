@@ -0,0 +1,10 @@
+from django.urls import path
+from automdjango.results import views
+
+app_name = "results"
+
+urlpatterns = [
+    path("api/runs/", views.runs, name="runs"),
+    path("api/runs/<str:key>/", views.run_detail, name="run-detail"),
+    path("api/tests/stats/", views.test_stats, name="test-stats"),
+]
@@ -0,0 +1,144 @@
+import math
+from datetime import timedelta
+from django.db import connection
+from django.db.models import Aggregate, Count, FloatField, Q
+from django.db.models.functions import TruncDay, TruncHour
+from django.http import Http404, JsonResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.views.decorators.http import require_GET
+from automdjango.results.models import TestCaseResult, TestRun
+from automdjango.srcode.drivers.instrumentation import percentile
+
+BUCKETS = {"day": TruncDay, "hour": TruncHour}
+DEFAULT_WINDOW = timedelta(days=14)
+MAX_RUNS = 200
+
+
+class PercentileCont(Aggregate):
+    """PostgreSQL ``percentile_cont``; other backends compute percentiles in Python."""
+    function = "percentile_cont"
+    template = "%(function)s(%(percentile)s) WITHIN GROUP (ORDER BY %(expressions)s)"
+    output_field = FloatField()
+
+    def __init__(self, expression, percentile: float, **extra):
+        super().__init__(expression, percentile=float(percentile), **extra)
+
+
+def _group_percentiles(durations, counts, fraction: float):
+    """``percentile`` of each consecutive run of ``counts`` sorted durations, keeping only the rows it interpolates between."""
+    durations = iter(durations)
+    for count in counts:
+        position = (count - 1) * fraction
+        lower, upper = math.floor(position), math.ceil(position)
+        neighbours = [duration for index, duration in enumerate(next(durations) for _ in range(count))
+                      if lower <= index <= upper]
+        yield percentile(neighbours, position - lower) if count else None
+
+
+def _window(request):
+    until = parse_datetime(request.GET["until"]) if "until" in request.GET else timezone.now()
+    since = parse_datetime(request.GET["since"]) if "since" in request.GET else until - DEFAULT_WINDOW
+    if since is None or until is None:
+        raise ValueError("since/until must be ISO 8601 datetimes")
+    return since, until
+
+
+def _outcome_counts(prefix: str = ""):
+    return {
+        "total": Count(f"{prefix}id"),
+        "passed": Count(f"{prefix}id", filter=Q(**{f"{prefix}outcome": TestCaseResult.PASSED})),
+        "failed": Count(f"{prefix}id", filter=Q(**{f"{prefix}outcome__in": (TestCaseResult.FAILED, TestCaseResult.ERROR)})),
+        "skipped": Count(f"{prefix}id", filter=Q(**{f"{prefix}outcome": TestCaseResult.SKIPPED})),
+    }
+
+
+def _run_json(run, counts) -> dict:
+    return {
+        "key": run.key,
+        "name": run.name,
+        "environment": run.environment,
+        "startedAt": run.started_at.isoformat(),
+        "finishedAt": run.finished_at.isoformat() if run.finished_at else None,
+        **counts,
+    }
+
+
+@require_GET
+def runs(request):
+    """Most recent runs with outcome counts (``?limit=``, 1 to 200)."""
+    try:
+        limit = int(request.GET.get("limit", 50))
+    except ValueError:
+        return JsonResponse({"error": "limit must be an integer"}, status=400)
+    limit = max(1, min(limit, MAX_RUNS))
+    recent = TestRun.objects.annotate(**_outcome_counts("results__")).order_by("-started_at")[:limit]
+    return JsonResponse({"runs": [
+        _run_json(run, {name: getattr(run, name) for name in _outcome_counts()}) for run in recent
+    ]})
+
+
+@require_GET
+def run_detail(request, key):
+    try:
+        run = TestRun.objects.get(key=key)
+    except TestRun.DoesNotExist:
+        raise Http404(f"No run {key}")
+    counts = TestCaseResult.objects.filter(run=run).aggregate(**_outcome_counts())
+    slowest = (TestCaseResult.objects.filter(run=run).order_by("-duration")
+               .values("nodeid", "outcome", "duration", "worker")[:20])
+    return JsonResponse({**_run_json(run, counts), "slowest": list(slowest)})
+
+
+@require_GET
+def test_stats(request):
+    """Pass rate and p95 duration per test per time bucket.
+
+    Query parameters: ``since``/``until`` (ISO 8601, default the last 14 days),
+    ``bucket`` (``day`` or ``hour``) and an optional ``nodeid`` prefix. The
+    ``(nodeid, started_at)`` index serves both the filter and the grouping.
+    Without ``percentile_cont`` the p95s come from one pass over the durations
+    ordered by group, streamed rather than loaded, in the groups' order.
+    """
+    try:
+        since, until = _window(request)
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    bucket = request.GET.get("bucket", "day")
+    if bucket not in BUCKETS:
+        return JsonResponse({"error": f"bucket must be one of {', '.join(BUCKETS)}"}, status=400)
+
+    rows = TestCaseResult.objects.filter(started_at__gte=since, started_at__lt=until)
+    if request.GET.get("nodeid"):
+        rows = rows.filter(nodeid__startswith=request.GET["nodeid"])
+    rows = rows.annotate(bucket=BUCKETS[bucket]("started_at"))
+
+    aggregates = _outcome_counts()
+    postgres = connection.vendor == "postgresql"
+    if postgres:
+        aggregates["p95"] = PercentileCont("duration", 0.95)
+    grouped = list(rows.values("nodeid", "bucket").annotate(**aggregates).order_by("nodeid", "bucket"))
+    if postgres:
+        p95s = [group["p95"] for group in grouped]
+    else:
+        durations = rows.order_by("nodeid", "bucket", "duration").values_list("duration", flat=True).iterator()
+        p95s = _group_percentiles(durations, [group["total"] for group in grouped], 0.95)
+
+    series = {}
+    for group, p95 in zip(grouped, p95s):
+        executed = group["total"] - group["skipped"]
+        series.setdefault(group["nodeid"], []).append({
+            "bucket": group["bucket"].isoformat(),
+            "total": group["total"],
+            "passed": group["passed"],
+            "failed": group["failed"],
+            "skipped": group["skipped"],
+            "passRate": round(group["passed"] / executed, 4) if executed else None,
+            "p95Duration": round(p95, 4) if p95 is not None else None,
+        })
+    return JsonResponse({
+        "since": since.isoformat(),
+        "until": until.isoformat(),
+        "bucket": bucket,
+        "tests": [{"nodeid": nodeid, "series": points} for nodeid, points in series.items()],
+    })
@@ -8,16 +8,71 @@ SECRET_KEY = os.environ.get("DJANGO_SECRET_KEY", "changeme")
 DEBUG = os.environ.get("DJANGO_DEBUG", "0") in ("1", "True", "true", "yes")
 ALLOWED_HOSTS = os.environ.get("DJANGO_ALLOWED_HOSTS", "127.0.0.1 localhost").split()
 
-# DATABASES = {
-#     "default": {
-#         "ENGINE": os.environ.get("DJANGO_DB_ENGINE", "django.db.backends.postgresql"),
-#         "NAME": os.environ.get("POSTGRES_DB", "postgres"),
-#         "USER": os.environ.get("POSTGRES_USER", "postgres"),
-#         "PASSWORD": os.environ.get("POSTGRES_PASSWORD", "postgres"),
-#         "HOST": os.environ.get("POSTGRES_HOST", "db"),
-#         "PORT": os.environ.get("POSTGRES_PORT", "5432"),
-#     }
-# }
+INSTALLED_APPS = [
+    "django.contrib.admin",
+    "django.contrib.auth",
+    "django.contrib.contenttypes",
+    "django.contrib.sessions",
+    "django.contrib.messages",
+    "django.contrib.staticfiles",
+    "automdjango.srcode",
+    "automdjango.results",
+    "automdjango.benchmarks",
+]
+
+MIDDLEWARE = [
+    "django.middleware.security.SecurityMiddleware",
+    "django.contrib.sessions.middleware.SessionMiddleware",
+    "django.middleware.common.CommonMiddleware",
+    "django.middleware.csrf.CsrfViewMiddleware",
+    "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "django.contrib.messages.middleware.MessageMiddleware",
+]
+
+ROOT_URLCONF = "automdjango.urls"
+WSGI_APPLICATION = "automdjango.wsgi.application"
+
+TEMPLATES = [
+    {
+        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "DIRS": [],
+        "APP_DIRS": True,
+        "OPTIONS": {
+            "context_processors": [
+                "django.template.context_processors.request",
+                "django.contrib.auth.context_processors.auth",
+                "django.contrib.messages.context_processors.messages",
+            ],
+        },
+    },
+]
+
+# SQLite locally; set DJANGO_DB_ENGINE=django.db.backends.postgresql for the compose `db` service
+if os.environ.get("DJANGO_DB_ENGINE", "").endswith("postgresql"):
+    DATABASES = {
+        "default": {
+            "ENGINE": os.environ["DJANGO_DB_ENGINE"],
+            "NAME": os.environ.get("POSTGRES_DB", "postgres"),
+            "USER": os.environ.get("POSTGRES_USER", "postgres"),
+            "PASSWORD": os.environ.get("POSTGRES_PASSWORD", "postgres"),
+            "HOST": os.environ.get("POSTGRES_HOST", "db"),
+            "PORT": os.environ.get("POSTGRES_PORT", "5432"),
+            "CONN_MAX_AGE": 60,
+        }
+    }
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.environ.get("DJANGO_SQLITE_PATH", str(BASE_DIR / "db.sqlite3")),
+            # parallel workers write concurrently; wait for the lock instead of failing
+            "OPTIONS": {"timeout": 30},
+        }
+    }
+
+DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+USE_TZ = True
+TIME_ZONE = "UTC"
 
 # static files (collected to /app/staticfiles in the container)
 STATIC_URL = "/static/"
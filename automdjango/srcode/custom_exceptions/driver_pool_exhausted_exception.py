@@ -0,0 +1,7 @@
+class DriverPoolExhaustedException(Exception):
+
+    def __init__(self, poolSize, timeout):
+        self.poolSize = poolSize
+        self.timeout = timeout
+        self.message = f"No WebDriver session became available in the pool (size {poolSize}) within {timeout} seconds"
+        super().__init__(self.message)
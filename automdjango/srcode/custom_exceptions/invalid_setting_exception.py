@@ -0,0 +1,7 @@
+class InvalidSettingException(Exception):
+
+    def __init__(self, variable, value, reason):
+        self.variable = variable
+        self.value = value
+        self.message = f"{variable}={value!r} is invalid: {reason}"
+        super().__init__(self.message)
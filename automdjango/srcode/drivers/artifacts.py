@@ -0,0 +1,198 @@
+import os
+import io
+import gzip
+import json
+import atexit
+import hashlib
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from selenium.common import WebDriverException
+from automdjango.srcode.runtimesettings import get_settings
+try:
+    from PIL import Image
+except ImportError:  # optional: screenshots are kept as PNG without Pillow
+    Image = None
+try:
+    import zstandard
+except ImportError:  # optional: text artifacts fall back to gzip
+    zstandard = None
+
+ARTIFACT_KINDS = ("screenshot", "dom", "console", "performance")
+CODECS = ("auto", "webp", "zstd", "gzip", "none")
+
+
+class ArtifactRecord:
+    """Where a captured artifact will live; known as soon as it is submitted."""
+
+    def __init__(self, kind: str, sha256: str, path: str, size: int, future: Future):
+        self.kind = kind
+        self.sha256 = sha256
+        self.path = path
+        self.size = size
+        self.future = future
+
+    def as_dict(self) -> dict:
+        return {"kind": self.kind, "path": self.path, "sha256": self.sha256, "size": self.size}
+
+    def __repr__(self):
+        return f"ArtifactRecord({self.kind!r}, {self.path!r})"
+
+
+def _webp(data: bytes) -> bytes:
+    with Image.open(io.BytesIO(data)) as image:
+        output = io.BytesIO()
+        image.save(output, format="WEBP", quality=80, method=4)
+        return output.getvalue()
+
+
+def _zstd(data: bytes) -> bytes:
+    return zstandard.ZstdCompressor(level=6).compress(data)
+
+
+def _gzip(data: bytes) -> bytes:
+    return gzip.compress(data, compresslevel=6)
+
+
+def choose_encoder(kind: str, codec: str = "auto") -> tuple:
+    """(file suffix, encode function or None) for one artifact kind."""
+    if kind == "screenshot":
+        if codec in ("auto", "webp") and Image is not None:
+            return ".webp", _webp
+        return ".png", None  # PNG is already compressed
+    suffix = ".html" if kind == "dom" else ".json"
+    if codec in ("auto", "zstd") and zstandard is not None:
+        return suffix + ".zst", _zstd
+    if codec in ("auto", "zstd", "gzip"):
+        return suffix + ".gz", _gzip
+    return suffix, None
+
+
+class ArtifactStore:
+    """Content-addressed artifact writer with a bounded in-memory backlog.
+
+    ``submit`` hashes the raw bytes and returns immediately; compression and the
+    atomic write run on a small thread pool. Identical content is written once.
+    When more than ``max_pending_bytes`` are waiting, ``submit`` blocks until the
+    pool catches up, so a burst of failures cannot exhaust memory.
+    """
+
+    def __init__(self, root: str = None, workers: int = None, max_pending_bytes: int = None, codec: str = None):
+        settings = get_settings()
+        self.root = root or settings.artifactsDir
+        self.codec = codec or settings.artifactCodec
+        if self.codec not in CODECS:
+            raise ValueError(f"Unknown artifact codec {self.codec!r}; expected one of {', '.join(CODECS)}")
+        self.maxPendingBytes = max_pending_bytes or settings.artifactQueueBytes
+        self.pendingBytes = 0
+        self.written = 0
+        self.deduplicated = 0
+        self._pending = {}
+        self._condition = threading.Condition()
+        self._executor = ThreadPoolExecutor(max_workers=workers or settings.artifactWorkers,
+                                            thread_name_prefix="artifact-writer")
+        atexit.register(self.drain)
+
+    def submit(self, kind: str, data: bytes) -> ArtifactRecord:
+        sha256 = hashlib.sha256(data).hexdigest()
+        suffix, encode = choose_encoder(kind, self.codec)
+        path = os.path.join(self.root, sha256[:2], sha256 + suffix)
+        with self._condition:
+            inFlight = self._pending.get(path)
+            if inFlight is not None or os.path.exists(path):
+                self.deduplicated += 1
+                future = inFlight or _done(path)
+                return ArtifactRecord(kind, sha256, path, len(data), future)
+            # let a single oversized artifact through when nothing else is queued
+            while self.pendingBytes and self.pendingBytes + len(data) > self.maxPendingBytes:
+                self._condition.wait()
+            self.pendingBytes += len(data)
+            future = self._executor.submit(self.__write, path, data, encode)
+            self._pending[path] = future
+        return ArtifactRecord(kind, sha256, path, len(data), future)
+
+    def drain(self):
+        """Block until every submitted artifact is on disk."""
+        with self._condition:
+            futures = list(self._pending.values())
+        for future in futures:
+            try:
+                future.result()
+            except Exception:
+                pass
+
+    def close(self):
+        self.drain()
+        self._executor.shutdown(wait=True)
+
+    def __write(self, path: str, data: bytes, encode) -> str:
+        rawSize = len(data)
+        try:
+            if encode is not None:
+                try:
+                    data = encode(data)
+                except Exception as e:
+                    logging.warning(f"⚠️ Could not compress {os.path.basename(path)}, storing raw: {e}")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            partial = f"{path}.{threading.get_ident()}.partial"
+            with open(partial, "wb") as handle:
+                handle.write(data)
+            os.replace(partial, path)
+            with self._condition:
+                self.written += 1
+            return path
+        finally:
+            with self._condition:
+                self.pendingBytes -= rawSize
+                self._pending.pop(path, None)
+                self._condition.notify_all()
+
+
+def _done(path: str) -> Future:
+    future = Future()
+    future.set_result(path)
+    return future
+
+
+def capture_artifacts(driver, store: ArtifactStore, kinds=ARTIFACT_KINDS, performance_log=None) -> list:
+    """Grab the requested artifacts from a live session and hand them to ``store``.
+
+    Only the WebDriver round trips run on the calling thread. A kind the session
+    cannot provide (e.g. logging not enabled) is skipped with a warning. Reading
+    the performance log drains it; ``performance_log`` lets the owner read it so
+    its network listeners still see the events.
+    """
+    records = []
+    for kind in kinds:
+        try:
+            if kind == "screenshot":
+                data = driver.get_screenshot_as_png()
+            elif kind == "dom":
+                data = driver.page_source.encode("utf-8")
+            elif kind == "console":
+                data = json.dumps(driver.get_log("browser")).encode("utf-8")
+            elif kind == "performance":
+                entries = performance_log() if performance_log is not None else driver.get_log("performance")
+                data = json.dumps(entries).encode("utf-8")
+            else:
+                raise ValueError(f"Unknown artifact kind {kind!r}; expected one of {', '.join(ARTIFACT_KINDS)}")
+        except (WebDriverException, ValueError, AttributeError) as e:
+            # AttributeError: webdriver.Remote and Firefox's driver have no get_log at all
+            logging.warning(f"⚠️ Could not capture {kind}: {e}")
+            continue
+        records.append(store.submit(kind, data))
+    return records
+
+
+_store = None
+_storeLock = threading.Lock()
+
+
+def get_artifact_store() -> ArtifactStore:
+    """Process-wide store, created on first capture."""
+    global _store
+    if _store is None:
+        with _storeLock:
+            if _store is None:
+                _store = ArtifactStore()
+    return _store
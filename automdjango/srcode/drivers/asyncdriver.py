@@ -0,0 +1,264 @@
+import os
+import ssl
+import json
+import uuid
+import asyncio
+import logging
+from urllib.parse import urlsplit
+from selenium.common import WebDriverException
+from selenium.webdriver.remote.errorhandler import ErrorHandler
+from automdjango.srcode.drivers.batchquery import to_css_or_xpath
+from automdjango.srcode.drivers.driverpreparation import build_chrome_options
+from automdjango.srcode.drivers.profiletemplate import reaper
+from automdjango.srcode.runtimesettings import RuntimeSettings, get_settings
+from propertiesloader import PropertiesLoader
+
+# W3C key marking a JSON object as a web element reference
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+W3C_STRATEGIES = frozenset({"css selector", "xpath", "link text", "partial link text", "tag name"})
+
+
+def w3c_locator(locator: tuple) -> dict:
+    """The /element payload for a (By, value) locator; By.ID, By.NAME and By.CLASS_NAME become CSS as in Selenium."""
+    by, value = locator
+    if by not in W3C_STRATEGIES:
+        kind, value = to_css_or_xpath(locator)
+        by = "css selector" if kind == "css" else kind
+    return {"using": by, "value": value}
+
+
+class AsyncWebDriverConnection:
+    """Minimal keep-alive HTTP/1.1 client for the W3C WebDriver protocol on asyncio streams.
+
+    One connection per session; commands on a session are serialized, while
+    different sessions proceed concurrently on the same event loop.
+    """
+
+    def __init__(self, url: str):
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == "https" else 80)
+        self.ssl = ssl.create_default_context() if parts.scheme == "https" else None
+        self.basePath = parts.path.rstrip("/")
+        self._reader = None
+        self._writer = None
+        self._lock = asyncio.Lock()
+
+    async def request(self, method: str, path: str, payload: dict = None):
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        async with self._lock:
+            try:
+                status, data = await self.__roundTrip(method, path, body)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                # the server dropped our idle keep-alive connection; reconnect once
+                await self.close()
+                status, data = await self.__roundTrip(method, path, body)
+
+        if status >= 400:
+            ErrorHandler().check_response({"status": status, "value": data.decode("utf-8")})
+            raise WebDriverException(f"WebDriver returned HTTP {status}")
+        return json.loads(data)["value"] if data else None
+
+    async def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+        self._reader = None
+        self._writer = None
+
+    async def __roundTrip(self, method: str, path: str, body: bytes) -> tuple:
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port, ssl=self.ssl)
+        head = (
+            f"{method} {self.basePath}{path} HTTP/1.1\r\n"
+            f"Host: {self.host}:{self.port}\r\n"
+            "Accept: application/json\r\n"
+            "Content-Type: application/json;charset=UTF-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: keep-alive\r\n\r\n"
+        )
+        self._writer.write(head.encode("ascii") + body)
+        await self._writer.drain()
+        return await self.__readResponse()
+
+    async def __readResponse(self) -> tuple:
+        statusLine = await self._reader.readline()
+        if not statusLine:
+            raise ConnectionError("WebDriver server closed the connection")
+        status = int(statusLine.split()[1])
+        headers = {}
+        while True:
+            line = (await self._reader.readline()).decode("latin-1").strip()
+            if not line:
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            data = b""
+            while True:
+                size = int((await self._reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    await self._reader.readline()
+                    break
+                data += await self._reader.readexactly(size)
+                await self._reader.readline()
+        else:
+            data = await self._reader.readexactly(int(headers.get("content-length", "0")))
+
+        if headers.get("connection", "").lower() == "close":
+            await self.close()
+        return status, data
+
+
+class AsyncElement:
+    """Reference to an element inside an AsyncDriverPreparation session."""
+
+    def __init__(self, session: "AsyncDriverPreparation", elementId: str):
+        self.session = session
+        self.id = elementId
+
+    async def click(self):
+        await self.session.command("POST", f"/element/{self.id}/click", {})
+
+    async def send_keys(self, text: str):
+        await self.session.command("POST", f"/element/{self.id}/value", {"text": text})
+
+    async def text(self) -> str:
+        return await self.session.command("GET", f"/element/{self.id}/text")
+
+    async def get_attribute(self, name: str):
+        return await self.session.command("GET", f"/element/{self.id}/attribute/{name}")
+
+    def __repr__(self):
+        return f"AsyncElement({self.id!r})"
+
+
+class AsyncDriverPreparation:
+    """Coroutine-based Chrome session speaking the W3C WebDriver protocol directly.
+
+    Create sessions with ``await AsyncDriverPreparation.start()``; any number of them
+    can be driven from one event loop with ``asyncio.gather`` and no thread per browser.
+    """
+
+    def __init__(self, url: str, service=None, user_data_dir: str = None):
+        self.connection = AsyncWebDriverConnection(url)
+        self.service = service
+        self.user_data_dir = user_data_dir
+        self.session_id = None
+
+    @classmethod
+    async def start(cls, open_website: bool = True, settings: RuntimeSettings = None) -> "AsyncDriverPreparation":
+        settings = settings or get_settings()
+        user_data_dir = os.path.join("/tmp", f"chrome_profile_{uuid.uuid4()}")
+        options = build_chrome_options(user_data_dir, settings)
+        capabilities = {"capabilities": {"firstMatch": [{}], "alwaysMatch": options.to_capabilities()}}
+
+        async def create(url, service=None):
+            session = cls(url, service, user_data_dir)
+            try:
+                response = await session.connection.request("POST", "/session", capabilities)
+            except BaseException:
+                await session.quit()
+                raise
+            session.session_id = response["sessionId"]
+            return session
+
+        if settings.remoteUrls:
+            from automdjango.srcode.drivers.hubrouter import get_hub_router
+
+            # picks the best hub, queues for a slot and retries, like the sync RemoteChromeBackend
+            session, url = await get_hub_router(settings).create_session_async(create)
+        else:
+            # a local chromedriver only needs starting once per session; do it off the loop
+            service = await asyncio.to_thread(cls.__startLocalService, settings)
+            url = service.service_url
+            session = await create(url, service)
+        logging.info(f"✅ Async Chrome WebDriver session {session.session_id} started at {url}")
+        if open_website:
+            await session.navigate(PropertiesLoader().getWebsite())
+        return session
+
+    @staticmethod
+    def __startLocalService(settings: RuntimeSettings):
+        from selenium.webdriver.chrome.service import Service
+        from automdjango.srcode.drivers.drivercache import detect_chrome_major, resolve_chromedriver
+
+        service = Service(resolve_chromedriver(detect_chrome_major(settings.chromeBin)))
+        service.start()
+        return service
+
+    async def command(self, method: str, path: str, payload: dict = None):
+        return await self.connection.request(method, f"/session/{self.session_id}{path}", payload)
+
+    async def navigate(self, url: str):
+        logging.info(f"🌍 Navigating to {url}")
+        await self.command("POST", "/url", {"url": url})
+
+    async def find(self, locator: tuple) -> AsyncElement:
+        response = await self.command("POST", "/element", w3c_locator(locator))
+        return AsyncElement(self, response[ELEMENT_KEY])
+
+    async def find_all(self, locator: tuple) -> list:
+        response = await self.command("POST", "/elements", w3c_locator(locator))
+        return [AsyncElement(self, item[ELEMENT_KEY]) for item in response]
+
+    async def click(self, target):
+        """Click an AsyncElement, or the element found by a (By, value) locator."""
+        element = target if isinstance(target, AsyncElement) else await self.find(target)
+        await element.click()
+
+    async def title(self) -> str:
+        return await self.command("GET", "/title")
+
+    async def current_url(self) -> str:
+        return await self.command("GET", "/url")
+
+    async def execute_script(self, script: str, *args):
+        response = await self.command("POST", "/execute/sync", {"script": script, "args": self.__wrap(list(args))})
+        return self.__unwrap(response)
+
+    async def execute_cdp_cmd(self, cmd: str, params: dict = None):
+        return await self.command("POST", "/goog/cdp/execute", {"cmd": cmd, "params": params or {}})
+
+    async def quit(self):
+        logging.info("🛑 Quitting async WebDriver...")
+        try:
+            if self.session_id:
+                await self.connection.request("DELETE", f"/session/{self.session_id}")
+        except (WebDriverException, ConnectionError, OSError) as e:
+            logging.warning(f"⚠️ Failed to delete async WebDriver session: {e}")
+        finally:
+            self.session_id = None
+            await self.connection.close()
+            if self.service is not None:
+                await asyncio.to_thread(self.service.stop)
+            if self.user_data_dir and os.path.exists(self.user_data_dir):
+                reaper.discard(self.user_data_dir)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.quit()
+
+    def __wrap(self, value):
+        if isinstance(value, AsyncElement):
+            return {ELEMENT_KEY: value.id}
+        if isinstance(value, (list, tuple)):
+            return [self.__wrap(item) for item in value]
+        if isinstance(value, dict):
+            return {key: self.__wrap(item) for key, item in value.items()}
+        return value
+
+    def __unwrap(self, value):
+        if isinstance(value, dict):
+            if ELEMENT_KEY in value:
+                return AsyncElement(self, value[ELEMENT_KEY])
+            return {key: self.__unwrap(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self.__unwrap(item) for item in value]
+        return value
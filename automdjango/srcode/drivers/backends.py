@@ -0,0 +1,233 @@
+"""Browser backends for DriverPreparation, imported only when selected.
+
+BROWSER_BACKEND (default: ``browserName`` from configinfo.properties, switched to
+``remote`` when SELENIUM_REMOTE_URL is set) names one of ``BACKENDS``. Selenium's
+browser modules, chromedriver resolution and the grid client are imported inside
+the backend's methods, so importing the driver package costs next to nothing and
+a session pays only for the backend it uses.
+"""
+import os
+import shutil
+import logging
+from automdjango.srcode.custom_exceptions.unsupported_browser_exception import UnsupportedBrowserException
+from automdjango.srcode.drivers.httpcache import cache_proxy_for
+from automdjango.srcode.drivers.resourcegovernor import resolve_resource_profile
+from automdjango.srcode.runtimesettings import RuntimeSettings, get_settings
+
+HEADLESS_SHELL = "chrome-headless-shell"
+
+
+def build_chrome_options(user_data_dir: str, settings: RuntimeSettings = None):
+    """Chrome options shared by every session flavour (sync, pooled and async)."""
+    from selenium import webdriver
+
+    settings = settings or get_settings()
+    options = webdriver.ChromeOptions()
+
+    chrome_args = [
+        "--disable-blink-features=AutomationControlled",
+        "--no-sandbox",
+        "--disable-dev-shm-usage",
+        "--disable-gpu",
+        "--disable-extensions",
+        f"--user-data-dir={user_data_dir}",
+        "--disable-software-rasterizer",
+        "--window-size=1366,768",
+        "--lang=en-US,en;q=0.9",
+    ]
+    if settings.incognito:
+        chrome_args.append("--incognito")
+    chrome_args.extend(resolve_resource_profile(settings=settings).chrome_args())
+    # HTTP_CACHE_MODE routes page traffic through the local record/replay proxy
+    proxy = cache_proxy_for(settings)
+    if proxy is not None:
+        chrome_args.append(f"--proxy-server={proxy.url}")
+        if proxy.interceptsTls:
+            chrome_args.append("--ignore-certificate-errors")
+
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option("useAutomationExtension", False)
+    options.add_experimental_option(
+        "prefs",
+        {
+            "credentials_enable_service": False,
+            "profile.password_manager_enabled": False,
+            "intl.accept_languages": "en-US,en",
+        },
+    )
+
+    for arg in chrome_args:
+        options.add_argument(arg)
+
+    # CDP Network events in the performance log drive WaitEngine.network_idle and HAR recording;
+    # Chrome buffers every event until it is read, so the log stays off unless something needs it
+    if settings.networkEvents:
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL", "browser": "ALL"})
+        options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+
+    if settings.chromeBin:
+        options.add_argument("--headless=new")
+        options.binary_location = settings.chromeBin
+    return options
+
+
+def _persistent_selenium_cache():
+    from automdjango.srcode.drivers.drivercache import cache_root
+
+    # keep Selenium Manager's resolution cache next to ours so it survives process restarts
+    os.environ.setdefault("SELENIUM_CACHE", os.path.join(cache_root(), "selenium"))
+
+
+class BrowserBackend:
+    """How to build options for, and start, one kind of browser session."""
+
+    name = None
+    # Chrome DevTools Protocol: load profiles, stealth, state reset, HAR and resource metrics need it
+    supportsCdp = True
+
+    def options(self, user_data_dir: str, settings: RuntimeSettings):
+        raise NotImplementedError
+
+    def start(self, options, settings: RuntimeSettings, profiler):
+        raise NotImplementedError
+
+
+class ChromeBackend(BrowserBackend):
+    name = "chrome"
+
+    def options(self, user_data_dir: str, settings: RuntimeSettings):
+        return build_chrome_options(user_data_dir, settings)
+
+    def start(self, options, settings: RuntimeSettings, profiler):
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+        from automdjango.srcode.drivers.drivercache import resolve_chromedriver
+
+        _persistent_selenium_cache()
+        with profiler.phase("driver_binary"):
+            chromedriver_path = resolve_chromedriver(self.chrome_major(settings))
+        with profiler.phase("browser_spawn"):
+            driver = webdriver.Chrome(service=Service(chromedriver_path), options=options)
+        logging.info(f"✅ Local {self.name} WebDriver started successfully")
+        return driver
+
+    def chrome_major(self, settings: RuntimeSettings):
+        from automdjango.srcode.drivers.drivercache import detect_chrome_major
+
+        return detect_chrome_major(settings.chromeBin)
+
+
+class HeadlessShellBackend(ChromeBackend):
+    """``chrome-headless-shell``: Chrome's old headless mode as a separate, smaller binary.
+
+    Uses CHROME_BIN when set, otherwise the binary on PATH; it is always headless.
+    """
+
+    name = "chromium-headless-shell"
+
+    def options(self, user_data_dir: str, settings: RuntimeSettings):
+        options = build_chrome_options(user_data_dir, settings)
+        binary = settings.chromeBin or shutil.which(HEADLESS_SHELL)
+        if not binary:
+            raise FileNotFoundError(f"{HEADLESS_SHELL} is not on PATH; set CHROME_BIN to its location")
+        options.binary_location = binary
+        if "--headless=new" in options.arguments:
+            options.arguments.remove("--headless=new")
+        return options
+
+    def chrome_major(self, settings: RuntimeSettings):
+        from automdjango.srcode.drivers.drivercache import detect_chrome_major
+
+        return detect_chrome_major(settings.chromeBin or shutil.which(HEADLESS_SHELL))
+
+
+class RemoteBackend(ChromeBackend):
+    """Chrome on the Selenium grid(s) in SELENIUM_REMOTE_URL, routed by ``HubRouter``."""
+
+    name = "remote"
+    # the hub the session was created on
+    url = None
+
+    def start(self, options, settings: RuntimeSettings, profiler):
+        from selenium import webdriver
+        from automdjango.srcode.drivers.hubrouter import get_hub_router
+        from automdjango.srcode.drivers.remotetransport import get_remote_transport
+
+        transport = get_remote_transport(settings)
+
+        def remote(url):
+            return webdriver.Remote(command_executor=transport.connection(url), options=options)
+
+        with profiler.phase("browser_spawn"):
+            driver, url = get_hub_router(settings).create_session(remote)
+        # webdriver.Remote has no CDP helper; Chrome nodes on a grid still serve chromedriver's endpoint
+        driver.command_executor.add_command("executeCdpCommand", "POST", "/session/$sessionId/goog/cdp/execute")
+        self.url = url
+        logging.info(f"✅ Remote Chrome WebDriver started at {url}")
+        return driver
+
+
+class FirefoxBackend(BrowserBackend):
+    """Local Firefox through geckodriver (resolved by Selenium Manager).
+
+    Firefox does not speak CDP, so load profiles are not applied, stealth is
+    skipped, ``reset`` falls back to cookies and tabs, and network idle waits use
+    DOM quiescence.
+    """
+
+    name = "firefox"
+    supportsCdp = False
+
+    def options(self, user_data_dir: str, settings: RuntimeSettings):
+        from selenium import webdriver
+
+        os.makedirs(user_data_dir, exist_ok=True)
+        options = webdriver.FirefoxOptions()
+        options.add_argument("-profile")
+        options.add_argument(user_data_dir)
+        options.add_argument("--width=1366")
+        options.add_argument("--height=768")
+        options.set_preference("intl.accept_languages", "en-US,en")
+        if settings.chromeBin or not os.environ.get("DISPLAY"):
+            options.add_argument("-headless")
+        proxy = cache_proxy_for(settings)
+        if proxy is not None:
+            host, port = proxy.server.server_address[:2]
+            for scheme in ("http", "ssl"):
+                options.set_preference(f"network.proxy.{scheme}", host)
+                options.set_preference(f"network.proxy.{scheme}_port", port)
+            options.set_preference("network.proxy.type", 1)
+            options.accept_insecure_certs = proxy.interceptsTls
+        return options
+
+    def start(self, options, settings: RuntimeSettings, profiler):
+        from selenium import webdriver
+
+        _persistent_selenium_cache()
+        with profiler.phase("browser_spawn"):
+            driver = webdriver.Firefox(options=options)
+        logging.info("✅ Local Firefox WebDriver started successfully")
+        return driver
+
+
+BACKENDS = {
+    "chrome": ChromeBackend,
+    "chromium-headless-shell": HeadlessShellBackend,
+    "firefox": FirefoxBackend,
+    "remote": RemoteBackend,
+}
+
+
+def register_backend(name: str, backend: type):
+    """Add a backend; its module decides what it imports and when."""
+    BACKENDS[name] = backend
+
+
+def resolve_backend(browserName: str, settings: RuntimeSettings = None) -> BrowserBackend:
+    settings = settings or get_settings()
+    name = (settings.browserBackend or browserName).lower()
+    if name == "chrome" and settings.seleniumRemoteUrl:
+        name = "remote"
+    if name not in BACKENDS:
+        raise UnsupportedBrowserException(name)
+    return BACKENDS[name]()
@@ -0,0 +1,78 @@
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webdriver import WebDriver
+
+_BATCH_QUERY_SCRIPT = """
+    const read = (el, q) => {
+      const attributes = {};
+      for (const name of q.attributes) attributes[name] = el.getAttribute(name);
+      const properties = {};
+      for (const name of q.properties) {
+        try { properties[name] = el[name]; } catch (e) { properties[name] = null; }
+      }
+      return { attributes: attributes, properties: properties };
+    };
+    return arguments[0].map((q) => {
+      let nodes = [];
+      try {
+        if (q.using === 'xpath') {
+          const found = document.evaluate(q.value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+          for (let i = 0; i < found.snapshotLength; i++) nodes.push(found.snapshotItem(i));
+        } else {
+          nodes = Array.from(document.querySelectorAll(q.value));
+        }
+      } catch (e) {
+        return q.many ? [] : null;
+      }
+      if (!q.many) return nodes.length ? read(nodes[0], q) : null;
+      return nodes.map((el) => read(el, q));
+    });
+"""
+
+
+class ElementQuery:
+    """One locator plus the attributes and DOM properties to read from what it matches."""
+
+    def __init__(self, locator: tuple, attributes=(), properties=(), many: bool = False):
+        self.locator = locator
+        self.attributes = list(attributes)
+        self.properties = list(properties)
+        self.many = many
+
+    def toScriptArgument(self) -> dict:
+        using, value = to_css_or_xpath(self.locator)
+        return {
+            "using": using,
+            "value": value,
+            "attributes": self.attributes,
+            "properties": self.properties,
+            "many": self.many,
+        }
+
+
+def to_css_or_xpath(locator: tuple) -> tuple:
+    """Express a (By, value) locator as a CSS selector or XPath the browser can evaluate."""
+    by, value = locator
+    if by == By.XPATH:
+        return "xpath", value
+    if by == By.CSS_SELECTOR:
+        return "css", value
+    if by == By.ID:
+        return "css", f'[id="{value}"]'
+    if by == By.NAME:
+        return "css", f'[name="{value}"]'
+    if by == By.CLASS_NAME:
+        return "css", f".{value}"
+    if by == By.TAG_NAME:
+        return "css", value
+    raise ValueError(f"Locator strategy {by!r} cannot be batched")
+
+
+def batch_query(driver: WebDriver, queries: list) -> list:
+    """Resolve every query and read its values in a single ``execute_script`` round trip.
+
+    Each result is ``{"attributes": {...}, "properties": {...}}`` for the first match,
+    ``None`` when nothing matched, or a list of those dicts for ``many`` queries.
+    """
+    if not queries:
+        return []
+    return driver.execute_script(_BATCH_QUERY_SCRIPT, [query.toScriptArgument() for query in queries])
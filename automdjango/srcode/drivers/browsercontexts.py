@@ -0,0 +1,171 @@
+import logging
+import threading
+from selenium.webdriver.remote.webelement import WebElement
+from automdjango.srcode.drivers.waits import WaitEngine
+from automdjango.srcode.drivers.instrumentation import timed_command
+
+_MARK_NAVIGATION = "window.__automdNavigating = true; window.location.href = arguments[0];"
+_NEW_DOCUMENT_STATE = "return window.__automdNavigating === undefined ? document.readyState : null;"
+
+
+class ContextRouter:
+    """Serializes WebDriver commands of every context sharing one Chrome session.
+
+    WebDriver addresses one window at a time, so each command runs under the lock
+    after switching to its context's window; the switch is skipped when that window
+    is already active.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.lock = threading.RLock()
+        self.mainHandle = driver.current_window_handle
+        self.activeHandle = self.mainHandle
+
+    def activate(self, handle: str):
+        if self.activeHandle != handle:
+            self.driver.switch_to.window(handle)
+            self.activeHandle = handle
+
+    def restore(self):
+        with self.lock:
+            self.activate(self.mainHandle)
+
+
+class _Window:
+    """Something whose WebDriver commands run in one window of a shared browser."""
+
+    router: ContextRouter
+    handle: str
+
+    def wrap(self, value):
+        if isinstance(value, WebElement):
+            return ContextElement(self, value)
+        if isinstance(value, list) and value and isinstance(value[0], WebElement):
+            return [ContextElement(self, element) for element in value]
+        return value
+
+
+class ContextElement(WebElement):
+    """A WebElement whose commands always run in the window of the context that found it."""
+
+    def __init__(self, context: _Window, element: WebElement):
+        super().__init__(element.parent, element.id)
+        self._context = context
+        # commands go through the wrapped element, so e.g. a CachedElement still re-finds itself when stale
+        self._element = element
+
+    def _execute(self, command, params=None):
+        router = self._context.router
+        with router.lock:
+            router.activate(self._context.handle)
+            return self._element._execute(command, params)
+
+
+class _ContextDriver:
+    """WebDriver stand-in bound to one context; what WaitEngine polls through."""
+
+    def __init__(self, context: _Window):
+        self._context = context
+
+    def __getattr__(self, name):
+        router = self._context.router
+        with router.lock:
+            router.activate(self._context.handle)
+            value = getattr(router.driver, name)
+        if not callable(value):
+            return value
+
+        def call(*args, **kwargs):
+            with router.lock:
+                router.activate(self._context.handle)
+                return self._context.wrap(value(*args, **kwargs))
+
+        return call
+
+
+class MainWindow(_Window):
+    """The owner session's own tab once contexts share its browser; what its elements and waits are bound to."""
+
+    def __init__(self, router: ContextRouter):
+        self.router = router
+        self.driver = _ContextDriver(self)
+
+    @property
+    def handle(self) -> str:
+        # reset() may move the owner to another tab
+        return self.router.mainHandle
+
+
+class BrowserContext(_Window):
+    """An isolated logical session (own cookies, storage and cache) inside a shared Chrome.
+
+    Created with ``DriverPreparation.new_context()``. It offers the session API
+    (``navigateTo``, ``find_element``, ``click_on_element``, ``waits`` ...) and is safe
+    to drive from its own thread: commands are serialized per browser, while page
+    loads of different contexts proceed concurrently because ``navigateTo`` only
+    starts the navigation under the lock and waits for it outside.
+    """
+
+    def __init__(self, owner, router: ContextRouter, contextId: str, handle: str):
+        self.owner = owner
+        self.router = router
+        self.contextId = contextId
+        self.handle = handle
+        self.driver = _ContextDriver(self)
+        self.waits = WaitEngine(self.driver, timeout=owner.settings.waitTimeout)
+        self.closed = False
+
+    @classmethod
+    def create(cls, owner, router: ContextRouter) -> "BrowserContext":
+        with router.lock:
+            contextId = owner.execute_cdp_cmd("Target.createBrowserContext", {"disposeOnDetach": True})["browserContextId"]
+            before = set(router.driver.window_handles)
+            owner.execute_cdp_cmd("Target.createTarget", {"url": "about:blank", "browserContextId": contextId})
+            # chromedriver exposes the new target as a window handle
+            [handle] = set(router.driver.window_handles) - before
+        logging.info(f"🧩 Opened browser context {contextId}")
+        return cls(owner, router, contextId, handle)
+
+    @timed_command("context_navigateTo")
+    def navigateTo(self, url: str, wait: bool = True):
+        logging.info(f"🌍 [{self.contextId[:8]}] Navigating to {url}")
+        self.driver.execute_script(_MARK_NAVIGATION, url)
+        if wait:
+            ready = ("interactive", "complete") if self.owner.loadProfile.pageLoadStrategy == "eager" else ("complete",)
+            self.waits.until(
+                lambda d: d.execute_script(_NEW_DOCUMENT_STATE) in ready, "context_navigation",
+                message=f"{url} did not finish loading",
+            )
+
+    @timed_command("context_find_element")
+    def find_element(self, element: tuple) -> WebElement:
+        return self.driver.find_element(*element)
+
+    @timed_command("context_click_on_element")
+    def click_on_element(self, element: WebElement):
+        logging.info(f"🖱️ [{self.contextId[:8]}] Clicking element {element}")
+        element.click()
+
+    def execute_script(self, script: str, *args):
+        return self.driver.execute_script(script, *args)
+
+    def get_page_title(self) -> str:
+        return self.driver.title
+
+    def close(self):
+        if self.closed:
+            return
+        with self.router.lock:
+            try:
+                self.owner.execute_cdp_cmd("Target.disposeBrowserContext", {"browserContextId": self.contextId})
+            finally:
+                self.closed = True
+                if self.router.activeHandle == self.handle:
+                    self.router.activate(self.router.mainHandle)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,121 @@
+import os
+import re
+import shutil
+import logging
+import subprocess
+from contextlib import contextmanager
+from functools import lru_cache
+from automdjango.srcode.runtimesettings import get_settings
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+CHROME_CANDIDATES = ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome")
+DRIVER_NAME = "chromedriver.exe" if os.name == "nt" else "chromedriver"
+CFT_LATEST_RELEASE_URL = "https://googlechromelabs.github.io/chrome-for-testing/LATEST_RELEASE"
+
+
+def cache_root() -> str:
+    return get_settings().chromedriverCacheDir
+
+
+@lru_cache(maxsize=None)
+def detect_chrome_major(chrome_bin: str = None):
+    """Major version of ``chrome_bin`` (or the first Chrome on PATH), e.g. "139"; None when it cannot be determined.
+
+    Callers pass their settings' CHROME_BIN, so the cache key follows per-session overrides.
+    """
+    candidates = [chrome_bin] if chrome_bin else CHROME_CANDIDATES
+    for candidate in filter(None, candidates):
+        executable = shutil.which(candidate) or (candidate if os.path.isfile(candidate) else None)
+        if not executable:
+            continue
+        try:
+            output = subprocess.run(
+                [executable, "--version"], capture_output=True, text=True, timeout=10
+            ).stdout
+        except (OSError, subprocess.SubprocessError):
+            continue
+        match = re.search(r"(\d+)\.\d+\.\d+", output)
+        if match:
+            return match.group(1)
+    return None
+
+
+@contextmanager
+def file_lock(path: str):
+    """Exclusive inter-process lock so concurrent workers do one-time setup only once."""
+    with open(path, "a+") as handle:
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        else:
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+            else:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def cached_driver_path(major: str) -> str:
+    return os.path.join(cache_root(), major, DRIVER_NAME)
+
+
+def _latest_release(major: str) -> str:
+    """Newest Chrome-for-Testing chromedriver version for a Chrome major, e.g. "139.0.7258.154"."""
+    import requests
+
+    response = requests.get(f"{CFT_LATEST_RELEASE_URL}_{major}", timeout=30)
+    response.raise_for_status()
+    return response.text.strip()
+
+
+def _download(major: str = None) -> str:
+    from webdriver_manager.chrome import ChromeDriverManager
+
+    if major is None:
+        logging.info("⬇️ Resolving the latest chromedriver (Chrome version unknown)")
+        return ChromeDriverManager().install()
+    version = _latest_release(major)
+    logging.info(f"⬇️ Resolving chromedriver {version} for Chrome {major} (cache miss)")
+    return ChromeDriverManager(driver_version=version).install()
+
+
+def resolve_chromedriver(major: str = None, downloader=_download) -> str:
+    """Path to a chromedriver matching the local Chrome, downloading it at most once per version.
+
+    A warm cache is a single ``os.path`` lookup. On a miss one process downloads
+    under a file lock while the others wait and then reuse its binary.
+    """
+    major = major or detect_chrome_major(get_settings().chromeBin)
+    if major is None:
+        # a shared key would keep serving the old driver after a Chrome upgrade
+        if get_settings().chromedriverOffline:
+            raise FileNotFoundError("Cannot detect the Chrome version to pick a cached chromedriver and CHROMEDRIVER_OFFLINE is set")
+        logging.warning("⚠️ Could not detect the Chrome version; not using the chromedriver cache")
+        return downloader(None)
+
+    target = cached_driver_path(major)
+    if os.access(target, os.X_OK):
+        return target
+
+    if get_settings().chromedriverOffline:
+        raise FileNotFoundError(f"No cached chromedriver for Chrome {major} at {target} and CHROMEDRIVER_OFFLINE is set")
+
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with file_lock(os.path.join(cache_root(), f"{major}.lock")):
+        if os.access(target, os.X_OK):
+            return target
+        source = downloader(major)
+        partial = f"{target}.{os.getpid()}.partial"
+        shutil.copy2(source, partial)
+        os.chmod(partial, 0o755)
+        os.replace(partial, target)
+    logging.info(f"✅ Cached chromedriver for Chrome {major} at {target}")
+    return target
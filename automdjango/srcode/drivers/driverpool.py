@@ -0,0 +1,222 @@
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from selenium.common import WebDriverException
+from automdjango.srcode.drivers.driverpreparation import DriverPreparation
+from automdjango.srcode.custom_exceptions.driver_pool_exhausted_exception import DriverPoolExhaustedException
+from automdjango.srcode.runtimesettings import RuntimeSettings, get_settings
+
+
+class PooledSession:
+    """Bookkeeping for one warm DriverPreparation owned by a DriverPool."""
+
+    def __init__(self, driver: DriverPreparation):
+        self.driver = driver
+        self.uses = 0
+        self.created_at = time.monotonic()
+
+
+class DriverPool:
+    """Keeps N warm WebDriver sessions alive and leases them out to tests.
+
+    Released sessions are reset through ``DriverPreparation.reset`` instead of being
+    quit, and recycled once they reach ``max_uses``, fail a health check or exceed
+    a RESOURCE_MAX_* limit when they come back.
+    ``settings`` overrides the process-wide settings for every session of this pool.
+    """
+
+    def __init__(self, size: int = None, max_uses: int = None, acquire_timeout: float = None,
+                 factory=DriverPreparation, settings: RuntimeSettings = None):
+        defaults = settings or get_settings()
+        self.size = size if size is not None else defaults.driverPoolSize
+        self.max_uses = max_uses if max_uses is not None else defaults.driverPoolMaxUses
+        self.acquire_timeout = acquire_timeout if acquire_timeout is not None else defaults.driverPoolAcquireTimeout
+        self.settings = settings
+        if self.size < 1:
+            raise ValueError("DriverPool size must be at least 1")
+        self.factory = factory
+        self._condition = threading.Condition()
+        self._idle = []
+        self._leased = {}
+        self._pinned = set()
+        self._sessionCount = 0
+        self._closed = False
+        self.created = 0
+        self.recycled = 0
+        self.overLimit = 0
+
+    def warm(self):
+        """Start sessions until the pool holds ``size`` of them."""
+        while True:
+            with self._condition:
+                if self._closed or self._sessionCount >= self.size:
+                    return
+                self._sessionCount += 1
+            session = self.__createSession()
+            with self._condition:
+                self._idle.append(session)
+                self._condition.notify()
+
+    def acquire(self, timeout: float = None) -> DriverPreparation:
+        timeout = self.acquire_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        while True:
+            session = None
+            create = False
+            with self._condition:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("DriverPool is closed")
+                    if self._idle:
+                        session = self._idle.pop()
+                        break
+                    if self._sessionCount < self.size:
+                        self._sessionCount += 1
+                        create = True
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise DriverPoolExhaustedException(self.size, timeout)
+                    self._condition.wait(remaining)
+
+            if create:
+                session = self.__createSession()
+            elif not self.__isHealthy(session):
+                logging.warning("⚠️ Pooled WebDriver session failed its health check; recycling it")
+                self.__discard(session)
+                continue
+
+            session.uses += 1
+            with self._condition:
+                self._leased[id(session.driver)] = session
+            return session.driver
+
+    def pin(self, timeout: float = None) -> DriverPreparation:
+        """Acquire a session kept for the rest of the run; the pool grows by one so leases never wait on it.
+
+        Releasing the pinned session quits it and shrinks the pool back.
+        """
+        with self._condition:
+            self.size += 1
+        try:
+            driver = self.acquire(timeout)
+        except BaseException:
+            with self._condition:
+                self.size -= 1
+            raise
+        with self._condition:
+            self._pinned.add(id(driver))
+        return driver
+
+    def release(self, driver: DriverPreparation, discard: bool = False):
+        with self._condition:
+            session = self._leased.pop(id(driver), None)
+            pinned = session is not None and id(driver) in self._pinned
+            if pinned:
+                self._pinned.discard(id(driver))
+                self.size -= 1
+        if session is None:
+            if self._closed:
+                return
+            raise ValueError("This driver was not leased from the pool")
+
+        if (discard or pinned or self._closed or session.uses >= self.max_uses
+                or not self.__withinLimits(session) or not self.__reset(session)):
+            self.__discard(session)
+            return
+
+        with self._condition:
+            self._idle.append(session)
+            self._condition.notify()
+
+    @contextmanager
+    def lease(self, timeout: float = None):
+        driver = self.acquire(timeout)
+        failed = False
+        try:
+            yield driver
+        except WebDriverException:
+            failed = True
+            raise
+        finally:
+            self.release(driver, discard=failed)
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            sessions = self._idle + list(self._leased.values())
+            self._idle = []
+            self._leased = {}
+            self._pinned = set()
+            self._condition.notify_all()
+        for session in sessions:
+            self.__quit(session)
+
+    def stats(self) -> dict:
+        with self._condition:
+            return {
+                "size": self.size,
+                "idle": len(self._idle),
+                "leased": len(self._leased),
+                "created": self.created,
+                "recycled": self.recycled,
+                "overLimit": self.overLimit,
+            }
+
+    def __createSession(self) -> PooledSession:
+        try:
+            driver = self.factory(settings=self.settings) if self.settings is not None else self.factory()
+            session = PooledSession(driver)
+        except Exception:
+            with self._condition:
+                self._sessionCount -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self.created += 1
+        logging.info(f"♨️ Warm WebDriver session added to pool ({self._sessionCount}/{self.size})")
+        return session
+
+    def __isHealthy(self, session: PooledSession) -> bool:
+        try:
+            session.driver.getDriver().current_url
+            return True
+        except WebDriverException:
+            return False
+
+    def __withinLimits(self, session: PooledSession) -> bool:
+        """Sample the session before its reset, while the test's page is still loaded."""
+        try:
+            exceeded = session.driver.check_resources()
+        except WebDriverException as e:
+            logging.warning(f"⚠️ Could not sample pooled WebDriver session resources: {e}")
+            return True
+        if not exceeded:
+            return True
+        logging.info(f"♻️ Recycling pooled WebDriver session over its resource limits ({', '.join(exceeded)})")
+        with self._condition:
+            self.overLimit += 1
+        return False
+
+    def __reset(self, session: PooledSession) -> bool:
+        """Return the session to a neutral state; False means it must be recycled."""
+        try:
+            session.driver.reset()
+            return True
+        except WebDriverException as e:
+            logging.warning(f"⚠️ Could not reset pooled WebDriver session: {e}")
+            return False
+
+    def __discard(self, session: PooledSession):
+        self.__quit(session)
+        with self._condition:
+            self._sessionCount -= 1
+            self.recycled += 1
+            self._condition.notify()
+
+    def __quit(self, session: PooledSession):
+        try:
+            session.driver.quit()
+        except Exception as e:
+            logging.warning(f"⚠️ Failed to quit pooled WebDriver session: {e}")
@@ -1,125 +1,155 @@
 import os
-import tempfile
 import uuid
-import shutil
 import logging
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.remote.webelement import WebElement
+from contextlib import contextmanager, nullcontext
+from typing import TYPE_CHECKING
 from selenium.common import NoSuchElementException, WebDriverException
-from webdriver_manager.chrome import ChromeDriverManager
-from automdjango.srcode.custom_exceptions.unsupported_browser_exception import UnsupportedBrowserException
+from automdjango.srcode.drivers.backends import build_chrome_options, resolve_backend
+from automdjango.srcode.drivers.profiletemplate import clone_profile, ensure_template, reaper
+from automdjango.srcode.drivers.waits import WaitEngine
+from automdjango.srcode.drivers.artifacts import ARTIFACT_KINDS, capture_artifacts, get_artifact_store
+from automdjango.srcode.drivers.harrecorder import HarRecorder
+from automdjango.srcode.drivers.httpcache import cache_proxy_for
+from automdjango.srcode.drivers.sessionreset import (
+    SessionState,
+    clear_browser_state,
+    close_extra_tabs,
+    find_state_leaks,
+)
+from automdjango.srcode.drivers.instrumentation import StartupProfiler, timed_command
+from automdjango.srcode.drivers.resourcegovernor import ResourceGovernor, ResourceSample
+from automdjango.srcode.drivers.loadprofile import (
+    apply_to_options,
+    apply_to_session,
+    resolve_load_profile,
+    summarize_network_events,
+)
+from automdjango.srcode.runtimesettings import RuntimeSettings, get_settings
 from propertiesloader import PropertiesLoader
-try:
-    from selenium_stealth import stealth
-except Exception:  # ImportError or other runtime import issues
-    stealth = None
-    logging.getLogger(__name__).warning(
-        "selenium-stealth not available; proceeding without it. Rebuild container to install."
-    )
 
-# Logging
-logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webelement import WebElement
+    from automdjango.srcode.drivers.browsercontexts import BrowserContext
+
+__all__ = ["DriverPreparation", "build_chrome_options"]
+
+
+def _load_stealth():
+    try:
+        from selenium_stealth import stealth
+    except Exception:  # ImportError or other runtime import issues
+        logging.warning("⚠️ selenium-stealth not available; proceeding without it. Rebuild container to install.")
+        return None
+    return stealth
 
-os.environ["SELENIUM_CACHE"] = tempfile.mkdtemp()
 
 class DriverPreparation:
-    def __init__(self):
+    def __init__(self, settings: RuntimeSettings = None):
         logging.info("🔧 Initializing WebDriver...")
-        self.propLoader = PropertiesLoader()
+        self.settings = settings or get_settings()
+        self.profiler = StartupProfiler()
+        with self.profiler.phase("properties"):
+            self.propLoader = PropertiesLoader()
         self.user_data_dir = None
         self.driver = None
+        self.waits = None
+        self.locatorCache = None
+        self.loadProfile = resolve_load_profile(settings=self.settings)
+        self.lastNavigationReport = None
+        self.harRecorder = None
+        self.sessionState = SessionState()
+        self.contextRouter = None
+        self.mainWindow = None
+        self.contexts = []
+        self.resourceGovernor = ResourceGovernor(self.settings)
+        self.httpCache = cache_proxy_for(self.settings)
+        if self.settings.httpCacheMode != "off" and self.httpCache is None:
+            logging.warning("⚠️ HTTP_CACHE_MODE is ignored for remote sessions: grid nodes cannot reach the local proxy")
+        self.__trackState = False
+        self.relaunches = 0
 
-        browser = self.propLoader.getBrowserName().lower()
-        if browser == "chrome":
-            self.__initializeChromeDriver()
-        else:
-            raise UnsupportedBrowserException(browser)
+        self.backend = resolve_backend(self.propLoader.getBrowserName(), self.settings)
+        self.__initializeDriver()
+        self.__attachHelpers()
 
-        self.driver.get(self.propLoader.getWebsite())
+        with self.profiler.phase("initial_navigation"):
+            self.navigateTo(self.propLoader.getWebsite())
         # Optionally try to solve reCAPTCHA if present and enabled
         try:
-            if os.environ.get("ENABLE_RECAPTCHA_SOLVER", "0") in ("1", "true", "True", "yes"):
+            if self.settings.enableRecaptchaSolver:
                 from automdjango.srcode.utils.recaptcha_solver import try_solve_recaptcha_if_present
-                try_solve_recaptcha_if_present(self.driver)
+                with self.profiler.phase("recaptcha"):
+                    try_solve_recaptcha_if_present(self.driver, self.settings)
         except Exception as e:
             logging.warning(f"⚠️ reCAPTCHA solver skipped or failed: {e}")
+        self.startupTimings = self.profiler.finish()
+        # from here on, overrides belong to the test and are undone by reset()
+        self.__trackState = True
 
-    def __generate_unique_dir(self):
-        return os.path.join("/tmp", f"chrome_profile_{uuid.uuid4()}")
+    def __attachHelpers(self):
+        self.waits = WaitEngine(self.driver, timeout=self.settings.waitTimeout)
+        if self.settings.locatorCache:
+            from automdjango.srcode.drivers.locatorcache import LocatorCache
 
-    def __chromeOptionsPreparation(self) -> Options:
-        options = webdriver.ChromeOptions()
-        persistent_profile = os.environ.get("USER_DATA_DIR")
-        self.user_data_dir = persistent_profile if persistent_profile else self.__generate_unique_dir()
+            self.locatorCache = LocatorCache(self.driver)
+        if self.settings.harDir and self.backend.supportsCdp:
+            extension = "har" if self.settings.harFormat == "har" else "ndjson"
+            self.start_har(os.path.join(self.settings.harDir, f"session_{uuid.uuid4().hex}.{extension}"))
 
-        chrome_args = [
-            "--disable-blink-features=AutomationControlled",
-            "--no-sandbox",
-            "--disable-dev-shm-usage",
-            "--disable-gpu",
-            "--disable-extensions",
-            f"--user-data-dir={self.user_data_dir}",
-            "--disable-software-rasterizer",
-            "--window-size=1366,768",
-            "--lang=en-US,en;q=0.9",
-        ]
-        if os.environ.get("INCOGNITO", "0") in ("1", "true", "True", "yes"):
-            chrome_args.append("--incognito")
-
-        options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        options.add_experimental_option("useAutomationExtension", False)
-        options.add_experimental_option(
-            "prefs",
-            {
-                "credentials_enable_service": False,
-                "profile.password_manager_enabled": False,
-                "intl.accept_languages": "en-US,en",
-            },
-        )
-
-        for arg in chrome_args:
-            options.add_argument(arg)
+    def __generate_unique_dir(self):
+        template = self.settings.profileTemplateDir
+        # the profile lives on the browser host, and only Chrome builds it the way the template expects
+        if template and self.backend.name in ("chrome", "chromium-headless-shell"):
+            return clone_profile(ensure_template(template, self.__primeProfileTemplate), self.settings.profileCloneRoot)
+        return os.path.join("/tmp", f"chrome_profile_{uuid.uuid4()}")
 
-        if os.environ.get("CHROME_BIN"):
-            options.add_argument("--headless=new")
-            options.binary_location = os.environ["CHROME_BIN"]
+    def __primeProfileTemplate(self, template_dir: str):
+        """Let Chrome build a fresh profile once so clones start warm."""
+        primer = self.backend.start(self.backend.options(template_dir, self.settings), self.settings, StartupProfiler())
+        try:
+            primer.get("about:blank")
+        finally:
+            primer.quit()
 
-        logging.info(f"ℹ️ Chrome options prepared (user data dir: {self.user_data_dir})")
+    def __optionsPreparation(self):
+        persistent_profile = self.settings.userDataDir
+        self.user_data_dir = persistent_profile if persistent_profile else self.__generate_unique_dir()
+        options = self.backend.options(self.user_data_dir, self.settings)
+        apply_to_options(self.loadProfile, options)
+        logging.info(f"ℹ️ {self.backend.name} options prepared (user data dir: {self.user_data_dir})")
         return options
 
-    def __initializeChromeDriver(self):
-        chrome_options = self.__chromeOptionsPreparation()
-        selenium_remote_url = os.environ.get("SELENIUM_REMOTE_URL")
+    def __initializeDriver(self):
+        with self.profiler.phase("options"):
+            options = self.__optionsPreparation()
         try:
-            if selenium_remote_url:
-                # Use remote Selenium service (e.g., compose service `selenium`)
-                self.driver = webdriver.Remote(command_executor=selenium_remote_url, options=chrome_options)
-                logging.info(f"✅ Remote Chrome WebDriver started at {selenium_remote_url}")
-            else:
-                chromedriver_path = ChromeDriverManager().install()
-                self.driver = webdriver.Chrome(service=Service(chromedriver_path), options=chrome_options)
-                logging.info("✅ Local Chrome WebDriver started successfully")
+            self.driver = self.backend.start(options, self.settings, self.profiler)
+            if not self.backend.supportsCdp:
+                logging.info(f"ℹ️ {self.backend.name} has no CDP: load profile blocking and stealth are skipped")
+                return
+            with self.profiler.phase("load_profile"):
+                apply_to_session(self.loadProfile, self.execute_cdp_cmd)
             # Apply anti-automation stealth tweaks only if explicitly enabled
-            if os.environ.get("ENABLE_STEALTH", "0") in ("1", "true", "True", "yes"):
-                self.__applyAntiAutomationStealth()
-                # Apply selenium-stealth (best-effort)
-                if stealth is not None:
-                    try:
-                        stealth(
-                            self.driver,
-                            languages=["en-US", "en"],
-                            vendor="Google Inc.",
-                            platform="Win32",
-                            webgl_vendor="Intel Inc.",
-                            renderer="Intel Iris OpenGL Engine",
-                            fix_hairline=True,
-                        )
-                    except Exception as e:
-                        logging.warning(f"⚠️ selenium-stealth could not be applied: {e}")
+            if self.settings.enableStealth:
+                with self.profiler.phase("stealth"):
+                    self.__applyAntiAutomationStealth()
+                    # Apply selenium-stealth (best-effort)
+                    stealth = _load_stealth()
+                    if stealth is not None:
+                        try:
+                            stealth(
+                                self.driver,
+                                languages=["en-US", "en"],
+                                vendor="Google Inc.",
+                                platform="Win32",
+                                webgl_vendor="Intel Inc.",
+                                renderer="Intel Iris OpenGL Engine",
+                                fix_hairline=True,
+                            )
+                        except Exception as e:
+                            logging.warning(f"⚠️ selenium-stealth could not be applied: {e}")
         except WebDriverException as e:
-            logging.error(f"❌ Failed to start Chrome WebDriver: {e}")
+            logging.error(f"❌ Failed to start {self.backend.name} WebDriver: {e}")
             raise
 
     def __applyAntiAutomationStealth(self):
@@ -127,18 +157,14 @@ class DriverPreparation:
         try:
             # Enable Network domain to set headers
             try:
-                self.driver.execute_cdp_cmd("Network.enable", {})
+                self.execute_cdp_cmd("Network.enable", {})
             except Exception:
                 pass
 
             # Set a realistic desktop Chrome user agent via CDP
-            realistic_ua = os.environ.get(
-                "REALISTIC_UA",
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-                "(KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36",
-            )
+            realistic_ua = self.settings.realisticUa
             try:
-                self.driver.execute_cdp_cmd(
+                self.execute_cdp_cmd(
                     "Network.setUserAgentOverride",
                     {"userAgent": realistic_ua, "platform": "Windows"},
                 )
@@ -147,20 +173,20 @@ class DriverPreparation:
                 pass
 
             # Accept-Language header alignment (optional)
-            if os.environ.get("SET_ACCEPT_LANGUAGE", "1") in ("1", "true", "True", "yes"):
+            if self.settings.setAcceptLanguage:
                 try:
-                    self.driver.execute_cdp_cmd(
+                    self.execute_cdp_cmd(
                         "Network.setExtraHTTPHeaders",
-                        {"headers": {"Accept-Language": os.environ.get("ACCEPT_LANGUAGE", "en-US,en;q=0.9")}},
+                        {"headers": {"Accept-Language": self.settings.acceptLanguage}},
                     )
                 except Exception:
                     pass
 
             # Timezone override if explicitly configured
-            tz = os.environ.get("TZ_OVERRIDE")
+            tz = self.settings.tzOverride
             if tz:
                 try:
-                    self.driver.execute_cdp_cmd(
+                    self.execute_cdp_cmd(
                         "Emulation.setTimezoneOverride",
                         {"timezoneId": tz},
                     )
@@ -212,7 +238,7 @@ class DriverPreparation:
                 } catch (e) {}
             """
             try:
-                self.driver.execute_cdp_cmd(
+                self.execute_cdp_cmd(
                     "Page.addScriptToEvaluateOnNewDocument", {"source": stealth_script}
                 )
             except Exception:
@@ -220,30 +246,313 @@ class DriverPreparation:
         except Exception as e:
             logging.warning(f"⚠️ Stealth tweaks could not be fully applied: {e}")
 
+    @timed_command("navigateTo")
     def navigateTo(self, url: str):
+        with self.__mainWindow():
+            self.__navigate(url)
+
+    def relaunch_if_over_limits(self) -> bool:
+        """Between tests, replace a browser that outgrew RESOURCE_MAX_*; pooled sessions are checked on release.
+
+        Never called mid-test: a relaunch drops cookies, tabs and browser contexts.
+        """
+        if not self.resourceGovernor.limited:
+            return False
+        try:
+            exceeded = self.check_resources()
+        except WebDriverException as e:
+            logging.warning(f"⚠️ Could not sample WebDriver session resources: {e}")
+            return False
+        if not exceeded:
+            return False
+        logging.info(f"♻️ Relaunching the browser over its resource limits ({', '.join(exceeded)})")
+        self.relaunch()
+        return True
+
+    def relaunch(self):
+        """Quit the browser and start a fresh one in place; browser contexts and the HAR recording end with it."""
+        self.close_contexts()
+        self.contextRouter = self.mainWindow = None
+        self.quit()
+        self.__trackState = False
+        self.sessionState = SessionState()
+        self.lastNavigationReport = None
+        self.locatorCache = None
+        self.profiler = StartupProfiler()
+        self.__initializeDriver()
+        self.__attachHelpers()
+        self.startupTimings = self.profiler.finish()
+        self.relaunches += 1
+        self.__trackState = True
+
+    def __navigate(self, url: str):
         logging.info(f"🌍 Navigating to {url}")
+        if self.waits is not None:
+            self.waits.reset_network()
+        if self.harRecorder is not None:
+            self.__drainPerformanceLog()
+            self.harRecorder.start_page(url)
         self.driver.get(url)
+        self.sessionState.note_navigation(url)
+        if self.locatorCache is not None:
+            self.locatorCache.invalidate(url)
+        if self.loadProfile.blockedPatterns:
+            self.__reportNavigation(url)
+        elif self.harRecorder is not None:
+            self.__drainPerformanceLog()
+
+    def __reportNavigation(self, url: str):
+        """Summarize what the load profile saved on this navigation from the performance log."""
+        try:
+            entries = self.driver.get_log("performance")
+        except (WebDriverException, ValueError, AttributeError):
+            return
+        if self.waits is not None:
+            # the log is drained by reading it; pass the events on so network_idle still sees them
+            self.waits.observe_network_events(entries)
+        self.lastNavigationReport = summarize_network_events(url, entries)
+        report = self.lastNavigationReport
+        logging.info(
+            f"🚫 {report.blockedRequests} of {report.requests} requests blocked "
+            f"({self.loadProfile.name}); {report.transferredBytes} bytes transferred"
+        )
+
+    def __drainPerformanceLog(self) -> list:
+        try:
+            entries = self.driver.get_log("performance")
+        except (WebDriverException, ValueError, AttributeError):
+            return []
+        self.waits.observe_network_events(entries)
+        return entries
+
+    def start_har(self, path: str, format: str = None) -> HarRecorder:
+        """Stream this session's network activity to ``path`` until ``stop_har``."""
+        if not self.settings.networkEvents:
+            logging.warning("⚠️ HAR recording needs ENABLE_NETWORK_EVENTS=1 or HAR_DIR; the recording will stay empty")
+        self.stop_har()
+        self.harRecorder = HarRecorder(path, format or self.settings.harFormat)
+        self.waits.networkListeners.append(self.harRecorder.observe)
+        logging.info(f"📼 Recording network activity to {path}")
+        return self.harRecorder
+
+    def stop_har(self) -> dict:
+        """Flush outstanding events, close the recording and return its timing summary."""
+        if self.harRecorder is None:
+            return None
+        if self.driver is not None:
+            self.__drainPerformanceLog()
+        self.waits.networkListeners.remove(self.harRecorder.observe)
+        summary = self.harRecorder.close()
+        self.harRecorder = None
+        return summary
 
     def getDriver(self):
-        return self.driver
+        # while browser contexts share the browser, a driver whose commands stay in this session's tab
+        return self.mainWindow.driver if self.mainWindow is not None else self.driver
 
     def quit(self):
         logging.info("🛑 Quitting WebDriver...")
+        try:
+            self.stop_har()
+        except WebDriverException as e:
+            logging.warning(f"⚠️ Could not flush the HAR recording: {e}")
         if self.driver:
+            self.resourceGovernor.forget(self.__sessionLabel())
             self.driver.quit()
-        if self.user_data_dir and os.path.exists(self.user_data_dir):
-            shutil.rmtree(self.user_data_dir, ignore_errors=True)
+        # a USER_DATA_DIR profile belongs to the user and outlives the session
+        if self.user_data_dir and self.user_data_dir != self.settings.userDataDir and os.path.exists(self.user_data_dir):
+            reaper.discard(self.user_data_dir)
 
-    def find_element(self, element: tuple) -> WebElement:
+    @timed_command("find_element")
+    def find_element(self, element: tuple) -> "WebElement":
         try:
-            return self.driver.find_element(*element)
+            with self.__mainWindow():
+                if self.locatorCache is not None:
+                    return self.__bound(self.locatorCache.find(element))
+                return self.__bound(self.driver.find_element(*element))
         except NoSuchElementException:
             logging.warning(f"⚠️ Element not found: {element}")
 
-    def click_on_element(self, element: WebElement):
+    def query_elements(self, queries: list) -> list:
+        """Read attributes/properties for many locators in one round trip; see batchquery.batch_query."""
+        with self.__mainWindow():
+            from automdjango.srcode.drivers.batchquery import ElementQuery, batch_query
+
+            return batch_query(self.driver, [q if isinstance(q, ElementQuery) else ElementQuery(*q) for q in queries])
+
+    @timed_command("click_on_element")
+    def click_on_element(self, element: "WebElement"):
         logging.info(f"🖱️ Clicking element {element}")
         element.click()
 
+    @timed_command("execute_cdp_cmd")
+    def execute_cdp_cmd(self, cmd: str, params: dict = None):
+        if not self.backend.supportsCdp:
+            raise WebDriverException(f"{cmd} needs CDP, which the {self.backend.name} backend does not provide")
+        with self.__mainWindow():
+            if hasattr(self.driver, "execute_cdp_cmd"):
+                result = self.driver.execute_cdp_cmd(cmd, params or {})
+            else:
+                # registered on the command executor by RemoteBackend.start
+                result = self.driver.execute("executeCdpCommand", {"cmd": cmd, "params": params or {}})["value"]
+        if self.__trackState:
+            self.sessionState.note_command(cmd, result)
+        return result
+
+    @timed_command("reset")
+    def reset(self, verify: bool = False) -> list:
+        """Bring the running browser back to a clean state without relaunching it.
+
+        Closes extra tabs, leaves the page, clears cookies, the HTTP cache and all
+        storage (local/session, IndexedDB, Cache Storage, service workers) of every
+        origin the session visited, resets permissions, and undoes emulation and
+        network overrides issued through ``execute_cdp_cmd`` since startup. Startup
+        settings (load profile, stealth) stay in place. With ``verify`` the leak
+        checklist runs afterwards and its findings are returned.
+
+        Backends without CDP only get cookies and storage of the current origin
+        cleared and extra tabs closed.
+        """
+        if not self.backend.supportsCdp:
+            return self.__resetWithoutCdp()
+        self.close_contexts()
+        origins = set(self.sessionState.origins)
+        try:
+            mainHandle = self.contextRouter.mainHandle if self.contextRouter else self.driver.current_window_handle
+        except WebDriverException:
+            # the test closed the tab it was on
+            mainHandle = self.driver.window_handles[0]
+        close_extra_tabs(self.driver, mainHandle, self.execute_cdp_cmd, origins)
+        if self.contextRouter is not None:
+            self.contextRouter.mainHandle = self.contextRouter.activeHandle = mainHandle
+        self.navigateTo("about:blank")
+        clear_browser_state(self.execute_cdp_cmd, origins, self.sessionState, self.__resetBaseline())
+        self.sessionState.clear()
+        self.lastNavigationReport = None
+        if self.locatorCache is not None:
+            self.locatorCache.invalidate("about:blank")
+        return find_state_leaks(self.driver, self.execute_cdp_cmd, origins) if verify else []
+
+    def __resetWithoutCdp(self) -> list:
+        mainHandle = self.driver.window_handles[0]
+        for handle in self.driver.window_handles[1:]:
+            self.driver.switch_to.window(handle)
+            self.driver.close()
+        self.driver.switch_to.window(mainHandle)
+        self.driver.delete_all_cookies()
+        try:
+            self.driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        except WebDriverException:
+            pass  # about:blank and other opaque origins have no storage
+        self.navigateTo("about:blank")
+        self.sessionState.clear()
+        self.lastNavigationReport = None
+        return []
+
+    def __resetBaseline(self) -> dict:
+        """Params that put baseline-managed overrides back to how startup left them."""
+        stealthy = self.settings.enableStealth
+        if stealthy:
+            userAgent = {"userAgent": self.settings.realisticUa, "platform": "Windows"}
+        else:
+            userAgent = {"userAgent": self.execute_cdp_cmd("Browser.getVersion", {})["userAgent"]}
+        headers = {}
+        if stealthy and self.settings.setAcceptLanguage:
+            headers = {"Accept-Language": self.settings.acceptLanguage}
+        return {
+            "Network.setUserAgentOverride": userAgent,
+            "Network.setExtraHTTPHeaders": {"headers": headers},
+            "Emulation.setTimezoneOverride": {"timezoneId": (self.settings.tzOverride if stealthy else None) or ""},
+            "Network.setBlockedURLs": {"urls": self.loadProfile.blockedPatterns},
+        }
+
+    @timed_command("capture_artifacts")
+    def capture_artifacts(self, kinds=ARTIFACT_KINDS, store=None) -> list:
+        """Screenshot, DOM and logs of the current page; compressed and written in the background."""
+        if self.driver is None:
+            return []
+        if not self.settings.networkEvents:
+            kinds = tuple(kind for kind in kinds if kind != "performance")
+        with self.__mainWindow():
+            records = capture_artifacts(
+                self.driver, store or get_artifact_store(), kinds, performance_log=self.__drainPerformanceLog
+            )
+            try:
+                url = self.driver.current_url
+            except WebDriverException:
+                url = "an unreachable session"
+        logging.info(f"📸 Captured {', '.join(record.kind for record in records)} for {url}")
+        return records
+
+    def http_cache_report(self):
+        """Hit/miss counts of the HTTP cache proxy so far (shared by the process), or None when it is off."""
+        return self.httpCache.cache.report() if self.httpCache is not None else None
+
+    def transport_report(self):
+        """Wire vs. browser time of remote WebDriver commands so far (shared by the process), or None when local."""
+        if self.backend.name != "remote":
+            return None
+        from automdjango.srcode.drivers.remotetransport import get_remote_transport
+
+        return get_remote_transport(self.settings).report()
+
+    def resource_sample(self) -> ResourceSample:
+        """JS heap and DOM size of the page plus, for local sessions, RSS and CPU of the browser's processes."""
+        with self.__mainWindow():
+            return self.resourceGovernor.sample(self.__sessionLabel(), self.execute_cdp_cmd, self.__browserPid())
+
+    def check_resources(self) -> list:
+        """The RESOURCE_MAX_* limits this session currently exceeds; empty while it may be reused."""
+        with self.__mainWindow():
+            return self.resourceGovernor.check(self.__sessionLabel(), self.execute_cdp_cmd, self.__browserPid())
+
+    def __sessionLabel(self) -> str:
+        return (getattr(self.driver, "session_id", None) or "unknown")[:8]
+
+    def __browserPid(self):
+        # chromedriver's pid; Chrome and its renderers are its descendants. None for remote sessions.
+        process = getattr(getattr(self.driver, "service", None), "process", None)
+        return getattr(process, "pid", None)
+
     def get_page_title(self) -> str:
-        return self.driver.title
+        with self.__mainWindow():
+            return self.driver.title
+
+    def new_context(self) -> "BrowserContext":
+        """A fresh isolated browser context in this Chrome; see browsercontexts.BrowserContext."""
+        from automdjango.srcode.drivers.browsercontexts import BrowserContext, ContextRouter, MainWindow
+
+        if self.contextRouter is None:
+            self.contextRouter = ContextRouter(self.driver)
+            self.mainWindow = MainWindow(self.contextRouter)
+            # elements found and conditions polled from now on run in this session's tab
+            self.waits.driver = self.mainWindow.driver
+            if self.locatorCache is not None:
+                self.locatorCache.driver = self.mainWindow.driver
+        context = BrowserContext.create(self, self.contextRouter)
+        self.contexts.append(context)
+        return context
+
+    def close_contexts(self):
+        for context in self.contexts:
+            try:
+                context.close()
+            except WebDriverException as e:
+                logging.warning(f"⚠️ Could not dispose browser context {context.contextId}: {e}")
+        self.contexts = []
+
+    def __bound(self, value):
+        return self.mainWindow.wrap(value) if self.mainWindow is not None else value
+
+    def __mainWindow(self):
+        """Point WebDriver at this session's own tab while browser contexts share the browser."""
+        if self.contextRouter is None:
+            return nullcontext()
+        return self.__routedToMain()
+
+    @contextmanager
+    def __routedToMain(self):
+        with self.contextRouter.lock:
+            self.contextRouter.activate(self.contextRouter.mainHandle)
+            yield
 
@@ -0,0 +1,58 @@
+import logging
+from typing import Optional
+
+
+class GridCapacity:
+    """Slot counts reported by a Selenium Grid (or standalone server) /status endpoint."""
+
+    def __init__(self, ready: bool, totalSlots: Optional[int], freeSlots: Optional[int]):
+        self.ready = ready
+        self.totalSlots = totalSlots
+        self.freeSlots = freeSlots
+
+    def __repr__(self):
+        return f"GridCapacity(ready={self.ready}, totalSlots={self.totalSlots}, freeSlots={self.freeSlots})"
+
+
+def status_url(remote_url: str) -> str:
+    """Map a command executor URL (e.g. http://selenium:4444/wd/hub) to its /status endpoint."""
+    base = remote_url.rstrip("/")
+    if base.endswith("/wd/hub"):
+        base = base[: -len("/wd/hub")]
+    return base + "/status"
+
+
+def parse_grid_status(payload: dict) -> GridCapacity:
+    value = payload.get("value") or {}
+    ready = bool(value.get("ready", False))
+    nodes = value.get("nodes")
+    if not nodes:
+        # Grid 3 / chromedriver style status: readiness only, capacity unknown
+        return GridCapacity(ready, None, None)
+
+    total = 0
+    free = 0
+    for node in nodes:
+        if node.get("availability", "UP") != "UP":
+            continue
+        slots = node.get("slots") or []
+        nodeFree = sum(1 for slot in slots if not slot.get("session"))
+        # a node never runs more than maxSessions at once even if it advertises more slots
+        nodeTotal = min(len(slots), node.get("maxSessions", len(slots)))
+        nodeBusy = len(slots) - nodeFree
+        total += nodeTotal
+        free += max(0, min(nodeFree, nodeTotal - nodeBusy))
+    return GridCapacity(ready, total, free)
+
+
+def fetch_grid_capacity(remote_url: str, timeout: float = 5) -> Optional[GridCapacity]:
+    import requests
+
+    try:
+        response = requests.get(status_url(remote_url), timeout=timeout)
+        response.raise_for_status()
+        return parse_grid_status(response.json())
+    except Exception as e:
+        logging.warning(f"⚠️ Could not read grid status from {remote_url}: {e}")
+        return None
+
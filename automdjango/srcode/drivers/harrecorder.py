@@ -0,0 +1,273 @@
+import os
+import json
+import logging
+import threading
+from datetime import datetime, timezone
+from automdjango.srcode.drivers.instrumentation import percentile
+
+HAR_FORMATS = ("har", "ndjson")
+TIMING_PHASES = ("blocked", "dns", "connect", "ssl", "send", "wait", "receive")
+CREATOR = {"name": "automdjango", "version": "1.0"}
+
+
+def _span(timing: dict, start: str, end: str) -> float:
+    begin, finish = timing.get(start, -1), timing.get(end, -1)
+    return round(finish - begin, 3) if begin is not None and begin >= 0 and finish >= 0 else -1
+
+
+def har_timings(timing: dict, finishedAt: float = None) -> dict:
+    """HAR ``timings`` (milliseconds, -1 when not applicable) from a CDP ``ResourceTiming``.
+
+    ``wait`` is time to first byte after the request was sent; ``receive`` runs from
+    the response headers to ``Network.loadingFinished`` (``finishedAt``, seconds on
+    the same monotonic clock as ``timing["requestTime"]``).
+    """
+    if not timing:
+        return {phase: -1 for phase in TIMING_PHASES}
+    firstActivity = [timing.get(key, -1) for key in ("dnsStart", "connectStart", "sendStart")]
+    started = [value for value in firstActivity if value is not None and value >= 0]
+    headersEnd = timing.get("receiveHeadersEnd", -1)
+    receive = -1
+    if finishedAt is not None and headersEnd >= 0:
+        receive = round(max((finishedAt - timing["requestTime"]) * 1000 - headersEnd, 0), 3)
+    return {
+        "blocked": round(started[0], 3) if started else -1,
+        "dns": _span(timing, "dnsStart", "dnsEnd"),
+        "connect": _span(timing, "connectStart", "connectEnd"),
+        "ssl": _span(timing, "sslStart", "sslEnd"),
+        "send": _span(timing, "sendStart", "sendEnd"),
+        "wait": _span(timing, "sendEnd", "receiveHeadersEnd"),
+        "receive": receive,
+    }
+
+
+def _total(timings: dict) -> float:
+    # ssl is already part of connect in HAR
+    return round(sum(value for phase, value in timings.items() if phase != "ssl" and value > 0), 3)
+
+
+def _headers(headers: dict) -> list:
+    return [{"name": name, "value": str(value)} for name, value in (headers or {}).items()]
+
+
+def _rounded(value):
+    return round(value, 3) if value is not None else None
+
+
+class TimingSummary:
+    """Running per-phase statistics; only durations are kept, not the entries themselves."""
+
+    def __init__(self):
+        self.requests = 0
+        self.failed = 0
+        self.blocked = 0
+        self.transferredBytes = 0
+        self.byType = {}
+        self.phases = {phase: [] for phase in ("dns", "connect", "ssl", "wait", "receive")}
+        self.totals = []
+        self.slowest = []
+
+    def add(self, entry: dict):
+        self.requests += 1
+        self.transferredBytes += max(entry["response"].get("_transferSize", 0), 0)
+        resourceType = entry.get("_resourceType", "Other")
+        self.byType[resourceType] = self.byType.get(resourceType, 0) + 1
+        if entry.get("_blockedReason"):
+            self.blocked += 1
+        elif entry.get("_error"):
+            self.failed += 1
+        for phase, values in self.phases.items():
+            if entry["timings"][phase] >= 0:
+                values.append(entry["timings"][phase])
+        self.totals.append(entry["time"])
+        self.slowest.append((entry["time"], entry["request"]["url"]))
+        if len(self.slowest) > 50:
+            self.slowest = sorted(self.slowest, reverse=True)[:10]
+
+    def as_dict(self) -> dict:
+        def stats(values):
+            ordered = sorted(values)
+            return {
+                "count": len(values),
+                "total": round(sum(values), 3),
+                "p50": _rounded(percentile(ordered, 0.5)),
+                "p95": _rounded(percentile(ordered, 0.95)),
+                "max": max(values) if values else None,
+            }
+
+        return {
+            "requests": self.requests,
+            "failed": self.failed,
+            "blocked": self.blocked,
+            "transferredBytes": self.transferredBytes,
+            "byType": dict(self.byType),
+            "phasesMs": {
+                "dns": stats(self.phases["dns"]),
+                "connect": stats(self.phases["connect"]),
+                "ssl": stats(self.phases["ssl"]),
+                "ttfb": stats(self.phases["wait"]),
+                "download": stats(self.phases["receive"]),
+                "total": stats(self.totals),
+            },
+            "slowest": [{"url": url, "timeMs": time} for time, url in sorted(self.slowest, reverse=True)[:10]],
+        }
+
+
+class HarRecorder:
+    """Turns CDP ``Network.*`` events from Chrome's performance log into HAR entries.
+
+    Entries are written to disk as each request finishes, so memory holds only the
+    requests still in flight. ``har`` produces one HAR 1.2 document whose ``pages``
+    are appended on close; ``ndjson`` writes one entry per line. ``close`` returns a
+    per-phase timing summary (DNS, connect, TTFB, download), also written next to
+    the recording as ``<path>.summary.json``.
+    """
+
+    def __init__(self, path: str, format: str = "har"):
+        if format not in HAR_FORMATS:
+            raise ValueError(f"Unknown HAR format {format!r}; expected one of {', '.join(HAR_FORMATS)}")
+        self.path = path
+        self.format = format
+        self.summary = TimingSummary()
+        self.pages = []
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._written = 0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._handle = open(path, "w", encoding="utf-8")
+        if format == "har":
+            self._handle.write('{"log": {"version": "1.2", "creator": ' + json.dumps(CREATOR) + ', "entries": [\n')
+
+    def start_page(self, url: str):
+        """Entries recorded from now on belong to a new page (one per navigation)."""
+        with self._lock:
+            self.pages.append({
+                "id": f"page_{len(self.pages) + 1}",
+                "title": url,
+                "startedDateTime": datetime.now(timezone.utc).isoformat(),
+                "pageTimings": {},
+            })
+
+    def observe(self, entries: list):
+        """Consume performance-log entries (``{"message": "<json>"}``)."""
+        with self._lock:
+            if self._handle is None:
+                return
+            for entry in entries:
+                try:
+                    event = json.loads(entry["message"])["message"]
+                except (KeyError, TypeError, ValueError):
+                    continue
+                handler = self.__handlers.get(event.get("method"))
+                if handler is not None:
+                    handler(self, event.get("params", {}))
+            self._handle.flush()
+
+    def close(self) -> dict:
+        with self._lock:
+            if self._handle is None:
+                return self.summary.as_dict()
+            for requestId in list(self._inflight):
+                self.__finish(requestId, error="unfinished")
+            if self.format == "har":
+                self._handle.write("\n], \"pages\": " + json.dumps(self.pages) + "}}\n")
+            self._handle.close()
+            self._handle = None
+        summary = self.summary.as_dict()
+        with open(f"{self.path}.summary.json", "w", encoding="utf-8") as handle:
+            json.dump(summary, handle, indent=2)
+        logging.info(
+            f"📼 Recorded {summary['requests']} requests to {self.path} "
+            f"(TTFB p95 {summary['phasesMs']['ttfb']['p95']} ms)"
+        )
+        return summary
+
+    def __request(self, params: dict):
+        requestId = params.get("requestId")
+        if params.get("redirectResponse") and requestId in self._inflight:
+            self.__response(self._inflight[requestId], params["redirectResponse"])
+            self.__finish(requestId, finishedAt=params.get("timestamp"))
+        request = params.get("request", {})
+        self._inflight[requestId] = {
+            "pageref": self.pages[-1]["id"] if self.pages else None,
+            "startedDateTime": datetime.fromtimestamp(params.get("wallTime", 0), timezone.utc).isoformat(),
+            "request": {
+                "method": request.get("method", "GET"),
+                "url": request.get("url", ""),
+                "httpVersion": "",
+                "headers": _headers(request.get("headers")),
+                "queryString": [],
+                "cookies": [],
+                "headersSize": -1,
+                "bodySize": len(request.get("postData", "")) if request.get("hasPostData") else 0,
+            },
+            "response": {"status": 0, "statusText": "", "httpVersion": "", "headers": [], "cookies": [],
+                         "content": {"size": 0, "mimeType": ""}, "redirectURL": "",
+                         "headersSize": -1, "bodySize": -1},
+            "_resourceType": params.get("type", "Other"),
+            "_timing": None,
+        }
+
+    def __response(self, pending: dict, response: dict):
+        pending["response"].update({
+            "status": response.get("status", 0),
+            "statusText": response.get("statusText", ""),
+            "httpVersion": response.get("protocol", ""),
+            "headers": _headers(response.get("headers")),
+            "content": {"size": 0, "mimeType": response.get("mimeType", "")},
+            "redirectURL": (response.get("headers") or {}).get("location", ""),
+        })
+        pending["request"]["httpVersion"] = response.get("protocol", "")
+        pending["serverIPAddress"] = response.get("remoteIPAddress", "")
+        pending["_timing"] = response.get("timing")
+        pending["_fromCache"] = bool(response.get("fromDiskCache") or response.get("fromServiceWorker"))
+
+    def __responseReceived(self, params: dict):
+        pending = self._inflight.get(params.get("requestId"))
+        if pending is not None:
+            self.__response(pending, params.get("response", {}))
+            pending["_resourceType"] = params.get("type", pending["_resourceType"])
+
+    def __dataReceived(self, params: dict):
+        pending = self._inflight.get(params.get("requestId"))
+        if pending is not None:
+            pending["response"]["content"]["size"] += params.get("dataLength", 0)
+
+    def __loadingFinished(self, params: dict):
+        requestId = params.get("requestId")
+        if requestId in self._inflight:
+            self._inflight[requestId]["response"]["_transferSize"] = int(params.get("encodedDataLength", 0))
+            self._inflight[requestId]["response"]["bodySize"] = int(params.get("encodedDataLength", 0))
+            self.__finish(requestId, finishedAt=params.get("timestamp"))
+
+    def __loadingFailed(self, params: dict):
+        requestId = params.get("requestId")
+        if requestId in self._inflight:
+            self.__finish(requestId, finishedAt=params.get("timestamp"), error=params.get("errorText", "failed"),
+                          blockedReason=params.get("blockedReason"))
+
+    def __finish(self, requestId, finishedAt: float = None, error: str = None, blockedReason: str = None):
+        entry = self._inflight.pop(requestId)
+        timing = entry.pop("_timing")
+        entry["timings"] = har_timings(timing, finishedAt)
+        entry["time"] = _total(entry["timings"])
+        entry["cache"] = {}
+        if error:
+            entry["_error"] = error
+        if blockedReason:
+            entry["_blockedReason"] = blockedReason
+        self.summary.add(entry)
+        entry["response"].pop("_transferSize", None)
+        if self.format == "har":
+            self._handle.write((",\n" if self._written else "") + json.dumps(entry))
+        else:
+            self._handle.write(json.dumps(entry) + "\n")
+        self._written += 1
+
+    __handlers = {
+        "Network.requestWillBeSent": __request,
+        "Network.responseReceived": __responseReceived,
+        "Network.dataReceived": __dataReceived,
+        "Network.loadingFinished": __loadingFinished,
+        "Network.loadingFailed": __loadingFailed,
+    }
@@ -0,0 +1,421 @@
+import os
+import ssl
+import json
+import atexit
+import select
+import socket
+import hashlib
+import logging
+import threading
+import subprocess
+import http.client
+from urllib.parse import urlsplit
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from automdjango.srcode.drivers.drivercache import file_lock
+from automdjango.srcode.drivers.instrumentation import metrics
+from automdjango.srcode.runtimesettings import HTTP_CACHE_MODES, RuntimeSettings, get_settings
+
+CACHEABLE_METHODS = frozenset({"GET", "HEAD", "POST"})
+# connection-level headers a proxy must not forward (RFC 9110 section 7.6.1)
+HOP_BY_HOP = frozenset({
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization", "proxy-connection",
+    "te", "trailer", "transfer-encoding", "upgrade", "content-length",
+})
+MAX_REPORTED_MISSES = 50
+
+
+class CachedResponse:
+
+    def __init__(self, status: int, reason: str, headers: list, body: bytes):
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+
+
+def request_key(method: str, url: str, body: bytes = b"") -> str:
+    digest = hashlib.sha256(f"{method} {url}\n".encode("utf-8"))
+    if body:
+        digest.update(hashlib.sha256(body).digest())
+    return digest.hexdigest()
+
+
+class _UpstreamConnections(threading.local):
+    """Keep-alive connections to origins, one set per proxy thread."""
+
+    def __init__(self):
+        self.connections = {}
+
+    def fetch(self, method: str, url: str, headers: list, body: bytes) -> CachedResponse:
+        parts = urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        for attempt in (1, 2):
+            connection = self.__connection(parts.scheme, parts.netloc)
+            try:
+                connection.request(method, path, body or None, dict(headers))
+                response = connection.getresponse()
+                data = response.read()
+                return CachedResponse(response.status, response.reason, _end_to_end(response.getheaders()), data)
+            except (http.client.HTTPException, ConnectionError):
+                # the origin closed an idle keep-alive connection; retry once on a fresh one
+                self.connections.pop((parts.scheme, parts.netloc)).close()
+                if attempt == 2:
+                    raise
+
+    def __connection(self, scheme: str, netloc: str):
+        key = (scheme, netloc)
+        if key not in self.connections:
+            kind = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            self.connections[key] = kind(netloc, timeout=30)
+        return self.connections[key]
+
+
+def _end_to_end(headers) -> list:
+    return [[name, value] for name, value in headers if name.lower() not in HOP_BY_HOP]
+
+
+class HttpCache:
+    """Responses keyed by method, URL and request body, with bodies stored by content hash.
+
+    ``root/index.json`` maps request keys to status, headers and the body's sha256;
+    bodies live in ``root/bodies/<sha[:2]>/<sha>`` so identical payloads are stored
+    once. Modes:
+
+    - ``record``: serve what is cached, fetch and store everything else
+    - ``replay``: serve only from the cache; a miss is answered with 504 and never
+      reaches the network
+    - ``passthrough``: always fetch, store nothing, and count what the cache would
+      have served
+
+    Each new entry is appended to ``root/index.jsonl`` as soon as its body is on
+    disk, under a file lock so parallel workers can record into the same
+    directory; ``save`` folds that journal into ``index.json``. A worker that dies
+    before ``save`` keeps what it recorded.
+    """
+
+    def __init__(self, root: str, mode: str = "record", fetch=None):
+        if mode not in HTTP_CACHE_MODES[1:]:
+            raise ValueError(f"Unknown HTTP cache mode {mode!r}; expected one of {', '.join(HTTP_CACHE_MODES[1:])}")
+        self.root = root
+        self.mode = mode
+        self.fetch = fetch or _UpstreamConnections().fetch
+        self.index = _read_index(self.indexPath, self.journalPath)
+        self.recorded = {}
+        self.counts = {"hit": 0, "miss": 0, "stored": 0, "error": 0, "tunneled": 0}
+        self.misses = []
+        self._lock = threading.Lock()
+
+    @property
+    def indexPath(self) -> str:
+        return os.path.join(self.root, "index.json")
+
+    @property
+    def journalPath(self) -> str:
+        return os.path.join(self.root, "index.jsonl")
+
+    def handle(self, method: str, url: str, headers: list, body: bytes = b"") -> CachedResponse:
+        cacheable = method in CACHEABLE_METHODS
+        key = request_key(method, url, body) if cacheable else None
+        entry = self.__lookup(key) if cacheable else None
+        if entry is not None and self.mode != "passthrough":
+            cached = self.__load(entry)
+            if cached is not None:
+                self.__count("hit")
+                return cached
+            entry = None
+        self.__count("hit" if entry is not None else "miss", None if entry is not None else url)
+        if self.mode == "replay":
+            message = f"{url} is not in the HTTP cache".encode("utf-8")
+            return CachedResponse(504, "Not In Cache", [["Content-Type", "text/plain"]], message)
+        try:
+            response = self.fetch(method, url, headers, body)
+        except (OSError, http.client.HTTPException) as e:
+            self.__count("error")
+            logging.warning(f"⚠️ HTTP cache could not fetch {url}: {e}")
+            return CachedResponse(502, "Bad Gateway", [["Content-Type", "text/plain"]], str(e).encode())
+        if self.mode == "record" and cacheable:
+            self.__store(key, method, url, response)
+        return response
+
+    def note_tunnel(self, authority: str):
+        self.__count("tunneled", f"CONNECT {authority}")
+
+    def report(self) -> dict:
+        with self._lock:
+            served = self.counts["hit"] + self.counts["miss"]
+            return {
+                "mode": self.mode,
+                **self.counts,
+                "hitRate": round(self.counts["hit"] / served, 3) if served else None,
+                "misses": list(self.misses),
+            }
+
+    def save(self):
+        """Fold the journal of recorded entries, from every worker, into ``index.json``."""
+        if not os.path.exists(self.journalPath):
+            return
+        with file_lock(f"{self.indexPath}.lock"):
+            index = _read_index(self.indexPath, self.journalPath)
+            partial = f"{self.indexPath}.{os.getpid()}.partial"
+            with open(partial, "w") as handle:
+                json.dump(index, handle, sort_keys=True)
+            os.replace(partial, self.indexPath)
+            os.remove(self.journalPath)
+        with self._lock:
+            self.index, self.recorded = index, {}
+
+    def __lookup(self, key: str):
+        with self._lock:
+            return self.recorded.get(key) or self.index.get(key)
+
+    def __load(self, entry: dict):
+        try:
+            with open(self.__bodyPath(entry["body"]), "rb") as handle:
+                body = handle.read()
+        except OSError:
+            return None
+        return CachedResponse(entry["status"], entry["reason"], entry["headers"], body)
+
+    def __store(self, key: str, method: str, url: str, response: CachedResponse):
+        sha256 = hashlib.sha256(response.body).hexdigest()
+        path = self.__bodyPath(sha256)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            partial = f"{path}.{threading.get_ident()}.partial"
+            with open(partial, "wb") as handle:
+                handle.write(response.body)
+            os.replace(partial, path)
+        entry = {
+            "method": method, "url": url, "status": response.status, "reason": response.reason,
+            "headers": response.headers, "body": sha256, "size": len(response.body),
+        }
+        with self._lock:
+            self.recorded[key] = entry
+        with file_lock(f"{self.indexPath}.lock"):
+            with open(self.journalPath, "a") as handle:
+                handle.write(json.dumps({key: entry}, sort_keys=True) + "\n")
+        self.__count("stored")
+
+    def __bodyPath(self, sha256: str) -> str:
+        return os.path.join(self.root, "bodies", sha256[:2], sha256)
+
+    def __count(self, result: str, missed: str = None):
+        with self._lock:
+            self.counts[result] += 1
+            if missed and len(self.misses) < MAX_REPORTED_MISSES and missed not in self.misses:
+                self.misses.append(missed)
+        metrics.inc(
+            "automdjango_http_cache_requests_total", {"mode": self.mode, "result": result},
+            help="Requests seen by the record/replay HTTP cache proxy",
+        )
+
+
+def _read_index(path: str, journal: str) -> dict:
+    """The index at ``path`` with the entries ``journal`` gained since the last ``save``."""
+    try:
+        with open(path) as handle:
+            index = json.load(handle)
+    except (OSError, ValueError):
+        index = {}
+    try:
+        with open(journal) as handle:
+            for line in handle:
+                try:
+                    index.update(json.loads(line))
+                except ValueError:
+                    # a line cut short by a crashed writer
+                    continue
+    except OSError:
+        pass
+    return index
+
+
+def _read_chunked(rfile) -> bytes:
+    """A ``Transfer-Encoding: chunked`` body (RFC 9112 section 7.1), leaving the connection at the next request."""
+    chunks = []
+    while True:
+        size = int(rfile.readline(65537).split(b";", 1)[0].strip(), 16)
+        if size == 0:
+            break
+        chunks.append(rfile.read(size))
+        if rfile.readline(3) not in (b"\r\n", b"\n"):
+            raise ValueError("chunk is not followed by CRLF")
+    while rfile.readline(65537) not in (b"\r\n", b"\n", b""):
+        # trailer fields are not forwarded
+        pass
+    return b"".join(chunks)
+
+
+def tls_context(root: str):
+    """Server-side TLS context for intercepting HTTPS, with a self-signed certificate made by openssl.
+
+    Chrome accepts it because the proxy is only used together with
+    ``--ignore-certificate-errors``. None when openssl is unavailable, in which case
+    HTTPS is tunneled through uncached.
+    """
+    directory = os.path.join(root, "tls")
+    certificate, key = os.path.join(directory, "cert.pem"), os.path.join(directory, "key.pem")
+    os.makedirs(directory, exist_ok=True)
+    with file_lock(os.path.join(directory, ".lock")):
+        if not (os.path.exists(certificate) and os.path.exists(key)):
+            try:
+                subprocess.run(
+                    ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "3650",
+                     "-keyout", key, "-out", certificate, "-subj", "/CN=automdjango-http-cache"],
+                    check=True, capture_output=True, timeout=60,
+                )
+            except (OSError, subprocess.SubprocessError) as e:
+                logging.warning(f"⚠️ Could not create a TLS certificate for the HTTP cache, HTTPS will not be cached: {e}")
+                return None
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(certificate, key)
+    return context
+
+
+class _ProxyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    origin = None
+
+    def do_CONNECT(self):
+        host, _, port = self.path.rpartition(":")
+        if self.server.tlsContext is None:
+            self.__tunnel(host, int(port or 443))
+            return
+        self.send_response_only(200, "Connection Established")
+        self.end_headers()
+        try:
+            self.connection = self.server.tlsContext.wrap_socket(self.connection, server_side=True)
+        except (ssl.SSLError, OSError) as e:
+            logging.debug(f"TLS handshake with the browser failed for {self.path}: {e}")
+            self.close_connection = True
+            return
+        # the requests inside the tunnel are read by the same handle() loop,
+        # whatever the CONNECT request's own keep-alive semantics were
+        self.close_connection = False
+        self.rfile = self.connection.makefile("rb", self.rbufsize)
+        self.wfile = self.connection.makefile("wb", 0)
+        self.origin = f"https://{host}" if port in ("", "443") else f"https://{host}:{port}"
+
+    def do_GET(self):
+        url = self.path if self.origin is None else f"{self.origin}{self.path}"
+        if "chunked" in self.headers.get("Transfer-Encoding", "").lower():
+            try:
+                body = _read_chunked(self.rfile)
+            except ValueError:
+                self.send_error(400, "Malformed chunked request body")
+                return
+        else:
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length) if length else b""
+        headers = _end_to_end(self.headers.items())
+        response = self.server.cache.handle(self.command, url, headers, body)
+        self.send_response_only(response.status, response.reason)
+        for name, value in response.headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(response.body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(response.body)
+
+    do_HEAD = do_POST = do_PUT = do_PATCH = do_DELETE = do_OPTIONS = do_GET
+
+    def __tunnel(self, host: str, port: int):
+        cache = self.server.cache
+        cache.note_tunnel(self.path)
+        if cache.mode == "replay":
+            self.send_error(502, "HTTPS is not cached without a TLS certificate")
+            return
+        try:
+            upstream = socket.create_connection((host, port), timeout=30)
+        except OSError as e:
+            self.send_error(502, str(e))
+            return
+        self.send_response_only(200, "Connection Established")
+        self.end_headers()
+        self.close_connection = True
+        sockets = [self.connection, upstream]
+        with upstream:
+            while True:
+                readable, _, broken = select.select(sockets, [], sockets, 60)
+                if broken or not readable:
+                    return
+                for source in readable:
+                    data = source.recv(65536)
+                    if not data:
+                        return
+                    (upstream if source is self.connection else self.connection).sendall(data)
+
+    def log_message(self, format, *args):
+        logging.debug(f"HTTP cache proxy: {format % args}")
+
+
+class CacheProxy:
+    """Local HTTP(S) proxy in front of an HttpCache, for Chrome's ``--proxy-server``."""
+
+    def __init__(self, cache: HttpCache, host: str = "127.0.0.1", port: int = 0, tlsContext=None):
+        self.cache = cache
+        self.server = ThreadingHTTPServer((host, port), _ProxyHandler)
+        self.server.daemon_threads = True
+        self.server.cache = cache
+        self.server.tlsContext = tlsContext
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def interceptsTls(self) -> bool:
+        return self.server.tlsContext is not None
+
+    def start(self) -> "CacheProxy":
+        self._thread = threading.Thread(target=self.server.serve_forever, name="http-cache-proxy", daemon=True)
+        self._thread.start()
+        logging.info(f"📼 HTTP cache proxy ({self.cache.mode}) listening on {self.url}, cache in {self.cache.root}")
+        return self
+
+    def stop(self) -> dict:
+        """Stop serving, persist new entries and return the hit/miss report."""
+        self.server.shutdown()
+        self.server.server_close()
+        self.cache.save()
+        report = self.cache.report()
+        logging.info(
+            f"📼 HTTP cache ({report['mode']}): {report['hit']} hits, {report['miss']} misses, "
+            f"{report['stored']} stored, {report['tunneled']} uncached tunnels, {report['error']} errors"
+        )
+        if report["misses"]:
+            logging.info(f"📼 HTTP cache misses: {json.dumps(report['misses'])}")
+        return report
+
+
+_proxy = None
+_proxyLock = threading.Lock()
+
+
+def get_cache_proxy(settings: RuntimeSettings = None) -> CacheProxy:
+    """Process-wide proxy started on first use and stopped at exit; shared by every session."""
+    global _proxy
+    if _proxy is None:
+        with _proxyLock:
+            if _proxy is None:
+                settings = settings or get_settings()
+                cache = HttpCache(settings.httpCacheDir, settings.httpCacheMode)
+                _proxy = CacheProxy(cache, tlsContext=tls_context(settings.httpCacheDir)).start()
+                atexit.register(_proxy.stop)
+    return _proxy
+
+
+def cache_proxy_for(settings: RuntimeSettings = None):
+    """The proxy a new session should use, or None.
+
+    None when HTTP_CACHE_MODE is off or the session is remote: grid nodes cannot
+    reach a proxy listening on this machine's loopback.
+    """
+    settings = settings or get_settings()
+    if settings.httpCacheMode == "off" or settings.seleniumRemoteUrl:
+        return None
+    return get_cache_proxy(settings)
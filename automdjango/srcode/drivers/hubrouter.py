@@ -0,0 +1,318 @@
+"""Spread remote sessions over several Selenium grids.
+
+SELENIUM_REMOTE_URL may list several hubs, separated by commas. ``HubRouter``
+sends each new session to the hub with the most free slots (from its /status
+endpoint, minus sessions this process is still creating there), discounted by
+how long session creation has recently taken on it. A failed creation is
+retried on the next best hub with backoff; GRID_BREAKER_FAILURES consecutive
+failures (of session creation or of the /status read) open the hub's circuit
+breaker for GRID_BREAKER_COOLDOWN seconds, after which a single trial session
+decides whether it closes again. A hub whose /status cannot be read is only
+used as a last resort.
+"""
+import time
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from automdjango.srcode.drivers.gridstatus import GridCapacity, fetch_grid_capacity
+from automdjango.srcode.drivers.instrumentation import metrics
+from automdjango.srcode.runtimesettings import RuntimeSettings, get_settings
+
+# weight of the newest creation time in a hub's moving average
+LATENCY_SMOOTHING = 0.3
+STATUS_TIMEOUT = 2
+
+
+class HubHealth:
+    """What the router knows about one hub."""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.capacity: Optional[GridCapacity] = None
+        self.createSeconds: Optional[float] = None
+        self.consecutiveFailures = 0
+        self.openUntil: Optional[float] = None
+        self.creating = 0
+        self.sessions = 0
+
+    def breaker(self, now: float) -> str:
+        if self.openUntil is None:
+            return "closed"
+        return "open" if now < self.openUntil else "half-open"
+
+    def score(self) -> float:
+        """Free slots per second of expected creation time; higher is better."""
+        if self.capacity is None:
+            # /status could not be read: no evidence of room, so only ``reserve`` falls back to it
+            return 0.0
+        if self.capacity.freeSlots is None:
+            # readiness-only status (Grid 3, standalone chromedriver): assume one slot
+            free = 1 if self.capacity.ready else 0
+        else:
+            free = self.capacity.freeSlots if self.capacity.ready else 0
+        free -= self.creating
+        if free <= 0:
+            return 0.0
+        return free / (1 + (self.createSeconds or 0))
+
+    def snapshot(self, now: float) -> dict:
+        return {
+            "url": self.url,
+            "breaker": self.breaker(now),
+            "freeSlots": self.capacity.freeSlots if self.capacity is not None else None,
+            "createSeconds": round(self.createSeconds, 3) if self.createSeconds is not None else None,
+            "consecutiveFailures": self.consecutiveFailures,
+            "sessions": self.sessions,
+        }
+
+
+class HubRouter:
+    """Chooses a hub for every new remote session and tracks each hub's health."""
+
+    def __init__(self, urls, settings: RuntimeSettings = None, capacity=None, clock=time.monotonic, sleep=time.sleep):
+        if not urls:
+            raise ValueError("HubRouter needs at least one grid URL")
+        self.settings = settings or get_settings()
+        self.hubs = {url: HubHealth(url) for url in urls}
+        self._capacity = capacity or (lambda url: fetch_grid_capacity(url, timeout=STATUS_TIMEOUT))
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """Read /status from every hub whose breaker lets traffic through."""
+        now = self._clock()
+        urls = [url for url, hub in self.hubs.items() if hub.breaker(now) != "open"]
+        if len(urls) == 1:
+            results = [self._capacity(urls[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=len(urls) or 1, thread_name_prefix="grid-status") as pool:
+                results = list(pool.map(self._capacity, urls))
+        for url, capacity in zip(urls, results):
+            with self._lock:
+                self.hubs[url].capacity = capacity
+                if capacity is None:
+                    self.__failed(self.hubs[url])
+            if capacity is not None and capacity.freeSlots is not None:
+                metrics.set_gauge(
+                    "automdjango_grid_free_slots", capacity.freeSlots, {"hub": url},
+                    help="Free slots last reported by each grid hub",
+                )
+
+    def choose(self, avoid=()) -> Optional[str]:
+        """The best hub for a new session, reserved until ``release``; None when none has room.
+
+        Hubs in ``avoid`` (e.g. ones that just failed) are used only when nothing else has room.
+        """
+        self.refresh()
+        now = self._clock()
+        with self._lock:
+            candidates = []
+            for order, (url, hub) in enumerate(self.hubs.items()):
+                state = hub.breaker(now)
+                if state == "open" or (state == "half-open" and hub.creating):
+                    continue
+                score = hub.score()
+                if score > 0:
+                    # ties go to the hub with fewer sessions in flight, then to the one listed first
+                    candidates.append((url not in avoid, score, -hub.creating, -hub.sessions, -order, url))
+            if not candidates:
+                return None
+            url = max(candidates)[-1]
+            self.hubs[url].creating += 1
+            return url
+
+    def release(self, url: str, seconds: float = None, error: Exception = None):
+        """Record how creating a session on ``url`` went.
+
+        A ``SessionNotCreatedException`` means the hub was full, not unhealthy, so
+        only other errors count towards its circuit breaker; cancellation
+        (a ``BaseException``) only gives the reservation back.
+        """
+        from selenium.common import SessionNotCreatedException
+
+        failed = isinstance(error, Exception)
+        unhealthy = failed and not isinstance(error, SessionNotCreatedException)
+        with self._lock:
+            hub = self.hubs[url]
+            hub.creating = max(0, hub.creating - 1)
+            if error is None:
+                hub.sessions += 1
+                hub.consecutiveFailures = 0
+                if hub.openUntil is not None:
+                    logging.info(f"✅ Grid hub {url} recovered; closing its circuit breaker")
+                hub.openUntil = None
+                if seconds is not None:
+                    hub.createSeconds = seconds if hub.createSeconds is None else (
+                        LATENCY_SMOOTHING * seconds + (1 - LATENCY_SMOOTHING) * hub.createSeconds
+                    )
+            elif unhealthy:
+                self.__failed(hub)
+            opened = hub.openUntil is not None
+        if error is None and seconds is not None:
+            metrics.observe(
+                "automdjango_grid_session_create_seconds", seconds, {"hub": url},
+                help="Remote session creation time per grid hub",
+            )
+        if failed:
+            metrics.inc(
+                "automdjango_grid_session_failures_total", {"hub": url, "reason": "error" if unhealthy else "busy"},
+                help="Remote session creations that failed, per grid hub",
+            )
+        metrics.set_gauge(
+            "automdjango_grid_breaker_open", int(opened), {"hub": url},
+            help="1 while a grid hub's circuit breaker keeps sessions away from it",
+        )
+
+    def __failed(self, hub: HubHealth):
+        """Count one failure of ``hub`` towards its circuit breaker; called with the lock held."""
+        hub.consecutiveFailures += 1
+        if hub.consecutiveFailures >= self.settings.gridBreakerFailures:
+            hub.openUntil = self._clock() + self.settings.gridBreakerCooldown
+            logging.warning(
+                f"⚠️ Grid hub {hub.url} failed {hub.consecutiveFailures} times in a row; "
+                f"not using it for {self.settings.gridBreakerCooldown:g}s"
+            )
+        metrics.set_gauge(
+            "automdjango_grid_breaker_open", int(hub.openUntil is not None), {"hub": hub.url},
+            help="1 while a grid hub's circuit breaker keeps sessions away from it",
+        )
+
+    def reserve(self, avoid=()) -> str:
+        """Like ``choose``, but falls back to the hub least likely to refuse instead of returning None."""
+        url = self.choose(avoid)
+        if url is None:
+            url = self.__leastBad()
+            with self._lock:
+                self.hubs[url].creating += 1
+        return url
+
+    def all_open(self) -> bool:
+        now = self._clock()
+        with self._lock:
+            return all(hub.breaker(now) == "open" for hub in self.hubs.values())
+
+    def create_session(self, factory, waitForSlot: bool = None, timeout: float = None):
+        """Run ``factory(url)`` on the best hub, moving on to the others until it succeeds.
+
+        Returns ``(session, url)``. When no hub has a free slot the router waits
+        for one (GRID_WAIT_FOR_SLOT) or, without waiting, tries the hub least
+        likely to refuse; hubs whose /status cannot be read are tried right away,
+        since waiting would not reveal a slot. Raises the last creation error once
+        ``timeout`` (GRID_SLOT_WAIT_TIMEOUT) has passed or every hub's breaker is open.
+        """
+        attempts = self.__attempts(waitForSlot, timeout)
+        while True:
+            step, value = self.__nextStep(attempts)
+            if step == "wait":
+                self._sleep(value)
+                continue
+            start = self._clock()
+            try:
+                session = factory(value)
+            except Exception as e:
+                self._sleep(self.__creationFailed(attempts, value, e))
+                continue
+            self.release(value, self._clock() - start)
+            return session, value
+
+    async def create_session_async(self, factory, waitForSlot: bool = None, timeout: float = None):
+        """``create_session`` for a coroutine ``factory``; /status reads run in a thread and backoff awaits."""
+        attempts = self.__attempts(waitForSlot, timeout)
+        while True:
+            step, value = await asyncio.to_thread(self.__nextStep, attempts)
+            if step == "wait":
+                await asyncio.sleep(value)
+                continue
+            start = self._clock()
+            try:
+                session = await factory(value)
+            except BaseException as e:
+                # cancellation only gives the reservation back
+                await asyncio.sleep(self.__creationFailed(attempts, value, e))
+                continue
+            self.release(value, self._clock() - start)
+            return session, value
+
+    def __attempts(self, waitForSlot: bool, timeout: float) -> dict:
+        """Backoff state of one ``create_session`` call."""
+        timeout = self.settings.gridSlotWaitTimeout if timeout is None else timeout
+        return {
+            "waitForSlot": self.settings.gridWaitForSlot if waitForSlot is None else waitForSlot,
+            "deadline": self._clock() + timeout,
+            "delay": 0.5,
+            "failed": set(),
+            "announced": False,
+        }
+
+    def __nextStep(self, attempts: dict) -> tuple:
+        """``("try", url)`` with ``url`` reserved, or ``("wait", seconds)`` while queueing for a free slot."""
+        url = self.choose(avoid=attempts["failed"])
+        if url is not None:
+            return "try", url
+        delay = attempts["delay"]
+        if attempts["waitForSlot"] and self.__capacityKnown() and self._clock() + delay <= attempts["deadline"]:
+            if not attempts["announced"]:
+                logging.info(f"⏳ No grid hub has a free slot ({self.describe()}); queueing")
+                attempts["announced"] = True
+            attempts["delay"] = min(delay * 2, 10)
+            return "wait", delay
+        return "try", self.reserve(attempts["failed"])
+
+    def __creationFailed(self, attempts: dict, url: str, error: BaseException) -> float:
+        """Record a failed creation on ``url``; the backoff before the next try, or re-raise when out of options."""
+        self.release(url, error=error)
+        if not isinstance(error, Exception):
+            raise error
+        attempts["failed"].add(url)
+        delay = attempts["delay"]
+        if self.all_open() or self._clock() + delay > attempts["deadline"]:
+            raise error
+        logging.info(f"🔁 Session creation on {url} failed ({_reason(error)}); retrying in {delay:g}s")
+        attempts["delay"] = min(delay * 2, 15)
+        return delay
+
+    def __capacityKnown(self) -> bool:
+        """Whether some usable hub answered /status, so waiting can reveal a free slot."""
+        now = self._clock()
+        with self._lock:
+            return any(hub.capacity is not None for hub in self.hubs.values() if hub.breaker(now) != "open")
+
+    def __leastBad(self) -> str:
+        """The hub to try when none reports room: closed breakers first, then the soonest to reopen."""
+        now = self._clock()
+        with self._lock:
+            return min(
+                self.hubs.values(),
+                key=lambda hub: (hub.breaker(now) == "open", hub.openUntil or 0, hub.consecutiveFailures),
+            ).url
+
+    def stats(self) -> list:
+        now = self._clock()
+        with self._lock:
+            return [hub.snapshot(now) for hub in self.hubs.values()]
+
+    def describe(self) -> str:
+        return ", ".join(f"{hub['url']}: {hub['freeSlots']} free, {hub['breaker']}" for hub in self.stats())
+
+
+def _reason(error: Exception) -> str:
+    message = getattr(error, "msg", None) or str(error)
+    return message.splitlines()[0] if message else type(error).__name__
+
+
+_routers = {}
+_routersLock = threading.Lock()
+
+
+def get_hub_router(settings: RuntimeSettings = None) -> HubRouter:
+    """Process-wide router for the hubs in SELENIUM_REMOTE_URL, so health is shared by every session."""
+    settings = settings or get_settings()
+    urls = settings.remoteUrls
+    with _routersLock:
+        router = _routers.get(urls)
+        if router is None:
+            router = _routers[urls] = HubRouter(urls, settings)
+    return router
@@ -0,0 +1,220 @@
+import os
+import json
+import math
+import time
+import atexit
+import bisect
+import logging
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from automdjango.srcode.runtimesettings import loaded_settings
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+timingLogger = logging.getLogger("automdjango.timings")
+
+
+def percentile(values: list, fraction: float) -> float:
+    """Linear-interpolated percentile of sorted ``values`` (matches PostgreSQL ``percentile_cont``)."""
+    if not values:
+        return None
+    position = (len(values) - 1) * fraction
+    lower, upper = math.floor(position), math.ceil(position)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+class Histogram:
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """Process-wide counters, gauges and histograms, exportable in the Prometheus text format."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._gauges = {}
+        self._histograms = {}
+        self._help = {}
+
+    def inc(self, name: str, labels: dict = None, value: float = 1, help: str = ""):
+        key = (name, tuple(sorted((labels or {}).items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+            self._help.setdefault(name, help)
+
+    def set_gauge(self, name: str, value: float, labels: dict = None, help: str = ""):
+        key = (name, tuple(sorted((labels or {}).items())))
+        with self._lock:
+            self._gauges[key] = value
+            self._help.setdefault(name, help)
+
+    def remove_gauge(self, name: str, labels: dict = None):
+        with self._lock:
+            self._gauges.pop((name, tuple(sorted((labels or {}).items()))), None)
+
+    def gauge(self, name: str, labels: dict = None):
+        with self._lock:
+            return self._gauges.get((name, tuple(sorted((labels or {}).items()))))
+
+    def observe(self, name: str, value: float, labels: dict = None, help: str = ""):
+        key = (name, tuple(sorted((labels or {}).items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(value)
+            self._help.setdefault(name, help)
+
+    def counter(self, name: str, labels: dict = None) -> float:
+        with self._lock:
+            return self._counters.get((name, tuple(sorted((labels or {}).items()))), 0)
+
+    def histogram(self, name: str, labels: dict = None):
+        with self._lock:
+            return self._histograms.get((name, tuple(sorted((labels or {}).items()))))
+
+    def reset(self):
+        with self._lock:
+            self._counters = {}
+            self._gauges = {}
+            self._histograms = {}
+
+    def render_prometheus(self) -> str:
+        lines = []
+        with self._lock:
+            for name in sorted({key[0] for key in self._counters}):
+                lines.append(f"# HELP {name} {self._help.get(name, '')}".rstrip())
+                lines.append(f"# TYPE {name} counter")
+                for (metric, labels), value in sorted(self._counters.items()):
+                    if metric == name:
+                        lines.append(f"{name}{_labels(labels)} {value}")
+            for name in sorted({key[0] for key in self._gauges}):
+                lines.append(f"# HELP {name} {self._help.get(name, '')}".rstrip())
+                lines.append(f"# TYPE {name} gauge")
+                for (metric, labels), value in sorted(self._gauges.items()):
+                    if metric == name:
+                        lines.append(f"{name}{_labels(labels)} {value}")
+            for name in sorted({key[0] for key in self._histograms}):
+                lines.append(f"# HELP {name} {self._help.get(name, '')}".rstrip())
+                lines.append(f"# TYPE {name} histogram")
+                for (metric, labels), histogram in sorted(self._histograms.items(), key=lambda item: item[0]):
+                    if metric != name:
+                        continue
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{_labels(labels + (('le', _number(bound)),))} {cumulative}")
+                    lines.append(f"{name}_bucket{_labels(labels + (('le', '+Inf'),))} {histogram.count}")
+                    lines.append(f"{name}_sum{_labels(labels)} {histogram.sum}")
+                    lines.append(f"{name}_count{_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str):
+        """Atomically write the text exposition (e.g. for node_exporter's textfile collector)."""
+        partial = f"{path}.{os.getpid()}.partial"
+        with open(partial, "w") as handle:
+            handle.write(self.render_prometheus())
+        os.replace(partial, path)
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else str(value)
+
+
+def _labels(labels: tuple) -> str:
+    if not labels:
+        return ""
+    rendered = ",".join(f'{key}="{str(value)}"' for key, value in labels)
+    return "{" + rendered + "}"
+
+
+metrics = MetricsRegistry()
+
+
+@atexit.register
+def _write_metrics_file():
+    # never resolves settings at exit: a process that only imported the package has nothing to write
+    settings = loaded_settings()
+    if settings is not None and settings.metricsFile:
+        metrics.write_prometheus(settings.metricsFile)
+
+
+def _emit(event: str, name: str, seconds: float, ok: bool, **fields):
+    if timingLogger.isEnabledFor(logging.DEBUG):
+        timingLogger.debug(json.dumps({"event": event, "name": name, "seconds": round(seconds, 6), "ok": ok, **fields}))
+
+
+class StartupProfiler:
+    """Monotonic per-phase timings for one DriverPreparation construction."""
+
+    def __init__(self):
+        self.phases = {}
+        self._started = time.monotonic()
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.monotonic()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            elapsed = time.monotonic() - start
+            self.phases[name] = self.phases.get(name, 0.0) + elapsed
+            metrics.observe(
+                "automdjango_driver_startup_phase_seconds", elapsed, {"phase": name},
+                help="Time spent in each DriverPreparation startup phase",
+            )
+            _emit("startup_phase", name, elapsed, ok)
+
+    def finish(self) -> dict:
+        total = time.monotonic() - self._started
+        metrics.observe(
+            "automdjango_driver_startup_seconds", total, help="Total DriverPreparation construction time"
+        )
+        report = {"event": "driver_startup", "seconds": round(total, 6),
+                  "phases": {name: round(seconds, 6) for name, seconds in self.phases.items()}}
+        timingLogger.info(json.dumps(report))
+        return report
+
+
+def timed_command(name: str):
+    """Decorator recording the latency and failures of a WebDriver-backed method."""
+
+    def decorate(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            start = time.monotonic()
+            ok = False
+            try:
+                result = function(*args, **kwargs)
+                ok = True
+                return result
+            finally:
+                elapsed = time.monotonic() - start
+                metrics.observe(
+                    "automdjango_driver_command_seconds", elapsed, {"command": name},
+                    help="Latency of DriverPreparation WebDriver commands",
+                )
+                if not ok:
+                    metrics.inc(
+                        "automdjango_driver_command_errors_total", {"command": name},
+                        help="DriverPreparation WebDriver commands that raised",
+                    )
+                _emit("command", name, elapsed, ok)
+
+        return wrapper
+
+    return decorate
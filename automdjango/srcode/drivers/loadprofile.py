@@ -0,0 +1,110 @@
+import json
+import logging
+from fnmatch import fnmatch
+from typing import TYPE_CHECKING
+from automdjango.srcode.runtimesettings import RuntimeSettings, get_settings
+
+if TYPE_CHECKING:
+    from selenium.webdriver.chrome.options import Options
+
+MEDIA_PATTERNS = (
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+    "*.mp4", "*.webm", "*.mp3", "*.ogg", "*.wav",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+)
+TRACKER_PATTERNS = (
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*googlesyndication.com*", "*facebook.net*", "*hotjar.com*", "*scorecardresearch.com*",
+)
+
+
+class LoadProfile:
+    """What a navigation is allowed to fetch and when ``driver.get`` returns."""
+
+    def __init__(self, name: str, blockedPatterns=(), pageLoadStrategy: str = "normal"):
+        self.name = name
+        self.blockedPatterns = list(blockedPatterns)
+        self.pageLoadStrategy = pageLoadStrategy
+
+    def __repr__(self):
+        return f"LoadProfile({self.name!r}, {len(self.blockedPatterns)} blocked patterns, {self.pageLoadStrategy})"
+
+
+PROFILES = {
+    "full": LoadProfile("full"),
+    "no-media": LoadProfile("no-media", MEDIA_PATTERNS),
+    "dom-only": LoadProfile("dom-only", MEDIA_PATTERNS + ("*.css",) + TRACKER_PATTERNS, "eager"),
+}
+
+
+def resolve_load_profile(name: str = None, settings: RuntimeSettings = None) -> LoadProfile:
+    """Build the active profile from LOAD_PROFILE plus LOAD_BLOCK_PATTERNS / LOAD_ALLOW_PATTERNS / PAGE_LOAD_STRATEGY.
+
+    Allow patterns win over deny patterns: a deny pattern that an allow pattern
+    matches is dropped (``Network.setBlockedURLs`` has no exception syntax).
+    """
+    settings = settings or get_settings()
+    name = name or settings.loadProfile
+    if name not in PROFILES:
+        raise ValueError(f"Unknown load profile {name!r}; expected one of {', '.join(PROFILES)}")
+    base = PROFILES[name]
+    allowed = settings.loadAllowPatterns
+    blocked = [
+        pattern for pattern in base.blockedPatterns + list(settings.loadBlockPatterns)
+        if not any(fnmatch(pattern, allow) or pattern == allow for allow in allowed)
+    ]
+    strategy = settings.pageLoadStrategy or base.pageLoadStrategy
+    return LoadProfile(name, blocked, strategy)
+
+
+def apply_to_options(profile: LoadProfile, options: "Options"):
+    options.page_load_strategy = profile.pageLoadStrategy
+
+
+def apply_to_session(profile: LoadProfile, execute_cdp_cmd):
+    """Install the URL block list on a live Chrome session."""
+    if not profile.blockedPatterns:
+        return
+    execute_cdp_cmd("Network.enable", {})
+    execute_cdp_cmd("Network.setBlockedURLs", {"urls": profile.blockedPatterns})
+    logging.info(f"🚫 Load profile {profile.name}: blocking {len(profile.blockedPatterns)} URL patterns")
+
+
+class NavigationReport:
+    """Requests one navigation issued (blocked ones included), how many were blocked, and bytes transferred."""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.requests = 0
+        self.blockedRequests = 0
+        self.blockedByType = {}
+        self.transferredBytes = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "url": self.url,
+            "requests": self.requests,
+            "blockedRequests": self.blockedRequests,
+            "blockedByType": dict(self.blockedByType),
+            "transferredBytes": self.transferredBytes,
+        }
+
+
+def summarize_network_events(url: str, entries: list) -> NavigationReport:
+    report = NavigationReport(url)
+    for entry in entries:
+        try:
+            event = json.loads(entry["message"])["message"]
+        except (KeyError, TypeError, ValueError):
+            continue
+        method = event.get("method")
+        params = event.get("params", {})
+        if method == "Network.requestWillBeSent":
+            report.requests += 1
+        elif method == "Network.loadingFinished":
+            report.transferredBytes += int(params.get("encodedDataLength", 0))
+        elif method == "Network.loadingFailed" and params.get("blockedReason"):
+            report.blockedRequests += 1
+            resourceType = params.get("type", "Other")
+            report.blockedByType[resourceType] = report.blockedByType.get(resourceType, 0) + 1
+    return report
@@ -0,0 +1,84 @@
+import threading
+from selenium.common import NoSuchElementException, StaleElementReferenceException
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+
+
+class CachedElement(WebElement):
+    """A WebElement that re-finds itself by locator when the page replaced it.
+
+    Every element command goes through ``_execute``, so a stale reference is
+    swapped for a freshly resolved one and the command retried once.
+    """
+
+    def __init__(self, cache: "LocatorCache", locator: tuple, element: WebElement):
+        super().__init__(element.parent, element.id)
+        self._cache = cache
+        self._locator = locator
+
+    def _execute(self, command, params=None):
+        try:
+            return super()._execute(command, dict(params) if params else None)
+        except StaleElementReferenceException as stale:
+            try:
+                self._id = self._cache.refresh(self._locator).id
+            except NoSuchElementException:
+                raise stale
+            return super()._execute(command, dict(params) if params else None)
+
+
+class LocatorCache:
+    """Per-page cache of resolved elements keyed by (page URL, locator tuple).
+
+    The page URL is the one last opened through ``DriverPreparation.navigateTo``,
+    which also clears the cache; in-page changes are caught by stale detection.
+    """
+
+    def __init__(self, driver: WebDriver):
+        self.driver = driver
+        self.url = None
+        self._lock = threading.Lock()
+        self._elements = {}
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+
+    def find(self, locator: tuple) -> WebElement:
+        key = (self.url, tuple(locator))
+        with self._lock:
+            element = self._elements.get(key)
+            if element is not None:
+                self.hits += 1
+                return element
+            self.misses += 1
+        element = CachedElement(self, tuple(locator), self.driver.find_element(*locator))
+        with self._lock:
+            self._elements[key] = element
+        return element
+
+    def remember(self, locator: tuple, element: WebElement) -> WebElement:
+        """Cache an element the caller already resolved (e.g. through a wait) without finding it again."""
+        cached = CachedElement(self, tuple(locator), element)
+        with self._lock:
+            self._elements[(self.url, tuple(locator))] = cached
+        return cached
+
+    def refresh(self, locator: tuple) -> WebElement:
+        """Resolve ``locator`` again after its cached element went stale."""
+        with self._lock:
+            self.refreshes += 1
+        return self.driver.find_element(*locator)
+
+    def invalidate(self, url: str = None):
+        with self._lock:
+            self._elements = {}
+            self.url = url
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "refreshes": self.refreshes,
+                "size": len(self._elements),
+            }
@@ -0,0 +1,95 @@
+import os
+import queue
+import atexit
+import shutil
+import logging
+import threading
+import subprocess
+import uuid
+from automdjango.srcode.drivers.drivercache import file_lock
+from automdjango.srcode.runtimesettings import get_settings
+
+PRIMED_MARKER = ".automdjango-primed"
+# Regenerated by Chrome on demand; copying them into every session only costs I/O
+DISPOSABLE_PROFILE_DIRS = ("Cache", "Code Cache", "GPUCache", "GrShaderCache", "ShaderCache", "Crashpad")
+
+
+def clone_root() -> str:
+    return get_settings().profileCloneRoot
+
+
+def ensure_template(template_dir: str, primer) -> str:
+    """Prime ``template_dir`` once (``primer(path)`` launches Chrome on it) and strip disposable caches."""
+    if os.path.exists(os.path.join(template_dir, PRIMED_MARKER)):
+        return template_dir
+    os.makedirs(os.path.dirname(os.path.abspath(template_dir)), exist_ok=True)
+    with file_lock(f"{os.path.abspath(template_dir)}.lock"):
+        if os.path.exists(os.path.join(template_dir, PRIMED_MARKER)):
+            return template_dir
+        logging.info(f"🧪 Priming Chrome profile template at {template_dir}")
+        os.makedirs(template_dir, exist_ok=True)
+        primer(template_dir)
+        for root, dirs, _ in os.walk(template_dir):
+            for name in [d for d in dirs if d in DISPOSABLE_PROFILE_DIRS]:
+                shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+                dirs.remove(name)
+        for lock in ("SingletonLock", "SingletonCookie", "SingletonSocket"):
+            path = os.path.join(template_dir, lock)
+            if os.path.lexists(path):
+                os.remove(path)
+        open(os.path.join(template_dir, PRIMED_MARKER), "w").close()
+    return template_dir
+
+
+def clone_profile(template_dir: str, root: str = None) -> str:
+    """Give a session its own copy of the template.
+
+    Uses a copy-on-write reflink where the filesystem supports it and a plain copy
+    otherwise (cheap on tmpfs). Hardlinks are not used because Chrome rewrites its
+    SQLite stores in place, which would corrupt the shared template.
+    """
+    target = os.path.join(root or clone_root(), f"chrome_profile_{uuid.uuid4()}")
+    try:
+        subprocess.run(
+            ["cp", "-a", "--reflink=always", template_dir, target],
+            check=True, capture_output=True, timeout=60,
+        )
+    except (OSError, subprocess.SubprocessError):
+        shutil.rmtree(target, ignore_errors=True)
+        shutil.copytree(template_dir, target, symlinks=True)
+    marker = os.path.join(target, PRIMED_MARKER)
+    if os.path.exists(marker):
+        os.remove(marker)
+    return target
+
+
+class ProfileReaper:
+    """Deletes finished session profiles on a background thread so quit() does not wait on rmtree."""
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def discard(self, path: str):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self.__run, name="profile-reaper", daemon=True)
+                self._thread.start()
+                atexit.register(self.drain)
+        self._queue.put(path)
+
+    def drain(self):
+        """Block until every queued profile has been removed."""
+        self._queue.join()
+
+    def __run(self):
+        while True:
+            path = self._queue.get()
+            try:
+                shutil.rmtree(path, ignore_errors=True)
+            finally:
+                self._queue.task_done()
+
+
+reaper = ProfileReaper()
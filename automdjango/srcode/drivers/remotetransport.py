@@ -0,0 +1,205 @@
+"""Shared keep-alive HTTP transport for ``webdriver.Remote`` command traffic.
+
+Left alone, every remote driver builds its own urllib3 pool, and quitting one
+clears it. ``RemoteTransport`` gives all remote sessions of the process one
+``PoolManager`` holding REMOTE_POOL_SIZE connections per hub (default
+DRIVER_POOL_SIZE, at least MIN_POOL_SIZE), with REMOTE_CONNECT_TIMEOUT /
+REMOTE_READ_TIMEOUT and, with REMOTE_COMPRESSION=1, gzip-encoded responses.
+
+Each command's round trip is split into browser time and wire time. The hub
+does not report how long the browser worked, so the smallest time-to-first-byte
+recently seen on a hub stands in for its bare protocol round trip: browser time
+is a command's time-to-first-byte minus that floor, and everything else
+(JSON encoding, connecting, the floor itself, downloading, decompressing and
+decoding the response) is wire time.
+
+Imported only by the remote backend; it loads Selenium's Chromium modules.
+"""
+import time
+import atexit
+import logging
+import threading
+from collections import deque
+from urllib.parse import urlsplit
+import urllib3
+from selenium.webdriver.chromium.remote_connection import ChromiumRemoteConnection
+from selenium.webdriver.remote.client_config import ClientConfig
+from automdjango.srcode.drivers.instrumentation import metrics
+from automdjango.srcode.runtimesettings import RuntimeSettings, get_settings
+
+# time-to-first-byte samples per hub the protocol round trip floor is taken from
+FLOOR_WINDOW = 64
+# connections kept per hub without REMOTE_POOL_SIZE: commands also come from browser contexts on their own
+# threads and from tests sharing a session, so the pool is not sized by DRIVER_POOL_SIZE alone
+MIN_POOL_SIZE = 10
+
+
+class CommandTiming:
+
+    def __init__(self):
+        self.count = 0
+        self.wireSeconds = 0.0
+        self.browserSeconds = 0.0
+        self.newConnections = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "wireSeconds": round(self.wireSeconds, 6),
+            "browserSeconds": round(self.browserSeconds, 6),
+            "newConnections": self.newConnections,
+        }
+
+
+class _TimedPool:
+    """What ``RemoteConnection._conn`` calls ``request`` on: the shared pool plus timing."""
+
+    def __init__(self, transport: "RemoteTransport", manager, command: threading.local):
+        self.transport = transport
+        self.manager = manager
+        self.command = command
+
+    def request(self, method: str, url: str, body=None, headers=None, timeout=None, **kwargs):
+        headers = dict(headers or {})
+        if self.transport.settings.remoteCompression:
+            headers["Accept-Encoding"] = "gzip, deflate"
+        pool = self.manager.connection_from_url(url)
+        connectionsBefore = pool.num_connections
+        start = time.perf_counter()
+        response = self.manager.request(
+            method, url, body=body, headers=headers, timeout=self.transport.timeout,
+            preload_content=False, **kwargs
+        )
+        firstByte = time.perf_counter()
+        try:
+            # cached on the response, so RemoteConnection's ``response.data`` does not read again
+            response.read(cache_content=True)
+        except BaseException:
+            response.close()
+            raise
+        response.release_conn()
+        # picked up by PooledRemoteConnection.execute, which also times the JSON (de)serialization
+        self.command.exchange = (urlsplit(url).netloc, firstByte - start, pool.num_connections - connectionsBefore)
+        return response
+
+    def clear(self):
+        # RemoteConnection.close() on quit; the pool outlives any one session
+        pass
+
+
+class PooledRemoteConnection(ChromiumRemoteConnection):
+    """Chrome's remote connection, sending its commands through a ``RemoteTransport``."""
+
+    def __init__(self, url: str, transport: "RemoteTransport"):
+        self._transport = transport
+        self._command = threading.local()
+        super().__init__(
+            url, vendor_prefix="goog", browser_name="chrome",
+            client_config=ClientConfig(remote_server_addr=url, keep_alive=True, timeout=transport.settings.remoteReadTimeout),
+        )
+
+    def _get_connection_manager(self):
+        # behind an HTTP(S)_PROXY the connection keeps its own proxy manager, still timed
+        manager = super()._get_connection_manager() if self._proxy_url else self._transport.manager
+        return _TimedPool(self._transport, manager, self._command)
+
+    def execute(self, command, params):
+        self._command.exchange = None
+        start = time.perf_counter()
+        try:
+            return super().execute(command, params)
+        finally:
+            if self._command.exchange is not None:
+                host, firstByte, newConnections = self._command.exchange
+                self._transport.record(command, host, firstByte, time.perf_counter() - start, newConnections)
+
+
+class RemoteTransport:
+    """One connection pool and one set of per-command timings for every remote session."""
+
+    def __init__(self, settings: RuntimeSettings = None):
+        self.settings = settings or get_settings()
+        self.poolSize = self.settings.remotePoolSize or max(self.settings.driverPoolSize, MIN_POOL_SIZE)
+        self.timeout = urllib3.Timeout(connect=self.settings.remoteConnectTimeout, read=self.settings.remoteReadTimeout)
+        # block=False: a burst beyond poolSize opens extra, short-lived connections instead of queueing commands.
+        # read=0: a command that timed out may still be running in the browser, so it is not sent again
+        self.manager = urllib3.PoolManager(
+            num_pools=16, maxsize=self.poolSize, block=False, timeout=self.timeout, retries=urllib3.Retry(total=3, read=0)
+        )
+        self._lock = threading.Lock()
+        self._floors = {}
+        self._commands = {}
+
+    def connection(self, url: str) -> PooledRemoteConnection:
+        return PooledRemoteConnection(url, self)
+
+    def record(self, command: str, host: str, firstByte: float, total: float, newConnections: int = 0):
+        """Split one round trip into browser and wire time and account for it."""
+        with self._lock:
+            samples = self._floors.get(host)
+            if samples is None:
+                samples = self._floors[host] = deque(maxlen=FLOOR_WINDOW)
+            if not newConnections:
+                # a fresh connection's first byte includes the TCP/TLS handshake
+                samples.append(firstByte)
+            floor = min(samples) if samples else firstByte
+            browser = max(0.0, firstByte - floor)
+            wire = total - browser
+            timing = self._commands.get(command)
+            if timing is None:
+                timing = self._commands[command] = CommandTiming()
+            timing.count += 1
+            timing.wireSeconds += wire
+            timing.browserSeconds += browser
+            timing.newConnections += newConnections
+        metrics.observe(
+            "automdjango_remote_command_wire_seconds", wire, {"command": command},
+            help="Protocol overhead of remote WebDriver commands: network, HTTP and (de)serialization",
+        )
+        metrics.observe(
+            "automdjango_remote_command_browser_seconds", browser, {"command": command},
+            help="Time remote WebDriver commands spent executing on the hub/browser",
+        )
+        if newConnections:
+            metrics.inc(
+                "automdjango_remote_connections_total", {"host": host}, newConnections,
+                help="HTTP connections opened to grid hubs",
+            )
+
+    def report(self) -> dict:
+        """Per-command totals plus the overall share of time spent on the wire."""
+        with self._lock:
+            commands = {name: timing.as_dict() for name, timing in sorted(self._commands.items())}
+            wire = sum(timing.wireSeconds for timing in self._commands.values())
+            browser = sum(timing.browserSeconds for timing in self._commands.values())
+        return {
+            "poolSize": self.poolSize,
+            "commands": commands,
+            "wireSeconds": round(wire, 6),
+            "browserSeconds": round(browser, 6),
+            "wireShare": round(wire / (wire + browser), 3) if wire + browser else None,
+        }
+
+    def close(self):
+        report = self.report()
+        if report["commands"]:
+            logging.info(
+                f"📡 Remote WebDriver traffic: {report['wireSeconds']}s on the wire, "
+                f"{report['browserSeconds']}s in the browser ({report['wireShare']:.0%} overhead)"
+            )
+        self.manager.clear()
+
+
+_transport = None
+_transportLock = threading.Lock()
+
+
+def get_remote_transport(settings: RuntimeSettings = None) -> RemoteTransport:
+    """Process-wide transport shared by every remote session; closed at exit."""
+    global _transport
+    if _transport is None:
+        with _transportLock:
+            if _transport is None:
+                _transport = RemoteTransport(settings)
+                atexit.register(_transport.close)
+    return _transport
@@ -0,0 +1,214 @@
+import os
+import time
+import logging
+import threading
+from selenium.common import WebDriverException
+from automdjango.srcode.drivers.instrumentation import metrics
+from automdjango.srcode.runtimesettings import RuntimeSettings, get_settings
+
+MB = 1024 * 1024
+QUIET_ARGS = (
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--metrics-recording-only",
+    "--mute-audio",
+)
+
+
+class ResourceProfile:
+    """Chrome flags that trade isolation and headroom for a smaller footprint per session."""
+
+    def __init__(self, name: str, jsHeapMb: int = None, rendererProcessLimit: int = None, extraArgs=()):
+        self.name = name
+        self.jsHeapMb = jsHeapMb
+        self.rendererProcessLimit = rendererProcessLimit
+        self.extraArgs = list(extraArgs)
+
+    def chrome_args(self) -> list:
+        args = list(self.extraArgs)
+        if self.jsHeapMb:
+            args.append(f"--js-flags=--max-old-space-size={self.jsHeapMb}")
+        if self.rendererProcessLimit:
+            args.append(f"--renderer-process-limit={self.rendererProcessLimit}")
+        return args
+
+    def __repr__(self):
+        return f"ResourceProfile({self.name!r}, heap={self.jsHeapMb}MB, renderers={self.rendererProcessLimit})"
+
+
+PROFILES = {
+    "default": ResourceProfile("default"),
+    "lean": ResourceProfile("lean", 1024, 4, QUIET_ARGS),
+    # one renderer per site instead of per frame; for many small sessions per node
+    "dense": ResourceProfile("dense", 512, 2, QUIET_ARGS + (
+        "--process-per-site", "--disable-site-isolation-trials", "--disable-features=site-per-process",
+    )),
+}
+
+
+def process_tree(root: int) -> list:
+    """``root`` and all of its descendants, from /proc (Linux); [] elsewhere."""
+    if not os.path.isdir("/proc"):
+        return []
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as handle:
+                # the command name may contain spaces; fields resume after the last ")"
+                parent = int(handle.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(parent, []).append(int(entry))
+    tree, pending = [], [root]
+    while pending:
+        pid = pending.pop()
+        tree.append(pid)
+        pending.extend(children.get(pid, []))
+    return tree
+
+
+def process_tree_usage(root: int) -> tuple:
+    """(resident bytes, CPU seconds) summed over a process tree; (None, None) when unavailable."""
+    pids = process_tree(root)
+    if not pids:
+        return None, None
+    pageSize = os.sysconf("SC_PAGE_SIZE")
+    ticks = os.sysconf("SC_CLK_TCK")
+    rss, cpu = 0, 0.0
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/statm") as handle:
+                rss += int(handle.read().split()[1]) * pageSize
+            with open(f"/proc/{pid}/stat") as handle:
+                fields = handle.read().rsplit(")", 1)[1].split()
+                cpu += (int(fields[11]) + int(fields[12])) / ticks
+        except (OSError, IndexError, ValueError):
+            continue
+    return rss, cpu
+
+
+class ResourceSample:
+
+    def __init__(self, jsHeapUsed=None, jsHeapTotal=None, domNodes=None, documents=None, rssBytes=None, cpuPercent=None):
+        self.jsHeapUsed = jsHeapUsed
+        self.jsHeapTotal = jsHeapTotal
+        self.domNodes = domNodes
+        self.documents = documents
+        self.rssBytes = rssBytes
+        self.cpuPercent = cpuPercent
+
+    def as_dict(self) -> dict:
+        return dict(vars(self))
+
+
+class ResourceGovernor:
+    """Samples what a session consumes and says when it should be recycled.
+
+    Renderer JS heap, DOM nodes and documents come from CDP ``Performance.getMetrics``;
+    for local sessions resident memory and CPU of the whole chromedriver/Chrome
+    process tree come from /proc. Every sample is published as gauges labelled by
+    session. Limits (RESOURCE_MAX_JS_HEAP_MB, RESOURCE_MAX_RSS_MB,
+    RESOURCE_MAX_CPU_PERCENT) are checked by ``check``; CPU is averaged since the
+    previous sample of the same session.
+    """
+
+    def __init__(self, settings: RuntimeSettings = None):
+        settings = settings or get_settings()
+        self.maxJsHeapBytes = settings.resourceMaxJsHeapMb * MB if settings.resourceMaxJsHeapMb else None
+        self.maxRssBytes = settings.resourceMaxRssMb * MB if settings.resourceMaxRssMb else None
+        self.maxCpuPercent = settings.resourceMaxCpuPercent
+        self._lock = threading.Lock()
+        self._performanceEnabled = set()
+        self._previousCpu = {}
+
+    @property
+    def limited(self) -> bool:
+        return bool(self.maxJsHeapBytes or self.maxRssBytes or self.maxCpuPercent)
+
+    def sample(self, label: str, execute_cdp_cmd, pid: int = None) -> ResourceSample:
+        sample = ResourceSample()
+        try:
+            with self._lock:
+                enable = label not in self._performanceEnabled
+                self._performanceEnabled.add(label)
+            if enable:
+                execute_cdp_cmd("Performance.enable", {})
+            values = {m["name"]: m["value"] for m in execute_cdp_cmd("Performance.getMetrics", {}).get("metrics", [])}
+            sample.jsHeapUsed = values.get("JSHeapUsedSize")
+            sample.jsHeapTotal = values.get("JSHeapTotalSize")
+            sample.domNodes = values.get("Nodes")
+            sample.documents = values.get("Documents")
+        except WebDriverException as e:
+            logging.debug(f"Performance metrics unavailable for session {label}: {e}")
+        if pid is not None:
+            sample.rssBytes, cpuSeconds = process_tree_usage(pid)
+            if cpuSeconds is not None:
+                now = time.monotonic()
+                with self._lock:
+                    previous = self._previousCpu.get(label)
+                    self._previousCpu[label] = (now, cpuSeconds)
+                if previous is not None and now > previous[0]:
+                    sample.cpuPercent = round(100 * (cpuSeconds - previous[1]) / (now - previous[0]), 1)
+        self.__publish(label, sample)
+        return sample
+
+    def violations(self, sample: ResourceSample) -> list:
+        found = []
+        if self.maxJsHeapBytes and sample.jsHeapUsed and sample.jsHeapUsed > self.maxJsHeapBytes:
+            found.append(f"js_heap {sample.jsHeapUsed / MB:.0f}MB > {self.maxJsHeapBytes / MB:.0f}MB")
+        if self.maxRssBytes and sample.rssBytes and sample.rssBytes > self.maxRssBytes:
+            found.append(f"rss {sample.rssBytes / MB:.0f}MB > {self.maxRssBytes / MB:.0f}MB")
+        if self.maxCpuPercent and sample.cpuPercent and sample.cpuPercent > self.maxCpuPercent:
+            found.append(f"cpu {sample.cpuPercent}% > {self.maxCpuPercent}%")
+        return found
+
+    def check(self, label: str, execute_cdp_cmd, pid: int = None) -> list:
+        """Sample the session and return the limits it exceeds (empty when it may keep running)."""
+        found = self.violations(self.sample(label, execute_cdp_cmd, pid))
+        for violation in found:
+            metrics.inc(
+                "automdjango_session_limit_exceeded_total", {"limit": violation.split()[0]},
+                help="Session samples that exceeded a resource limit",
+            )
+        if found:
+            logging.warning(f"🧯 Session {label} exceeds resource limits: {', '.join(found)}")
+        return found
+
+    def forget(self, label: str):
+        with self._lock:
+            self._performanceEnabled.discard(label)
+            self._previousCpu.pop(label, None)
+        for name in _GAUGES.values():
+            metrics.remove_gauge(name, {"session": label})
+
+    def __publish(self, label: str, sample: ResourceSample):
+        for field, name in _GAUGES.items():
+            value = getattr(sample, field)
+            if value is not None:
+                metrics.set_gauge(name, value, {"session": label}, help=_HELP[field])
+
+
+_GAUGES = {
+    "jsHeapUsed": "automdjango_session_js_heap_bytes",
+    "domNodes": "automdjango_session_dom_nodes",
+    "rssBytes": "automdjango_session_rss_bytes",
+    "cpuPercent": "automdjango_session_cpu_percent",
+}
+_HELP = {
+    "jsHeapUsed": "Renderer JS heap in use",
+    "domNodes": "Live DOM nodes in the session's page",
+    "rssBytes": "Resident memory of the session's chromedriver/Chrome process tree",
+    "cpuPercent": "CPU used by the session's process tree since its previous sample",
+}
+
+
+def resolve_resource_profile(name: str = None, settings: RuntimeSettings = None) -> ResourceProfile:
+    settings = settings or get_settings()
+    name = name or settings.resourceProfile
+    if name not in PROFILES:
+        raise ValueError(f"Unknown resource profile {name!r}; expected one of {', '.join(PROFILES)}")
+    return PROFILES[name]
@@ -0,0 +1,131 @@
+import logging
+from urllib.parse import urlsplit
+from selenium.common import WebDriverException
+
+# override command -> (command, params) that undoes it; None means "re-apply the session baseline"
+OVERRIDE_RESETS = {
+    "Emulation.setDeviceMetricsOverride": ("Emulation.clearDeviceMetricsOverride", {}),
+    "Emulation.setGeolocationOverride": ("Emulation.clearGeolocationOverride", {}),
+    "Emulation.setIdleOverride": ("Emulation.clearIdleOverride", {}),
+    "Emulation.setLocaleOverride": ("Emulation.setLocaleOverride", {}),
+    "Emulation.setEmulatedMedia": ("Emulation.setEmulatedMedia", {"media": "", "features": []}),
+    "Emulation.setCPUThrottlingRate": ("Emulation.setCPUThrottlingRate", {"rate": 1}),
+    "Emulation.setTouchEmulationEnabled": ("Emulation.setTouchEmulationEnabled", {"enabled": False}),
+    "Emulation.setScriptExecutionDisabled": ("Emulation.setScriptExecutionDisabled", {"value": False}),
+    "Network.emulateNetworkConditions": (
+        "Network.emulateNetworkConditions",
+        {"offline": False, "latency": 0, "downloadThroughput": -1, "uploadThroughput": -1},
+    ),
+    "Emulation.setTimezoneOverride": None,
+    "Emulation.setUserAgentOverride": None,
+    "Network.setUserAgentOverride": None,
+    "Network.setExtraHTTPHeaders": None,
+    "Network.setBlockedURLs": None,
+}
+
+
+def origin_of(url: str):
+    parts = urlsplit(url or "")
+    if parts.scheme not in ("http", "https") or not parts.netloc:
+        return None
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def frame_origins(frameTree: dict) -> set:
+    """Origins of a page and all of its iframes, from ``Page.getFrameTree``."""
+    origins = set()
+    pending = [frameTree.get("frameTree", frameTree)]
+    while pending:
+        node = pending.pop()
+        origin = origin_of(node.get("frame", {}).get("url"))
+        if origin:
+            origins.add(origin)
+        pending.extend(node.get("childFrames", []))
+    return origins
+
+
+class SessionState:
+    """What a test changed in a session after startup, so ``reset`` knows what to undo."""
+
+    def __init__(self):
+        self.origins = set()
+        self.overrides = set()
+        self.injectedScripts = []
+
+    def note_navigation(self, url: str):
+        origin = origin_of(url)
+        if origin:
+            self.origins.add(origin)
+
+    def note_command(self, cmd: str, result):
+        if cmd in OVERRIDE_RESETS:
+            self.overrides.add(cmd)
+        elif cmd == "Page.addScriptToEvaluateOnNewDocument" and isinstance(result, dict) and "identifier" in result:
+            self.injectedScripts.append(result["identifier"])
+
+    def clear(self):
+        self.origins = set()
+        self.overrides = set()
+        self.injectedScripts = []
+
+
+def close_extra_tabs(driver, mainHandle: str, execute_cdp_cmd, origins: set):
+    """Close every window but ``mainHandle``, collecting the origins they had loaded."""
+    for handle in driver.window_handles:
+        driver.switch_to.window(handle)
+        try:
+            origins.update(frame_origins(execute_cdp_cmd("Page.getFrameTree", {})))
+        except WebDriverException:
+            pass
+        if handle != mainHandle:
+            driver.close()
+    driver.switch_to.window(mainHandle)
+
+
+def clear_browser_state(execute_cdp_cmd, origins: set, state: SessionState, baseline: dict):
+    """Cookies, caches, per-origin storage, permissions and emulation overrides back to the baseline.
+
+    ``baseline`` maps the commands marked ``None`` in ``OVERRIDE_RESETS`` to the params
+    the session started with (e.g. the stealth user agent).
+    """
+    execute_cdp_cmd("Network.clearBrowserCookies", {})
+    execute_cdp_cmd("Network.clearBrowserCache", {})
+    for origin in sorted(origins):
+        # "all" covers local/session storage, IndexedDB, Cache Storage and service workers
+        execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+    execute_cdp_cmd("Browser.resetPermissions", {})
+    for cmd in sorted(state.overrides):
+        undo = OVERRIDE_RESETS[cmd]
+        if undo is None:
+            undo = (_baseline_command(cmd), baseline[_baseline_command(cmd)])
+        execute_cdp_cmd(*undo)
+    for identifier in state.injectedScripts:
+        execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument", {"identifier": identifier})
+
+
+def _baseline_command(cmd: str) -> str:
+    # both user agent commands restore through the Network domain
+    return "Network.setUserAgentOverride" if cmd.endswith("setUserAgentOverride") else cmd
+
+
+def find_state_leaks(driver, execute_cdp_cmd, origins: set) -> list:
+    """Checklist run after a reset; every entry names state that survived it."""
+    leaks = []
+    if len(driver.window_handles) > 1:
+        leaks.append(f"{len(driver.window_handles) - 1} extra tabs still open")
+    cookies = execute_cdp_cmd("Network.getAllCookies", {}).get("cookies", [])
+    if cookies:
+        leaks.append(f"{len(cookies)} cookies left ({', '.join(sorted({c.get('domain', '') for c in cookies}))})")
+    for origin in sorted(origins):
+        try:
+            usage = execute_cdp_cmd("Storage.getUsageAndQuota", {"origin": origin})
+        except WebDriverException:
+            continue
+        used = [entry["storageType"] for entry in usage.get("usageBreakdown", []) if entry.get("usage")]
+        if used:
+            leaks.append(f"{origin} still stores {', '.join(used)}")
+    if origin_of(driver.current_url):
+        leaks.append(f"still on {driver.current_url}")
+    for leak in leaks:
+        logging.warning(f"⚠️ Session state leak after reset: {leak}")
+    return leaks
@@ -0,0 +1,174 @@
+import json
+import time
+import logging
+import threading
+from selenium.common import (
+    ElementNotInteractableException,
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException,
+)
+from typing import TYPE_CHECKING
+from automdjango.srcode.runtimesettings import get_settings
+
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
+
+# Exceptions that mean "not yet" while polling a condition
+IGNORED_EXCEPTIONS = (NoSuchElementException, StaleElementReferenceException, ElementNotInteractableException)
+
+_INSTALL_MUTATION_OBSERVER = """
+    if (!window.__automdMutationObserver) {
+      window.__automdLastMutation = performance.now();
+      window.__automdMutationObserver = new MutationObserver(() => { window.__automdLastMutation = performance.now(); });
+      window.__automdMutationObserver.observe(document, { childList: true, subtree: true, attributes: true, characterData: true });
+    }
+    return performance.now() - window.__automdLastMutation;
+"""
+
+
+class WaitMetrics:
+    """Latency of every wait, aggregated per condition name."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._waits = {}
+
+    def record(self, name: str, seconds: float, succeeded: bool, polls: int):
+        with self._lock:
+            entry = self._waits.setdefault(
+                name, {"count": 0, "timeouts": 0, "polls": 0, "total": 0.0, "max": 0.0}
+            )
+            entry["count"] += 1
+            entry["polls"] += polls
+            entry["total"] += seconds
+            entry["max"] = max(entry["max"], seconds)
+            if not succeeded:
+                entry["timeouts"] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                name: dict(entry, mean=entry["total"] / entry["count"])
+                for name, entry in self._waits.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._waits = {}
+
+
+class WaitEngine:
+    """Condition-based waits that replace fixed ``time.sleep`` calls.
+
+    Conditions are polled with an interval that starts short and grows while the
+    condition stays false, so fast pages return quickly without hammering a remote
+    grid on slow ones. Every wait is timed into ``metrics``.
+    """
+
+    def __init__(self, driver: "WebDriver", timeout: float = None, min_poll: float = 0.05, max_poll: float = 0.5,
+                 metrics: WaitMetrics = None):
+        self.driver = driver
+        self.timeout = timeout if timeout is not None else get_settings().waitTimeout
+        self.min_poll = min_poll
+        self.max_poll = max_poll
+        self.metrics = metrics if metrics is not None else WaitMetrics()
+        self._inflight = set()
+        # callables receiving every performance-log batch this engine reads (e.g. a HarRecorder)
+        self.networkListeners = []
+
+    def until(self, condition, name: str = "condition", timeout: float = None, message: str = ""):
+        """Poll ``condition(driver)`` until it returns a truthy value and return that value."""
+        timeout = self.timeout if timeout is None else timeout
+        start = time.monotonic()
+        deadline = start + timeout
+        interval = self.min_poll
+        polls = 0
+        while True:
+            polls += 1
+            try:
+                value = condition(self.driver)
+                if value:
+                    self.__record(name, start, True, polls)
+                    return value
+            except IGNORED_EXCEPTIONS:
+                pass
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.__record(name, start, False, polls)
+                raise TimeoutException(message or f"Timed out after {timeout}s waiting for {name}")
+            time.sleep(min(interval, remaining))
+            interval = min(interval * 1.5, self.max_poll)
+
+    def presence(self, locator: tuple, timeout: float = None):
+        return self.until(lambda d: d.find_element(*locator), "presence", timeout, f"Element {locator} never appeared")
+
+    def clickable(self, locator: tuple, timeout: float = None):
+        def condition(d):
+            element = d.find_element(*locator)
+            return element if element.is_displayed() and element.is_enabled() else None
+
+        return self.until(condition, "clickable", timeout, f"Element {locator} never became clickable")
+
+    def title_contains(self, text: str, timeout: float = None) -> str:
+        return self.until(
+            lambda d: d.title if text in d.title else None, "title_contains", timeout, f"Title never contained {text!r}"
+        )
+
+    def network_idle(self, idle_time: float = 0.5, timeout: float = None) -> bool:
+        """Wait until no request has been in flight for ``idle_time`` seconds.
+
+        Reads CDP ``Network`` events from Chrome's performance log; when that log is
+        not enabled the wait falls back to DOM quiescence.
+        """
+        try:
+            self.observe_network_events(self.driver.get_log("performance"))
+        except (WebDriverException, ValueError, AttributeError):
+            # AttributeError: Firefox's driver has no get_log at all
+            logging.info("ℹ️ Performance log unavailable; using DOM quiescence instead of network idle")
+            return self.dom_quiescent(idle_time, timeout)
+
+        state = {"idleSince": time.monotonic()}
+
+        def condition(d):
+            self.observe_network_events(d.get_log("performance"))
+            now = time.monotonic()
+            if self._inflight:
+                state["idleSince"] = now
+                return False
+            return now - state["idleSince"] >= idle_time
+
+        return self.until(condition, "network_idle", timeout)
+
+    def dom_quiescent(self, quiet_time: float = 0.5, timeout: float = None) -> bool:
+        """Wait until the DOM has not mutated for ``quiet_time`` seconds."""
+        quietMs = quiet_time * 1000
+        return self.until(
+            lambda d: d.execute_script(_INSTALL_MUTATION_OBSERVER) >= quietMs, "dom_quiescent", timeout
+        )
+
+    def reset_network(self):
+        """Forget in-flight requests, e.g. because a new page is being loaded."""
+        self._inflight.clear()
+
+    def observe_network_events(self, entries: list):
+        """Track in-flight requests from performance-log entries read by someone else."""
+        for listener in self.networkListeners:
+            listener(entries)
+        for entry in entries:
+            try:
+                event = json.loads(entry["message"])["message"]
+            except (KeyError, TypeError, ValueError):
+                continue
+            method = event.get("method", "")
+            requestId = event.get("params", {}).get("requestId")
+            if method == "Network.requestWillBeSent":
+                self._inflight.add(requestId)
+            elif method in ("Network.loadingFinished", "Network.loadingFailed"):
+                self._inflight.discard(requestId)
+
+    def __record(self, name: str, start: float, succeeded: bool, polls: int):
+        elapsed = time.monotonic() - start
+        self.metrics.record(name, elapsed, succeeded, polls)
+        logging.debug(f"⏱️ Wait for {name} {'done' if succeeded else 'timed out'} in {elapsed:.3f}s ({polls} polls)")
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand, CommandError
+from automdjango.srcode.drivers.drivercache import detect_chrome_major, resolve_chromedriver
+from automdjango.srcode.runtimesettings import get_settings
+
+
+class Command(BaseCommand):
+    help = "Download the chromedriver matching the local Chrome into the persistent driver cache (run at image build time)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chrome-major", help="cache a driver for this Chrome major version instead of the detected one")
+
+    def handle(self, *args, **options):
+        major = options["chrome_major"] or detect_chrome_major(get_settings().chromeBin)
+        if major is None:
+            raise CommandError("Could not detect the Chrome version; set CHROME_BIN or pass --chrome-major")
+        path = resolve_chromedriver(major)
+        self.stdout.write(self.style.SUCCESS(f"chromedriver for Chrome {major} cached at {path}"))
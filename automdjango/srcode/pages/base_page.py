@@ -0,0 +1,155 @@
+import logging
+from selenium.common import NoSuchElementException
+from automdjango.srcode.drivers.batchquery import ElementQuery, to_css_or_xpath
+
+WAIT_CONDITIONS = ("presence", "visible", "clickable", None)
+
+_FILL_FORM_SCRIPT = """
+    const find = (f) => {
+      try {
+        if (f.using === 'xpath') {
+          return document.evaluate(f.value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        }
+        return document.querySelector(f.value);
+      } catch (e) {
+        return null;
+      }
+    };
+    const setValue = (el, value) => {
+      const tag = el.tagName.toLowerCase();
+      if (el.type === 'checkbox' || el.type === 'radio') {
+        if (el.checked !== Boolean(value)) el.click();
+        return;
+      }
+      if (tag === 'select') {
+        el.value = value;
+      } else if (el.isContentEditable) {
+        el.textContent = value;
+      } else {
+        // the prototype setter keeps React/Vue value tracking in sync
+        const proto = tag === 'textarea' ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+        Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, value);
+      }
+      el.dispatchEvent(new Event('input', { bubbles: true }));
+      el.dispatchEvent(new Event('change', { bubbles: true }));
+    };
+    const missing = [];
+    arguments[0].forEach((f, index) => {
+      const el = find(f);
+      if (el === null) { missing.push(index); return; }
+      setValue(el, f.text);
+    });
+    return missing;
+"""
+
+
+class Element:
+    """Lazy page-object element.
+
+    Declared on a page class, e.g. ``searchBox = Element(By.ID, "APjFqb", wait="clickable")``.
+    It is resolved on first attribute access, after waiting for ``wait`` (``presence``,
+    ``visible``, ``clickable`` or ``None``), then stored on the page instance so later
+    accesses cost nothing. With the session's locator cache on, the stored element
+    re-finds itself if the page replaces it.
+    """
+
+    def __init__(self, by, value: str = None, wait: str = "presence", timeout: float = None, many: bool = False):
+        if wait not in WAIT_CONDITIONS:
+            raise ValueError(f"Unknown wait {wait!r}; expected one of {', '.join(map(str, WAIT_CONDITIONS))}")
+        self.locator = tuple(by) if value is None else (by, value)
+        self.wait = wait
+        self.timeout = timeout
+        self.many = many
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, page, owner=None):
+        if page is None:
+            return self
+        resolved = page.resolve(self)
+        page.__dict__[self.name] = resolved
+        return resolved
+
+    def __repr__(self):
+        return f"Element({self.name!r}, {self.locator!r}, wait={self.wait!r})"
+
+
+class BasePage:
+    """Base class for page objects built on a ``DriverPreparation`` session."""
+
+    def __init__(self, driver):
+        # commands go through driver.getDriver(), which stays in the session's own tab while browser contexts exist
+        self.driver = driver
+
+    @classmethod
+    def elements(cls) -> dict:
+        """Declared elements by attribute name, including inherited ones."""
+        declared = {}
+        for klass in reversed(cls.__mro__):
+            declared.update({name: value for name, value in vars(klass).items() if isinstance(value, Element)})
+        return declared
+
+    def resolve(self, element: Element):
+        waits = self.driver.waits
+        locator = element.locator
+        if element.many:
+            return waits.until(lambda d: d.find_elements(*locator) or None, f"elements {element.name}",
+                               element.timeout, f"No element matched {locator}")
+        if element.wait == "clickable":
+            found = waits.clickable(locator, element.timeout)
+        elif element.wait == "visible":
+            found = waits.until(lambda d: _displayed(d.find_element(*locator)), f"visible {element.name}",
+                                element.timeout, f"Element {locator} never became visible")
+        elif element.wait == "presence":
+            found = waits.presence(locator, element.timeout)
+        else:
+            found = self.driver.getDriver().find_element(*locator)
+        if self.driver.locatorCache is not None:
+            return self.driver.locatorCache.remember(locator, found)
+        return found
+
+    def reset(self):
+        """Forget resolved elements, e.g. after this page object navigated somewhere else."""
+        for name in self.elements():
+            self.__dict__.pop(name, None)
+
+    def __locator(self, field) -> tuple:
+        if isinstance(field, str):
+            declared = self.elements().get(field)
+            if declared is None:
+                raise KeyError(f"{type(self).__name__} declares no element {field!r}")
+            return declared.locator
+        return tuple(field)
+
+    def fill_form(self, values: dict):
+        """Set many fields in one ``execute_script`` round trip.
+
+        Keys are declared element names or locator tuples. Text inputs, textareas,
+        selects, checkboxes/radios (truthy = checked) and contenteditable elements get
+        their value plus ``input`` and ``change`` events, like a user edit would.
+        """
+        fields = []
+        for field, value in values.items():
+            using, selector = to_css_or_xpath(self.__locator(field))
+            fields.append({"using": using, "value": selector, "text": value})
+        missing = self.driver.getDriver().execute_script(_FILL_FORM_SCRIPT, fields)
+        if missing:
+            names = [list(values)[index] for index in missing]
+            raise NoSuchElementException(f"Form fields not found: {names}")
+        logging.info(f"📝 Filled {len(fields)} fields on {type(self).__name__}")
+
+    def read_form(self, fields) -> dict:
+        """Current ``value`` of many fields in one round trip (None for fields that are missing)."""
+        fields = list(fields)
+        results = self.driver.query_elements(
+            [ElementQuery(self.__locator(field), properties=["value"]) for field in fields]
+        )
+        return {
+            field: result["properties"]["value"] if result else None for field, result in zip(fields, results)
+        }
+
+
+def _displayed(element):
+    return element if element.is_displayed() else None
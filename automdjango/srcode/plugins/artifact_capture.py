@@ -0,0 +1,54 @@
+"""Pytest plugin that captures browser artifacts when a test fails.
+
+ARTIFACT_CAPTURE=failure (default) grabs a screenshot, the DOM and the console and
+performance logs from every DriverPreparation the test used, as soon as the setup
+or call phase fails and before fixtures reset the session. ``always`` captures
+after every call phase and ``off`` disables capture. Compression and writing
+happen on the ArtifactStore's thread pool; the paths are listed in the report and
+attached to the recorded result.
+"""
+import pytest
+from automdjango.srcode.plugins.results_recorder import record_artifact
+
+_store = None
+
+
+def _sessions(item) -> list:
+    from automdjango.srcode.drivers.driverpreparation import DriverPreparation
+
+    funcargs = getattr(item, "funcargs", {})
+    return [value for value in funcargs.values() if isinstance(value, DriverPreparation)]
+
+
+def _should_capture(mode: str, report) -> bool:
+    if mode == "always":
+        return report.when == "call" or (report.failed and report.when == "setup")
+    if mode == "failure":
+        return report.failed and report.when in ("setup", "call")
+    return False
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    global _store
+    from automdjango.srcode.runtimesettings import get_settings
+
+    outcome = yield
+    report = outcome.get_result()
+    if not _should_capture(get_settings().artifactCapture, report):
+        return
+    from automdjango.srcode.drivers.artifacts import get_artifact_store
+
+    paths = []
+    for session in _sessions(item):
+        _store = _store or get_artifact_store()
+        for record in session.capture_artifacts(store=_store):
+            record_artifact(item.nodeid, **record.as_dict())
+            paths.append(f"{record.kind}: {record.path}")
+    if paths:
+        report.sections.append(("Captured artifacts", "\n".join(paths)))
+
+
+def pytest_unconfigure(config):
+    if _store is not None:
+        _store.drain()
@@ -0,0 +1,220 @@
+"""Pytest plugin that shards a run across K worker processes.
+
+``pytest --workers 4`` (or ``--workers auto``) turns the invoking process into a
+controller: it sizes the run to the grid's capacity, starts one pytest worker per
+shard and merges their exit codes. Every worker is a plain pytest session, so the
+session-scoped ``driver_pool`` fixture gives each worker its own remote session.
+
+Tests are spread by recorded duration, longest first (see ``scheduling``). Workers
+started by the controller share one work queue and steal from each other when
+they run dry; a manual ``--shard`` only gets the static LPT split.
+"""
+import os
+import sys
+import logging
+import subprocess
+import tempfile
+import threading
+import uuid
+import pytest
+from automdjango.srcode.plugins.scheduling import DurationStore, WorkQueue, lpt_partition
+
+WORKER_ID_ENV = "AUTOMD_WORKER_ID"
+# shared by every worker of one invocation so their results land in the same run
+RUN_KEY_ENV = "AUTOMD_RUN_KEY"
+WORK_QUEUE_ENV = "AUTOMD_WORK_QUEUE"
+DURATIONS_FILE = ".automd_durations.json"
+
+_durations = None
+_workQueue = None
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("automdjango", "automdjango parallel execution")
+    group.addoption(
+        "--workers",
+        action="store",
+        default=os.environ.get("PYTEST_WORKERS"),
+        help="run tests in N worker processes, or 'auto' to match the Selenium grid capacity",
+    )
+    group.addoption("--shard", action="store", default=None, help="internal: run shard INDEX/COUNT only")
+
+
+def parse_shard(value: str) -> tuple:
+    index, count = (int(part) for part in value.split("/"))
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"Invalid shard {value!r}")
+    return index, count
+
+
+def shard_items(items: list, index: int, count: int, estimate=None) -> tuple:
+    """Longest-processing-time split of collected items; returns (selected, deselected).
+
+    ``estimate(item)`` gives the expected seconds; without it the split is round-robin.
+    """
+    positions = lpt_partition(list(range(len(items))), count, lambda position: estimate(items[position]) if estimate else 1.0)
+    chosen = set(positions[index])
+    selected = [item for position, item in enumerate(items) if position in chosen]
+    deselected = [item for position, item in enumerate(items) if position not in chosen]
+    return selected, deselected
+
+
+def durations_path(config) -> str:
+    from automdjango.srcode.runtimesettings import get_settings
+
+    return get_settings().durationsFile or os.path.join(str(config.rootpath), DURATIONS_FILE)
+
+
+def resolve_worker_count(requested: str) -> int:
+    """Turn --workers into a process count capped by what the grid can run at once."""
+    from automdjango.srcode.drivers.gridstatus import fetch_grid_capacity
+    from automdjango.srcode.runtimesettings import get_settings
+
+    # with several hubs the workers may use all of them at once
+    capacities = [fetch_grid_capacity(url) for url in get_settings().remoteUrls]
+    gridSlots = sum(capacity.totalSlots for capacity in capacities if capacity is not None and capacity.totalSlots)
+
+    if requested == "auto":
+        count = gridSlots if gridSlots else (os.cpu_count() or 1)
+    else:
+        count = int(requested)
+    if gridSlots and count > gridSlots:
+        logging.info(f"ℹ️ Capping workers at {gridSlots} (grid capacity)")
+        count = gridSlots
+    return max(1, count)
+
+
+def _worker_args(config) -> list:
+    args = []
+    skipNext = False
+    for arg in config.invocation_params.args:
+        if skipNext:
+            skipNext = False
+            continue
+        if arg == "--workers":
+            skipNext = True
+            continue
+        if arg.startswith("--workers="):
+            continue
+        args.append(str(arg))
+    return args
+
+
+def _pump(stream, prefix: str, lock: threading.Lock):
+    for line in iter(stream.readline, ""):
+        with lock:
+            sys.stdout.write(f"[{prefix}] {line}")
+            sys.stdout.flush()
+    stream.close()
+
+
+def _run_workers(config, count: int) -> int:
+    args = _worker_args(config)
+    lock = threading.Lock()
+    workers = []
+    runKey = os.environ.get(RUN_KEY_ENV) or uuid.uuid4().hex
+    queuePath = os.path.join(tempfile.gettempdir(), f"automd-queue-{runKey}.json")
+    for path in (queuePath, f"{queuePath}.lock"):
+        if os.path.exists(path):
+            os.remove(path)
+    for index in range(count):
+        env = dict(os.environ, **{
+            WORKER_ID_ENV: f"gw{index}", RUN_KEY_ENV: runKey, WORK_QUEUE_ENV: queuePath, "PYTEST_WORKERS": "",
+        })
+        process = subprocess.Popen(
+            [sys.executable, "-m", "pytest", *args, "--shard", f"{index}/{count}"],
+            cwd=str(config.invocation_params.dir),
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+        )
+        pump = threading.Thread(target=_pump, args=(process.stdout, f"gw{index}", lock), daemon=True)
+        pump.start()
+        workers.append((process, pump))
+
+    exitCodes = []
+    for process, pump in workers:
+        exitCodes.append(process.wait())
+        pump.join()
+    for path in (queuePath, f"{queuePath}.lock"):
+        if os.path.exists(path):
+            os.remove(path)
+    return merge_exit_codes(exitCodes)
+
+
+def merge_exit_codes(exitCodes: list) -> int:
+    # a shard with nothing to run (5) is fine as long as some shard ran tests
+    failures = [code for code in exitCodes if code not in (pytest.ExitCode.OK, pytest.ExitCode.NO_TESTS_COLLECTED)]
+    if failures:
+        return max(failures)
+    if all(code == pytest.ExitCode.NO_TESTS_COLLECTED for code in exitCodes):
+        return pytest.ExitCode.NO_TESTS_COLLECTED
+    return pytest.ExitCode.OK
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_cmdline_main(config):
+    requested = config.getoption("workers")
+    if not requested or config.getoption("shard") or config.getoption("collectonly"):
+        return None
+    count = resolve_worker_count(requested)
+    if count <= 1:
+        return None
+    logging.info(f"🚀 Running tests in {count} parallel workers")
+    return _run_workers(config, count)
+
+
+def pytest_configure(config):
+    global _durations, _workQueue
+    _durations = DurationStore(durations_path(config))
+    shard = config.getoption("shard")
+    if shard and os.environ.get(WORK_QUEUE_ENV):
+        _workQueue = WorkQueue(os.environ[WORK_QUEUE_ENV], *parse_shard(shard))
+
+
+def pytest_collection_modifyitems(config, items):
+    shard = config.getoption("shard")
+    # with a shared work queue every worker keeps all items and claims them one by one
+    if not shard or _workQueue is not None:
+        return
+    index, count = parse_shard(shard)
+    selected, deselected = shard_items(items, index, count, lambda item: _durations.estimate(item.nodeid))
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+    items[:] = selected
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtestloop(session):
+    """Run tests as they are claimed from the shared queue instead of in collection order."""
+    if _workQueue is None or session.config.option.collectonly:
+        return None
+    if session.testsfailed and not session.config.option.continue_on_collection_errors:
+        raise session.Interrupted(f"{session.testsfailed} error{'s' if session.testsfailed != 1 else ''} during collection")
+    items = {item.nodeid: item for item in session.items}
+    _workQueue.initialize(list(items), _durations.estimate)
+    current = _workQueue.claim()
+    while current is not None:
+        # claim one ahead so fixture teardown knows which test runs next
+        following = _workQueue.claim()
+        items[current].config.hook.pytest_runtest_protocol(item=items[current], nextitem=items.get(following))
+        if session.shouldfail:
+            raise session.Failed(session.shouldfail)
+        if session.shouldstop:
+            raise session.Interrupted(session.shouldstop)
+        current = following
+    if _workQueue.stolen:
+        logging.info(f"🤝 Stole {_workQueue.stolen} tests from slower workers")
+    return True
+
+
+def pytest_runtest_logreport(report):
+    if _durations is not None and not report.skipped:
+        _durations.observe(report.nodeid, report.duration)
+
+
+def pytest_sessionfinish(session):
+    # the controller never configures a session, so only workers and plain runs save history
+    if _durations is not None and not session.config.option.collectonly:
+        _durations.save()
@@ -0,0 +1,114 @@
+"""Pytest plugin that persists outcomes, step timings and artifacts to the results app.
+
+Enabled with ``--record-results`` or RECORD_RESULTS=1. Each pytest process (each
+worker under ``--workers``) owns one ``ResultRecorder``; workers of one invocation
+share a run through AUTOMD_RUN_KEY. Tests time their steps with the ``record_step``
+fixture, which is a no-op timer when recording is off.
+"""
+import os
+import time
+import logging
+from contextlib import contextmanager
+from datetime import datetime, timezone
+import pytest
+from automdjango.srcode.plugins.parallel_runner import RUN_KEY_ENV, WORKER_ID_ENV
+
+MAX_MESSAGE_LENGTH = 4000
+
+_recorder = None
+_reports = {}
+_steps = {}
+_artifacts = {}
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("automdjango")
+    group.addoption(
+        "--record-results",
+        action="store_true",
+        default=False,
+        help="store test outcomes in the automdjango.results database (also RECORD_RESULTS=1)",
+    )
+
+
+def _start_recorder():
+    import django
+    from django.db import DatabaseError
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "automdjango.settings")
+    django.setup()
+    from automdjango.results.recorder import ResultRecorder
+
+    try:
+        return ResultRecorder.for_run(
+            key=os.environ.get(RUN_KEY_ENV),
+            name=os.environ.get("AUTOMD_RUN_NAME", ""),
+            environment=os.environ.get("AUTOMD_ENV", ""),
+        )
+    except DatabaseError as e:
+        logging.warning(f"⚠️ Result recording disabled, database not ready (run `python manage.py migrate`): {e}")
+        return None
+
+
+def pytest_configure(config):
+    global _recorder
+    from automdjango.srcode.runtimesettings import get_settings
+
+    if config.getoption("collectonly"):
+        return
+    if config.getoption("record_results") or get_settings().recordResults:
+        _recorder = _start_recorder()
+
+
+def pytest_unconfigure(config):
+    global _recorder
+    if _recorder is not None:
+        _recorder.close()
+        _recorder = None
+
+
+def record_artifact(nodeid: str, kind: str, path: str, sha256: str, size: int):
+    """Attach a captured file to the result of ``nodeid`` (written with the test's result)."""
+    _artifacts.setdefault(nodeid, []).append({"kind": kind, "path": path, "sha256": sha256, "size": size})
+
+
+@pytest.fixture
+def record_step(request):
+    """``with record_step("search"): ...`` times one step of the current test."""
+    steps = _steps.setdefault(request.node.nodeid, [])
+
+    @contextmanager
+    def step(name: str):
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            steps.append((name, time.monotonic() - start))
+
+    return step
+
+
+def pytest_runtest_logreport(report):
+    if _recorder is None:
+        if report.when == "teardown":
+            _steps.pop(report.nodeid, None)
+            _artifacts.pop(report.nodeid, None)
+        return
+    state = _reports.setdefault(report.nodeid, {
+        "outcome": "passed", "duration": 0.0, "message": "",
+        "started_at": datetime.fromtimestamp(report.start, tz=timezone.utc),
+    })
+    state["duration"] += report.duration
+    if report.failed:
+        state["outcome"] = "failed" if report.when == "call" else "error"
+        state["message"] = report.longreprtext[-MAX_MESSAGE_LENGTH:]
+    elif report.skipped and state["outcome"] == "passed":
+        state["outcome"] = "skipped"
+    if report.when == "teardown":
+        _reports.pop(report.nodeid)
+        _recorder.record(
+            report.nodeid, state["outcome"], state["duration"],
+            worker=os.environ.get(WORKER_ID_ENV, ""), message=state["message"],
+            started_at=state["started_at"],
+            steps=_steps.pop(report.nodeid, ()), artifacts=_artifacts.pop(report.nodeid, ()),
+        )
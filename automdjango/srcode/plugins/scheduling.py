@@ -0,0 +1,120 @@
+"""Duration history and longest-processing-time-first scheduling for parallel runs.
+
+``DurationStore`` keeps a moving average of every test's duration in a small JSON
+file. ``lpt_partition`` uses it to hand the slowest tests out first, each to the
+least-loaded worker. ``WorkQueue`` shares that plan between the worker processes of
+one run through a locked file, so a worker that drains its own queue steals the
+last test of the worker with the most estimated work left.
+"""
+import os
+import json
+import heapq
+import statistics
+from automdjango.srcode.drivers.drivercache import file_lock
+
+DEFAULT_DURATION = 1.0
+# weight of the newest observation in the moving average
+SMOOTHING = 0.5
+
+
+def _write_json(path: str, data):
+    partial = f"{path}.{os.getpid()}.partial"
+    with open(partial, "w") as handle:
+        json.dump(data, handle, sort_keys=True)
+    os.replace(partial, path)
+
+
+def _read_json(path: str, default):
+    try:
+        with open(path) as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return default
+
+
+class DurationStore:
+    """Per-test duration history; tests without history are estimated at the median."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.durations = _read_json(path, {})
+        self.observed = {}
+        known = list(self.durations.values())
+        self.default = statistics.median(known) if known else DEFAULT_DURATION
+
+    def estimate(self, nodeid: str) -> float:
+        return self.durations.get(nodeid, self.default)
+
+    def observe(self, nodeid: str, seconds: float):
+        self.observed[nodeid] = self.observed.get(nodeid, 0.0) + seconds
+
+    def save(self):
+        """Merge this process's observations into the file; safe with concurrent workers."""
+        if not self.observed:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with file_lock(f"{self.path}.lock"):
+            durations = _read_json(self.path, {})
+            for nodeid, seconds in self.observed.items():
+                previous = durations.get(nodeid)
+                durations[nodeid] = round(
+                    seconds if previous is None else SMOOTHING * seconds + (1 - SMOOTHING) * previous, 4
+                )
+            _write_json(self.path, durations)
+        self.observed = {}
+
+
+def lpt_partition(keys: list, count: int, estimate) -> list:
+    """Split ``keys`` into ``count`` lists, longest estimate first onto the least-loaded list.
+
+    Equal estimates keep collection order and fill the lists round-robin.
+    """
+    shards = [[] for _ in range(count)]
+    loads = [(0.0, index) for index in range(count)]
+    for key in sorted(keys, key=lambda key: -estimate(key)):
+        load, index = heapq.heappop(loads)
+        shards[index].append(key)
+        heapq.heappush(loads, (load + estimate(key), index))
+    return shards
+
+
+class WorkQueue:
+    """LPT plan shared by the workers of one run, with work stealing.
+
+    The first worker to arrive writes the plan; every worker has collected the same
+    items, so any of them can. ``claim`` pops the next test from this worker's
+    queue, or steals the tail of the queue with the largest estimated remainder.
+    """
+
+    def __init__(self, path: str, index: int, count: int):
+        self.path = path
+        self.index = index
+        self.count = count
+        self.stolen = 0
+
+    def initialize(self, nodeids: list, estimate):
+        with file_lock(f"{self.path}.lock"):
+            if os.path.exists(self.path):
+                return
+            _write_json(self.path, {
+                "queues": lpt_partition(nodeids, self.count, estimate),
+                "estimates": {nodeid: estimate(nodeid) for nodeid in nodeids},
+            })
+
+    def claim(self):
+        with file_lock(f"{self.path}.lock"):
+            state = _read_json(self.path, None)
+            if state is None:
+                return None
+            queues = state["queues"]
+            if queues[self.index]:
+                nodeid = queues[self.index].pop(0)
+            else:
+                estimates = state["estimates"]
+                victim = max(range(self.count), key=lambda index: sum(estimates[n] for n in queues[index]))
+                if not queues[victim]:
+                    return None
+                nodeid = queues[victim].pop()
+                self.stolen += 1
+            _write_json(self.path, state)
+            return nodeid
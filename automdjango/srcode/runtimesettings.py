@@ -0,0 +1,280 @@
+"""Environment-driven runtime settings, resolved and validated once per process.
+
+Driver, pool, wait and page code read ``get_settings()`` instead of calling
+``os.environ.get`` on the hot path. Pooled or one-off sessions can run with a
+variant through ``get_settings().override(...)``.
+"""
+import os
+import json
+import logging
+import threading
+from dataclasses import dataclass, fields, replace
+from typing import Optional
+from automdjango.srcode.custom_exceptions.invalid_setting_exception import InvalidSettingException
+
+TRUE_VALUES = frozenset({"1", "true", "yes", "on"})
+FALSE_VALUES = frozenset({"0", "false", "no", "off", ""})
+PAGE_LOAD_STRATEGIES = ("normal", "eager", "none")
+ARTIFACT_CAPTURE_MODES = ("off", "failure", "always")
+HTTP_CACHE_MODES = ("off", "record", "replay", "passthrough")
+SECRET_FIELDS = frozenset({"recaptchaApiKey"})
+
+
+def _flag(variable: str, raw: str) -> bool:
+    value = raw.strip().lower()
+    if value in TRUE_VALUES:
+        return True
+    if value in FALSE_VALUES:
+        return False
+    raise InvalidSettingException(variable, raw, "expected one of 1/0, true/false, yes/no, on/off")
+
+
+def _number(kind):
+    def parse(variable: str, raw: str):
+        try:
+            value = kind(raw)
+        except ValueError:
+            raise InvalidSettingException(variable, raw, f"expected {kind.__name__}")
+        if value < 0:
+            raise InvalidSettingException(variable, raw, "must not be negative")
+        return value
+
+    return parse
+
+
+def _text(variable: str, raw: str) -> Optional[str]:
+    return raw or None
+
+
+def _patterns(variable: str, raw: str) -> tuple:
+    return tuple(pattern.strip() for pattern in raw.split(",") if pattern.strip())
+
+
+# (field, environment variable, parser, default) — parsed in this order at startup
+SPEC = (
+    ("seleniumRemoteUrl", "SELENIUM_REMOTE_URL", _text, None),
+    ("browserBackend", "BROWSER_BACKEND", _text, None),
+    ("chromeBin", "CHROME_BIN", _text, None),
+    ("userDataDir", "USER_DATA_DIR", _text, None),
+    ("incognito", "INCOGNITO", _flag, False),
+    ("enableStealth", "ENABLE_STEALTH", _flag, False),
+    ("realisticUa", "REALISTIC_UA", _text,
+     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36"),
+    ("setAcceptLanguage", "SET_ACCEPT_LANGUAGE", _flag, True),
+    ("acceptLanguage", "ACCEPT_LANGUAGE", _text, "en-US,en;q=0.9"),
+    ("tzOverride", "TZ_OVERRIDE", _text, None),
+    ("enableNetworkEvents", "ENABLE_NETWORK_EVENTS", _flag, False),
+    ("locatorCache", "LOCATOR_CACHE", _flag, True),
+    ("waitTimeout", "WAIT_TIMEOUT", _number(float), 10.0),
+    ("loadProfile", "LOAD_PROFILE", _text, "full"),
+    ("loadBlockPatterns", "LOAD_BLOCK_PATTERNS", _patterns, ()),
+    ("loadAllowPatterns", "LOAD_ALLOW_PATTERNS", _patterns, ()),
+    ("pageLoadStrategy", "PAGE_LOAD_STRATEGY", _text, None),
+    ("gridWaitForSlot", "GRID_WAIT_FOR_SLOT", _flag, True),
+    ("gridSlotWaitTimeout", "GRID_SLOT_WAIT_TIMEOUT", _number(float), 600.0),
+    ("gridBreakerFailures", "GRID_BREAKER_FAILURES", _number(int), 3),
+    ("gridBreakerCooldown", "GRID_BREAKER_COOLDOWN", _number(float), 60.0),
+    ("remotePoolSize", "REMOTE_POOL_SIZE", _number(int), None),
+    ("remoteConnectTimeout", "REMOTE_CONNECT_TIMEOUT", _number(float), 10.0),
+    ("remoteReadTimeout", "REMOTE_READ_TIMEOUT", _number(float), 120.0),
+    ("remoteCompression", "REMOTE_COMPRESSION", _flag, False),
+    ("driverPoolSize", "DRIVER_POOL_SIZE", _number(int), 1),
+    ("driverPoolMaxUses", "DRIVER_POOL_MAX_USES", _number(int), 50),
+    ("driverPoolAcquireTimeout", "DRIVER_POOL_ACQUIRE_TIMEOUT", _number(float), 300.0),
+    ("chromedriverCacheDir", "CHROMEDRIVER_CACHE_DIR", _text,
+     os.path.join(os.path.expanduser("~"), ".cache", "automdjango", "chromedriver")),
+    ("chromedriverOffline", "CHROMEDRIVER_OFFLINE", _flag, False),
+    ("profileTemplateDir", "PROFILE_TEMPLATE_DIR", _text, None),
+    ("profileCloneRoot", "PROFILE_CLONE_ROOT", _text, "/dev/shm" if os.path.isdir("/dev/shm") else "/tmp"),
+    ("metricsFile", "DRIVER_METRICS_FILE", _text, None),
+    ("recordResults", "RECORD_RESULTS", _flag, False),
+    ("durationsFile", "TEST_DURATIONS_FILE", _text, None),
+    ("harDir", "HAR_DIR", _text, None),
+    ("harFormat", "HAR_FORMAT", _text, "har"),
+    ("artifactCapture", "ARTIFACT_CAPTURE", _text, "failure"),
+    ("artifactsDir", "ARTIFACTS_DIR", _text, os.path.join(os.getcwd(), "artifacts")),
+    ("artifactCodec", "ARTIFACT_CODEC", _text, "auto"),
+    ("artifactWorkers", "ARTIFACT_WORKERS", _number(int), 2),
+    ("artifactQueueBytes", "ARTIFACT_QUEUE_BYTES", _number(int), 64 * 1024 * 1024),
+    ("httpCacheMode", "HTTP_CACHE_MODE", _text, "off"),
+    ("httpCacheDir", "HTTP_CACHE_DIR", _text, os.path.join(os.getcwd(), ".http_cache")),
+    ("resourceProfile", "RESOURCE_PROFILE", _text, "default"),
+    ("resourceMaxJsHeapMb", "RESOURCE_MAX_JS_HEAP_MB", _number(float), None),
+    ("resourceMaxRssMb", "RESOURCE_MAX_RSS_MB", _number(float), None),
+    ("resourceMaxCpuPercent", "RESOURCE_MAX_CPU_PERCENT", _number(float), None),
+    ("enableRecaptchaSolver", "ENABLE_RECAPTCHA_SOLVER", _flag, False),
+    ("recaptchaApiKey", "RECAPTCHA_API_KEY", _text, None),
+    ("recaptchaEnterprise", "RECAPTCHA_ENTERPRISE", _flag, False),
+    ("recaptchaProxy", "RECAPTCHA_PROXY", _text, None),
+    ("recaptchaVersion", "RECAPTCHA_VERSION", _text, "v2"),
+    ("recaptchaAction", "RECAPTCHA_ACTION", _text, None),
+    ("recaptchaMinScore", "RECAPTCHA_MIN_SCORE", _number(float), None),
+)
+ENV_NAMES = {field: variable for field, variable, _, _ in SPEC}
+
+
+@dataclass(frozen=True, slots=True)
+class RuntimeSettings:
+    seleniumRemoteUrl: Optional[str]
+    browserBackend: Optional[str]
+    chromeBin: Optional[str]
+    userDataDir: Optional[str]
+    incognito: bool
+    enableStealth: bool
+    realisticUa: str
+    setAcceptLanguage: bool
+    acceptLanguage: str
+    tzOverride: Optional[str]
+    enableNetworkEvents: bool
+    locatorCache: bool
+    waitTimeout: float
+    loadProfile: str
+    loadBlockPatterns: tuple
+    loadAllowPatterns: tuple
+    pageLoadStrategy: Optional[str]
+    gridWaitForSlot: bool
+    gridSlotWaitTimeout: float
+    gridBreakerFailures: int
+    gridBreakerCooldown: float
+    remotePoolSize: Optional[int]
+    remoteConnectTimeout: float
+    remoteReadTimeout: float
+    remoteCompression: bool
+    driverPoolSize: int
+    driverPoolMaxUses: int
+    driverPoolAcquireTimeout: float
+    chromedriverCacheDir: str
+    chromedriverOffline: bool
+    profileTemplateDir: Optional[str]
+    profileCloneRoot: str
+    metricsFile: Optional[str]
+    recordResults: bool
+    durationsFile: Optional[str]
+    harDir: Optional[str]
+    harFormat: str
+    artifactCapture: str
+    artifactsDir: str
+    artifactCodec: str
+    artifactWorkers: int
+    artifactQueueBytes: int
+    httpCacheMode: str
+    httpCacheDir: str
+    resourceProfile: str
+    resourceMaxJsHeapMb: Optional[float]
+    resourceMaxRssMb: Optional[float]
+    resourceMaxCpuPercent: Optional[float]
+    enableRecaptchaSolver: bool
+    recaptchaApiKey: Optional[str]
+    recaptchaEnterprise: bool
+    recaptchaProxy: Optional[str]
+    recaptchaVersion: str
+    recaptchaAction: Optional[str]
+    recaptchaMinScore: Optional[float]
+
+    def __post_init__(self):
+        self.validate()
+
+    def validate(self):
+        from automdjango.srcode.drivers.loadprofile import PROFILES
+        from automdjango.srcode.drivers.resourcegovernor import PROFILES as RESOURCE_PROFILES
+
+        if self.loadProfile not in PROFILES:
+            raise InvalidSettingException("LOAD_PROFILE", self.loadProfile, f"expected one of {', '.join(PROFILES)}")
+        if self.resourceProfile not in RESOURCE_PROFILES:
+            raise InvalidSettingException(
+                "RESOURCE_PROFILE", self.resourceProfile, f"expected one of {', '.join(RESOURCE_PROFILES)}"
+            )
+        if self.pageLoadStrategy is not None and self.pageLoadStrategy not in PAGE_LOAD_STRATEGIES:
+            raise InvalidSettingException(
+                "PAGE_LOAD_STRATEGY", self.pageLoadStrategy, f"expected one of {', '.join(PAGE_LOAD_STRATEGIES)}"
+            )
+        if self.harFormat not in ("har", "ndjson"):
+            raise InvalidSettingException("HAR_FORMAT", self.harFormat, "expected har or ndjson")
+        if self.artifactCapture not in ARTIFACT_CAPTURE_MODES:
+            raise InvalidSettingException(
+                "ARTIFACT_CAPTURE", self.artifactCapture, f"expected one of {', '.join(ARTIFACT_CAPTURE_MODES)}"
+            )
+        if self.httpCacheMode not in HTTP_CACHE_MODES:
+            raise InvalidSettingException(
+                "HTTP_CACHE_MODE", self.httpCacheMode, f"expected one of {', '.join(HTTP_CACHE_MODES)}"
+            )
+        if self.artifactWorkers < 1:
+            raise InvalidSettingException("ARTIFACT_WORKERS", self.artifactWorkers, "must be at least 1")
+        if self.gridBreakerFailures < 1:
+            raise InvalidSettingException("GRID_BREAKER_FAILURES", self.gridBreakerFailures, "must be at least 1")
+        if self.remotePoolSize is not None and self.remotePoolSize < 1:
+            raise InvalidSettingException("REMOTE_POOL_SIZE", self.remotePoolSize, "must be at least 1")
+        if self.driverPoolSize < 1:
+            raise InvalidSettingException("DRIVER_POOL_SIZE", self.driverPoolSize, "must be at least 1")
+        if self.recaptchaVersion.lower() not in ("v2", "v3"):
+            raise InvalidSettingException("RECAPTCHA_VERSION", self.recaptchaVersion, "expected v2 or v3")
+        if self.enableRecaptchaSolver and not self.recaptchaApiKey:
+            raise InvalidSettingException(
+                "ENABLE_RECAPTCHA_SOLVER", "1", "the solver needs RECAPTCHA_API_KEY; unset one or set the other"
+            )
+
+    @property
+    def remoteUrls(self) -> tuple:
+        """Grid endpoints; SELENIUM_REMOTE_URL may list several, separated by commas."""
+        return _patterns("SELENIUM_REMOTE_URL", self.seleniumRemoteUrl or "")
+
+    @property
+    def networkEvents(self) -> bool:
+        """Whether Chrome logs CDP Network events: ENABLE_NETWORK_EVENTS=1 for network_idle, or implied by
+        HAR_DIR and by a load profile that blocks URLs (its per-navigation report reads them)."""
+        if self.enableNetworkEvents or self.harDir:
+            return True
+        from automdjango.srcode.drivers.loadprofile import resolve_load_profile
+
+        return bool(resolve_load_profile(settings=self).blockedPatterns)
+
+    def override(self, **changes) -> "RuntimeSettings":
+        """A validated copy with some fields changed, e.g. for one pooled session."""
+        return replace(self, **changes)
+
+    def report(self) -> dict:
+        """Effective configuration keyed by environment variable, secrets masked."""
+        effective = {}
+        for field in fields(self):
+            value = getattr(self, field.name)
+            if field.name in SECRET_FIELDS and value:
+                value = "***"
+            effective[ENV_NAMES[field.name]] = list(value) if isinstance(value, tuple) else value
+        return effective
+
+
+def load_settings(environ=None) -> RuntimeSettings:
+    environ = os.environ if environ is None else environ
+    values = {}
+    for field, variable, parse, default in SPEC:
+        raw = environ.get(variable)
+        values[field] = default if raw is None else parse(variable, raw)
+    return RuntimeSettings(**values)
+
+
+_settings = None
+_settingsLock = threading.Lock()
+
+
+def get_settings() -> RuntimeSettings:
+    """Process-wide settings; resolved, validated and reported on first use."""
+    global _settings
+    if _settings is None:
+        with _settingsLock:
+            if _settings is None:
+                _settings = load_settings()
+                logging.info(f"⚙️ Effective runtime settings: {json.dumps(_settings.report(), sort_keys=True)}")
+    return _settings
+
+
+def loaded_settings() -> Optional[RuntimeSettings]:
+    """The process-wide settings if something already resolved them, without resolving them."""
+    return _settings
+
+
+def reload_settings() -> RuntimeSettings:
+    """Drop the cached settings and resolve them again (tests, or after changing the environment)."""
+    global _settings
+    with _settingsLock:
+        _settings = None
+    return get_settings()
@@ -1,14 +1,11 @@
-import os
 import time
 import json
 import logging
 from typing import Optional
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.common.by import By
-
-
-def _get_env_flag(name: str, default: str = "0") -> bool:
-    return os.environ.get(name, default) in ("1", "true", "True", "yes")
+from automdjango.srcode.drivers.batchquery import ElementQuery, batch_query
+from automdjango.srcode.runtimesettings import RuntimeSettings, get_settings
 
 
 def _post_2captcha(
@@ -87,38 +84,32 @@ def _set_recaptcha_token(driver: WebDriver, token: str) -> None:
 
 
 def _detect_site_key(driver: WebDriver) -> Optional[str]:
-    # Try common selectors for reCAPTCHA widgets
+    # Read every common reCAPTCHA location in one round trip
     try:
-        # v2 explicit sitekey
-        el = driver.find_element(By.CSS_SELECTOR, "div.g-recaptcha")
-        sitekey = el.get_attribute("data-sitekey")
-        if sitekey:
-            return sitekey
+        explicit, invisible, scripts = batch_query(
+            driver,
+            [
+                # v2 explicit sitekey
+                ElementQuery((By.CSS_SELECTOR, "div.g-recaptcha"), attributes=["data-sitekey"]),
+                # invisible v2
+                ElementQuery((By.CSS_SELECTOR, "div.grecaptcha-badge, div.g-recaptcha"), attributes=["data-sitekey"]),
+                # grecaptcha script with render parameter (can expose sitekey)
+                ElementQuery((By.CSS_SELECTOR, 'script[src*="/recaptcha/"]'), attributes=["src"], many=True),
+            ],
+        )
     except Exception:
-        pass
+        explicit, invisible, scripts = None, None, []
 
-    try:
-        # invisible v2
-        el = driver.find_element(By.CSS_SELECTOR, "div.grecaptcha-badge, div.g-recaptcha")
-        sitekey = el.get_attribute("data-sitekey")
+    for widget in (explicit, invisible):
+        sitekey = widget and widget["attributes"].get("data-sitekey")
         if sitekey:
             return sitekey
-    except Exception:
-        pass
 
-    # Look for grecaptcha script with render parameter (can expose sitekey)
-    try:
-        scripts = driver.find_elements(By.CSS_SELECTOR, 'script[src*="/recaptcha/"]')
-        for s in scripts:
-            src = s.get_attribute("src") or ""
-            # e.g., https://www.google.com/recaptcha/api.js?render=SITE_KEY
-            if "render=" in src:
-                try:
-                    return src.split("render=")[-1].split("&")[0]
-                except Exception:
-                    pass
-    except Exception:
-        pass
+    for s in scripts or []:
+        src = s["attributes"].get("src") or ""
+        # e.g., https://www.google.com/recaptcha/api.js?render=SITE_KEY
+        if "render=" in src:
+            return src.split("render=")[-1].split("&")[0]
 
     # Best-effort: read from JS if present
     try:
@@ -127,11 +118,12 @@ def _detect_site_key(driver: WebDriver) -> Optional[str]:
         return None
 
 
-def try_solve_recaptcha_if_present(driver: WebDriver) -> bool:
-    if not _get_env_flag("ENABLE_RECAPTCHA_SOLVER", "0"):
+def try_solve_recaptcha_if_present(driver: WebDriver, settings: RuntimeSettings = None) -> bool:
+    settings = settings or get_settings()
+    if not settings.enableRecaptchaSolver:
         return False
 
-    api_key = os.environ.get("RECAPTCHA_API_KEY")
+    api_key = settings.recaptchaApiKey
     if not api_key:
         logging.info("reCAPTCHA solver enabled but RECAPTCHA_API_KEY is missing")
         return False
@@ -141,17 +133,11 @@ def try_solve_recaptcha_if_present(driver: WebDriver) -> bool:
         return False
 
     page_url = driver.current_url
-    enterprise = _get_env_flag("RECAPTCHA_ENTERPRISE", "0")
-    proxy = os.environ.get("RECAPTCHA_PROXY")
-    version = os.environ.get("RECAPTCHA_VERSION", "v2").lower()
-    action = os.environ.get("RECAPTCHA_ACTION")
-    min_score_str = os.environ.get("RECAPTCHA_MIN_SCORE")
-    min_score = None
-    try:
-        if min_score_str is not None:
-            min_score = float(min_score_str)
-    except Exception:
-        logging.warning("Invalid RECAPTCHA_MIN_SCORE; ignoring")
+    enterprise = settings.recaptchaEnterprise
+    proxy = settings.recaptchaProxy
+    version = settings.recaptchaVersion.lower()
+    action = settings.recaptchaAction
+    min_score = settings.recaptchaMinScore
 
     logging.info("Submitting reCAPTCHA to 2Captcha")
     req_id = _post_2captcha(
@@ -0,0 +1,59 @@
+import os
+import pytest
+from automdjango.srcode.drivers.driverpool import DriverPool
+from automdjango.srcode.runtimesettings import get_settings, reload_settings
+
+
+def pytest_configure(config):
+    # resolve and validate settings before any browser starts so a misconfigured worker fails fast
+    get_settings()
+
+
+@pytest.fixture(autouse=True)
+def restore_settings():
+    """Tests that change the environment reload settings; put the process-wide ones back afterwards"""
+    before = get_settings()
+    yield
+    # only tests that called reload_settings() need (and pay for) another reload
+    if get_settings() is not before:
+        reload_settings()
+
+
+@pytest.fixture(scope="session")
+def django_app():
+    """Django set up with automdjango.settings; tests import models only after requesting this"""
+    import django
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "automdjango.settings")
+    django.setup()
+
+
+@pytest.fixture(scope="session")
+def driver_pool():
+    """Warm WebDriver sessions shared by every test in this pytest process (one process per worker)"""
+    pool = DriverPool()
+    pool.warm()
+    yield pool
+    pool.close()
+
+
+@pytest.fixture(scope="session")
+def worker_driver(driver_pool):
+    """One session pinned to this worker for its whole run, on top of the pool's size so pooled_driver still gets one; state is not reset between tests"""
+    wd = driver_pool.pin()
+    yield wd
+    driver_pool.release(wd)
+
+
+@pytest.fixture
+def pooled_driver(driver_pool):
+    """A session leased for a single test and reset when the test finishes"""
+    with driver_pool.lease() as wd:
+        yield wd
+
+
+@pytest.fixture
+def browser_context(worker_driver):
+    """An isolated browser context (own cookies and storage) inside this worker's Chrome"""
+    with worker_driver.new_context() as context:
+        yield context
@@ -0,0 +1,113 @@
+import os
+import gzip
+import json
+import threading
+from types import SimpleNamespace
+from selenium.common import WebDriverException
+from automdjango.srcode.drivers.artifacts import ArtifactStore, capture_artifacts
+from automdjango.srcode.drivers.driverpreparation import DriverPreparation
+from automdjango.srcode.plugins.artifact_capture import _should_capture
+from automdjango.srcode.runtimesettings import load_settings
+
+
+class FakeDriver:
+
+    page_source = "<html><body>hi</body></html>"
+
+    def get_screenshot_as_png(self):
+        return b"\x89PNG fake"
+
+    def get_log(self, kind):
+        if kind == "browser":
+            raise WebDriverException("log type 'browser' not found")
+        return [{"message": "{}"}]
+
+
+class FakeDriverWithoutLogs:
+
+    page_source = "<html></html>"
+
+    def get_screenshot_as_png(self):
+        return b"\x89PNG fake"
+
+
+class FakeClosedSession(FakeDriver):
+
+    def get(self, url):
+        pass
+
+    @property
+    def current_url(self):
+        raise WebDriverException("invalid session id")
+
+
+class Test_artifacts:
+
+    def test_identical_content_is_written_once(self, tmp_path):
+        store = ArtifactStore(root=str(tmp_path), workers=2, codec="gzip")
+        first = store.submit("dom", b"<html></html>")
+        second = store.submit("dom", b"<html></html>")
+        store.close()
+        assert first.path == second.path and first.path.endswith(".html.gz")
+        assert store.written == 1 and store.deduplicated == 1
+        with gzip.open(first.path) as handle:
+            assert handle.read() == b"<html></html>"
+        assert not [name for name in os.listdir(os.path.dirname(first.path)) if name.endswith(".partial")]
+
+    def test_submit_blocks_when_the_backlog_is_full(self, tmp_path, monkeypatch):
+        release = threading.Event()
+        store = ArtifactStore(root=str(tmp_path), workers=1, max_pending_bytes=10, codec="none")
+        original = store._ArtifactStore__write
+
+        def slow_write(path, data, encode):
+            release.wait(5)
+            return original(path, data, encode)
+
+        monkeypatch.setattr(store, "_ArtifactStore__write", slow_write)
+        store.submit("dom", b"12345678")
+        submitted = threading.Event()
+        thread = threading.Thread(target=lambda: (store.submit("dom", b"abcdefgh"), submitted.set()))
+        thread.start()
+        assert not submitted.wait(0.2)
+        assert store.pendingBytes == 8
+        release.set()
+        thread.join(5)
+        store.close()
+        assert submitted.is_set() and store.written == 2 and store.pendingBytes == 0
+
+    def test_capture_skips_kinds_the_session_cannot_provide(self, tmp_path):
+        store = ArtifactStore(root=str(tmp_path), codec="none")
+        records = capture_artifacts(FakeDriver(), store)
+        store.close()
+        assert [record.kind for record in records] == ["screenshot", "dom", "performance"]
+        assert records[0].path.endswith(".png")
+        with open(records[2].path) as handle:
+            assert json.load(handle) == [{"message": "{}"}]
+
+    def test_capture_skips_logs_of_drivers_without_get_log(self, tmp_path):
+        store = ArtifactStore(root=str(tmp_path), codec="none")
+        records = capture_artifacts(FakeDriverWithoutLogs(), store)
+        store.close()
+        assert [record.kind for record in records] == ["screenshot", "dom"]
+
+    def test_capture_modes(self):
+        failedCall = SimpleNamespace(when="call", failed=True)
+        passedCall = SimpleNamespace(when="call", failed=False)
+        failedTeardown = SimpleNamespace(when="teardown", failed=True)
+        assert _should_capture("failure", failedCall)
+        assert not _should_capture("failure", passedCall)
+        assert not _should_capture("failure", failedTeardown)
+        assert _should_capture("always", passedCall)
+        assert not _should_capture("off", failedCall)
+
+    def test_session_capture_keeps_the_performance_log_for_its_listeners(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(DriverPreparation, "_DriverPreparation__initializeDriver",
+                            lambda self: setattr(self, "driver", FakeClosedSession()))
+        session = DriverPreparation(load_settings({"ENABLE_NETWORK_EVENTS": "1"}))
+        seen = []
+        session.waits.networkListeners.append(seen.extend)
+        store = ArtifactStore(root=str(tmp_path), codec="none")
+        records = session.capture_artifacts(store=store)
+        store.close()
+        assert [record.kind for record in records] == ["screenshot", "dom", "performance"]
+        assert seen == [{"message": "{}"}]
@@ -0,0 +1,136 @@
+import json
+import asyncio
+import pytest
+from selenium.common import NoSuchElementException
+from selenium.webdriver.common.by import By
+from automdjango.srcode.drivers.asyncdriver import ELEMENT_KEY, AsyncDriverPreparation, AsyncElement
+from automdjango.srcode.runtimesettings import reload_settings
+
+
+class FakeWebDriverServer:
+    """Just enough of the W3C WebDriver protocol over HTTP/1.1 keep-alive."""
+
+    def __init__(self):
+        self.sessions = 0
+        self.connections = 0
+        self.statusReads = 0
+        self.requests = []
+        self.titles = {}
+        self.locators = []
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        return f"http://127.0.0.1:{self.server.sockets[0].getsockname()[1]}/wd/hub"
+
+    async def handle(self, reader, writer):
+        counted = False
+        while True:
+            requestLine = await reader.readline()
+            if not requestLine:
+                break
+            method, path, _ = requestLine.decode().split()
+            length = 0
+            while True:
+                line = (await reader.readline()).decode().strip()
+                if not line:
+                    break
+                if line.lower().startswith("content-length"):
+                    length = int(line.split(":")[1])
+            payload = json.loads(await reader.readexactly(length)) if length else None
+            if path == "/status":
+                # the hub router's readiness probe; chromedriver-style, without slot counts
+                self.statusReads += 1
+                status, value = 200, {"ready": True}
+            else:
+                if not counted:
+                    self.connections += 1
+                    counted = True
+                self.requests.append((method, path))
+                status, value = await self.route(method, path[len("/wd/hub"):], payload)
+            body = json.dumps({"value": value}).encode()
+            writer.write(f"HTTP/1.1 {status} OK\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+            await writer.drain()
+        writer.close()
+
+    async def route(self, method, path, payload):
+        parts = path.strip("/").split("/")
+        if method == "POST" and parts == ["session"]:
+            self.sessions += 1
+            return 200, {"sessionId": f"s{self.sessions}", "capabilities": {}}
+        sessionId = parts[1]
+        command = "/".join(parts[2:])
+        if command == "url" and method == "POST":
+            await asyncio.sleep(0.2)  # a slow page load
+            self.titles[sessionId] = payload["url"]
+            return 200, None
+        if command == "title":
+            return 200, self.titles.get(sessionId, "")
+        if command == "element":
+            self.locators.append(payload)
+            if payload["value"] == "missing":
+                return 404, {"error": "no such element", "message": "no such element", "stacktrace": ""}
+            return 200, {ELEMENT_KEY: "e1"}
+        if command == "execute/sync":
+            return 200, {"echo": payload["args"]}
+        return 200, None
+
+
+@pytest.fixture
+def remote():
+    return FakeWebDriverServer()
+
+
+class Test_asyncdriver:
+
+    def test_sessions_run_concurrently_on_one_loop(self, remote, monkeypatch):
+        async def scenario():
+            monkeypatch.setenv("SELENIUM_REMOTE_URL", await remote.start())
+            reload_settings()
+            sessions = await asyncio.gather(*(AsyncDriverPreparation.start(open_website=False) for _ in range(5)))
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            await asyncio.gather(*(s.navigate(f"https://example.test/{i}") for i, s in enumerate(sessions)))
+            elapsed = loop.time() - started
+            titles = await asyncio.gather(*(s.title() for s in sessions))
+            await asyncio.gather(*(s.quit() for s in sessions))
+            return elapsed, titles
+
+        elapsed, titles = asyncio.run(scenario())
+        assert elapsed < 0.2 * 5
+        assert titles == [f"https://example.test/{i}" for i in range(5)]
+        # each session keeps a single keep-alive connection
+        assert remote.connections == 5
+        # a single remote URL still goes through the hub router
+        assert remote.statusReads >= 1
+
+    def test_elements_round_trip_through_execute_script(self, remote, monkeypatch):
+        async def scenario():
+            monkeypatch.setenv("SELENIUM_REMOTE_URL", await remote.start())
+            reload_settings()
+            async with await AsyncDriverPreparation.start(open_website=False) as session:
+                element = await session.find(("css selector", "#q"))
+                await session.click(element)
+                echoed = await session.execute_script("return arguments;", element)
+                with pytest.raises(NoSuchElementException):
+                    await session.find(("css selector", "missing"))
+                return element, echoed
+
+        element, echoed = asyncio.run(scenario())
+        assert isinstance(echoed["echo"][0], AsyncElement)
+        assert echoed["echo"][0].id == element.id
+        assert ("POST", "/wd/hub/session/s1/element/e1/click") in remote.requests
+        assert remote.requests[-1] == ("DELETE", "/wd/hub/session/s1")
+
+    def test_non_w3c_locators_are_sent_as_css(self, remote, monkeypatch):
+        async def scenario():
+            monkeypatch.setenv("SELENIUM_REMOTE_URL", await remote.start())
+            reload_settings()
+            async with await AsyncDriverPreparation.start(open_website=False) as session:
+                await session.find((By.ID, "APjFqb"))
+                await session.find((By.XPATH, "//textarea"))
+
+        asyncio.run(scenario())
+        assert remote.locators == [
+            {"using": "css selector", "value": '[id="APjFqb"]'},
+            {"using": "xpath", "value": "//textarea"},
+        ]
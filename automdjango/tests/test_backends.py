@@ -0,0 +1,96 @@
+import os
+import sys
+import json
+import subprocess
+import pytest
+from automdjango.srcode.custom_exceptions.unsupported_browser_exception import UnsupportedBrowserException
+from automdjango.srcode.drivers.backends import (
+    BACKENDS,
+    BrowserBackend,
+    ChromeBackend,
+    FirefoxBackend,
+    HeadlessShellBackend,
+    RemoteBackend,
+    register_backend,
+    resolve_backend,
+)
+from automdjango.srcode.runtimesettings import load_settings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# generous enough for a cold CI runner; eagerly importing selenium.webdriver alone costs about this much again
+IMPORT_BUDGET_SECONDS = 1.0
+
+PROBE = """
+import os, sys, json, time, logging
+start = time.perf_counter()
+import automdjango.srcode.drivers.driverpreparation
+print(json.dumps({
+    "seconds": time.perf_counter() - start,
+    "modules": sorted(m for m in sys.modules if m.startswith(("selenium.webdriver", "selenium_stealth"))),
+    "seleniumCache": os.environ.get("SELENIUM_CACHE"),
+    "rootHandlers": len(logging.getLogger().handlers),
+}))
+"""
+
+
+class Test_backends:
+
+    def test_import_loads_no_browser_modules(self):
+        env = {k: v for k, v in os.environ.items() if k != "SELENIUM_CACHE"}
+        completed = subprocess.run(
+            [sys.executable, "-c", PROBE], cwd=ROOT, env=env, capture_output=True, text=True, timeout=60
+        )
+        assert completed.returncode == 0, completed.stderr
+        probe = json.loads(completed.stdout.strip().splitlines()[-1])
+        assert probe["modules"] == []
+        assert probe["seleniumCache"] is None
+        # importing must not configure logging for the host application
+        assert probe["rootHandlers"] == 0
+        assert probe["seconds"] < IMPORT_BUDGET_SECONDS
+
+    def test_resolve_backend_follows_browser_name(self):
+        assert isinstance(resolve_backend("chrome", load_settings({})), ChromeBackend)
+        assert isinstance(resolve_backend("Firefox", load_settings({})), FirefoxBackend)
+
+    def test_remote_url_selects_the_grid(self):
+        settings = load_settings({"SELENIUM_REMOTE_URL": "http://grid:4444/wd/hub"})
+        assert isinstance(resolve_backend("chrome", settings), RemoteBackend)
+
+    def test_setting_overrides_browser_name(self):
+        settings = load_settings({"BROWSER_BACKEND": "chromium-headless-shell"})
+        backend = resolve_backend("chrome", settings)
+        assert isinstance(backend, HeadlessShellBackend)
+        assert backend.supportsCdp
+
+    def test_unknown_backend_raises(self):
+        with pytest.raises(UnsupportedBrowserException):
+            resolve_backend("netscape", load_settings({}))
+
+    def test_registered_backend_is_resolved(self, monkeypatch):
+        class EdgeBackend(BrowserBackend):
+            name = "edge"
+
+        monkeypatch.setitem(BACKENDS, "edge", EdgeBackend)
+        register_backend("edge", EdgeBackend)
+        assert isinstance(resolve_backend("edge", load_settings({})), EdgeBackend)
+
+    def test_headless_shell_options(self, tmp_path):
+        settings = load_settings({"CHROME_BIN": "/opt/chrome-headless-shell/chrome-headless-shell"})
+        options = HeadlessShellBackend().options(str(tmp_path / "profile"), settings)
+        assert options.binary_location == settings.chromeBin
+        assert "--headless=new" not in options.arguments
+        assert f"--user-data-dir={tmp_path / 'profile'}" in options.arguments
+
+    def test_headless_shell_needs_a_binary(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("automdjango.srcode.drivers.backends.shutil.which", lambda name: None)
+        with pytest.raises(FileNotFoundError):
+            HeadlessShellBackend().options(str(tmp_path / "profile"), load_settings({}))
+
+    def test_firefox_options_use_the_profile_dir(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("DISPLAY", raising=False)
+        profile = tmp_path / "profile"
+        options = FirefoxBackend().options(str(profile), load_settings({}))
+        assert profile.is_dir()
+        assert options.arguments[:2] == ["-profile", str(profile)]
+        assert "-headless" in options.arguments
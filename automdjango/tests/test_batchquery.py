@@ -0,0 +1,45 @@
+import pytest
+from selenium.webdriver.common.by import By
+from automdjango.srcode.drivers.batchquery import ElementQuery, batch_query, to_css_or_xpath
+from automdjango.srcode.utils.recaptcha_solver import _detect_site_key
+
+
+class FakeWebDriver:
+
+    def __init__(self, results):
+        self.results = results
+        self.scripts = []
+
+    def execute_script(self, script, *args):
+        self.scripts.append(args)
+        return self.results
+
+
+class Test_batchquery:
+
+    def test_locators_are_translated_for_the_browser(self):
+        assert to_css_or_xpath((By.ID, "APjFqb")) == ("css", '[id="APjFqb"]')
+        assert to_css_or_xpath((By.XPATH, "//a")) == ("xpath", "//a")
+        with pytest.raises(ValueError):
+            to_css_or_xpath((By.LINK_TEXT, "Next"))
+
+    def test_all_queries_go_out_in_one_script_call(self):
+        driver = FakeWebDriver([None, []])
+        batch_query(
+            driver,
+            [
+                ElementQuery((By.ID, "q"), attributes=["value"]),
+                ElementQuery((By.CSS_SELECTOR, "a"), properties=["href"], many=True),
+            ],
+        )
+        assert len(driver.scripts) == 1
+        sent = driver.scripts[0][0]
+        assert [q["value"] for q in sent] == ['[id="q"]', "a"]
+        assert sent[1]["many"] is True
+
+    def test_site_key_detection_uses_a_single_round_trip(self):
+        driver = FakeWebDriver(
+            [None, None, [{"attributes": {"src": "https://www.google.com/recaptcha/api.js?render=KEY&hl=en"}}]]
+        )
+        assert _detect_site_key(driver) == "KEY"
+        assert len(driver.scripts) == 1
@@ -0,0 +1,82 @@
+import os
+import urllib.request
+import pytest
+from django.test import Client
+from propertiesloader import PropertiesLoader
+
+
+@pytest.fixture(scope="module")
+def suite(django_app):
+    from automdjango.benchmarks import suite
+
+    return suite
+
+
+class FakeSession:
+
+    def __init__(self, log):
+        self.log = log
+        self.website = PropertiesLoader().getWebsite()
+
+    def navigateTo(self, url):
+        self.log.append(("navigate", url))
+
+    def find_element(self, locator):
+        self.log.append(("find", locator[1]))
+        return locator
+
+    def click_on_element(self, element):
+        self.log.append(("click", element[1]))
+
+    def getDriver(self):
+        return self
+
+    def execute_script(self, script):
+        return "complete"
+
+    def quit(self):
+        self.log.append(("quit", None))
+
+
+class Test_benchmarks:
+
+    def test_summarize_reports_median_p95_and_stddev(self, suite):
+        summary = suite.summarize([10.0, 20.0, 30.0, 40.0, 100.0])
+        assert summary["median"] == 30.0
+        assert summary["p95"] == 88.0
+        assert summary["stddev"] == 35.355
+        assert summary["perSecond"] == 25.0
+
+    def test_compare_flags_only_medians_beyond_the_threshold(self, suite):
+        baseline = {"results": {"click": {"median": 10.0}, "find_element": {"median": 2.0}}}
+        results = {"click": {"n": 5, "median": 10.5}, "find_element": {"n": 5, "median": 3.0}}
+        assert suite.compare(results, baseline, 0.10) == [
+            {"scenario": "find_element", "baseline": 2.0, "current": 3.0, "change": 0.5},
+        ]
+
+    def test_fixture_pages_are_deterministic(self, django_app):
+        client = Client(HTTP_HOST="localhost")
+        first = client.get("/bench/items/?n=3")
+        assert first.status_code == 200
+        assert first.content == client.get("/bench/items/?n=3").content
+        assert b'id="item-2"' in first.content and b'id="item-3"' not in first.content
+        assert b'id="counter"' in client.get("/bench/click/").content
+
+    def test_runner_measures_every_scenario_against_the_fixture_site(self, suite):
+        log, sessions = [], []
+
+        def factory():
+            sessions.append(FakeSession(log))
+            return sessions[-1]
+
+        with suite.FixtureServer() as site:
+            with urllib.request.urlopen(f"{site.url}page/3/", timeout=10) as response:
+                assert b"Paragraph 19 of page 3" in response.read()
+            results = suite.BenchmarkRunner(site.url, iterations=4, coldIterations=2, factory=factory).run()
+
+        assert set(results) == set(suite.SCENARIOS)
+        assert results["cold_start"]["n"] == 2 and results["teardown"]["n"] == 2
+        assert results["find_element"]["n"] == 4
+        assert sessions[0].website == site.url
+        assert ("click", "counter") in log
+        assert os.environ.get("AUTOMD_URL") is None
@@ -0,0 +1,171 @@
+import threading
+import pytest
+from selenium.webdriver.remote.webelement import WebElement
+from automdjango.srcode.drivers.artifacts import ArtifactStore
+from automdjango.srcode.drivers.driverpreparation import DriverPreparation
+
+
+class FakeSwitch:
+
+    def __init__(self, browser):
+        self.browser = browser
+
+    def window(self, handle):
+        self.browser.switches += 1
+        self.browser.current_window_handle = handle
+
+
+class FakeChrome:
+    """Tabs keyed by handle; each browser context has its own cookie jar."""
+
+    session_id = "fake-session"
+
+    def __init__(self):
+        self.window_handles = ["main"]
+        self.current_window_handle = "main"
+        self.pages = {"main": {"url": "about:blank", "title": "", "context": None}}
+        self.jars = {None: []}
+        self.switch_to = FakeSwitch(self)
+        self.switches = 0
+        self.disposed = []
+        self.elementCommands = []
+        self.cdpWindows = []
+
+    @property
+    def current_url(self):
+        return self.pages[self.current_window_handle]["url"]
+
+    @property
+    def title(self):
+        return self.pages[self.current_window_handle]["title"]
+
+    def get(self, url):
+        self.pages[self.current_window_handle].update(url=url, title=url)
+
+    def execute_script(self, script, *args):
+        page = self.pages[self.current_window_handle]
+        if "__automdNavigating = true" in script:
+            page.update(url=args[0], title=f"title of {args[0]}")
+            return None
+        if "__automdNavigating === undefined" in script:
+            return "complete"
+        if script == "document.cookie = 'session=' + arguments[0]":
+            self.jars[page["context"]].append(args[0])
+        if script == "return document.cookie":
+            return ";".join(self.jars[page["context"]])
+        return None
+
+    @property
+    def page_source(self):
+        return f"<html>{self.current_url}</html>"
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.cdpWindows.append((cmd, self.current_window_handle))
+        if cmd == "Target.createBrowserContext":
+            contextId = f"CTX{len(self.jars)}"
+            self.jars[contextId] = []
+            return {"browserContextId": contextId}
+        if cmd == "Target.createTarget":
+            handle = f"T{len(self.window_handles)}"
+            self.window_handles.append(handle)
+            self.pages[handle] = {"url": "about:blank", "title": "", "context": params["browserContextId"]}
+            return {"targetId": handle}
+        if cmd == "Browser.getVersion":
+            return {"userAgent": "Mozilla/5.0 HeadlessChrome"}
+        if cmd == "Target.disposeBrowserContext":
+            self.disposed.append(params["browserContextId"])
+            for handle in [h for h, page in self.pages.items() if page["context"] == params["browserContextId"]]:
+                self.window_handles.remove(handle)
+        return {}
+
+    def find_element(self, by, value):
+        return WebElement(self, f"{self.current_window_handle}:{value}")
+
+    def execute(self, command, params):
+        owner = params["id"].split(":")[0]
+        assert owner == self.current_window_handle, "element used outside its window"
+        self.elementCommands.append((command, params["id"]))
+        return {"value": None}
+
+
+@pytest.fixture
+def session(monkeypatch):
+    browser = FakeChrome()
+    monkeypatch.setattr(DriverPreparation, "_DriverPreparation__initializeDriver",
+                        lambda self: setattr(self, "driver", browser))
+    return DriverPreparation()
+
+
+class Test_browsercontexts:
+
+    def test_contexts_keep_separate_cookies_and_pages(self, session):
+        first, second = session.new_context(), session.new_context()
+        first.navigateTo("https://a.example/")
+        second.navigateTo("https://b.example/")
+        first.execute_script("document.cookie = 'session=' + arguments[0]", "alice")
+        second.execute_script("document.cookie = 'session=' + arguments[0]", "bob")
+        assert first.execute_script("return document.cookie") == "alice"
+        assert second.execute_script("return document.cookie") == "bob"
+        assert first.get_page_title() == "title of https://a.example/"
+        assert session.get_page_title() == session.driver.pages["main"]["title"]
+
+    def test_elements_run_in_the_window_of_their_context(self, session):
+        first, second = session.new_context(), session.new_context()
+        button = first.find_element(("id", "buy"))
+        second.find_element(("id", "other"))
+        first.click_on_element(button)
+        assert session.driver.elementCommands[-1] == ("clickElement", f"{first.handle}:buy")
+
+    def test_threads_can_drive_their_own_contexts(self, session):
+        contexts = [session.new_context() for _ in range(8)]
+        errors = []
+
+        def flow(context, index):
+            try:
+                for step in range(5):
+                    context.navigateTo(f"https://site{index}.example/{step}")
+                    assert context.driver.current_url == f"https://site{index}.example/{step}"
+                    context.click_on_element(context.find_element(("id", "next")))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=flow, args=(context, index)) for index, context in enumerate(contexts)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert errors == []
+
+    def test_reset_disposes_open_contexts(self, session):
+        with session.new_context() as scoped:
+            pass
+        leftover = session.new_context()
+        session.reset()
+        assert session.driver.disposed == [scoped.contextId, leftover.contextId]
+        assert session.driver.window_handles == ["main"] and session.contexts == []
+
+    def test_owner_elements_waits_and_driver_stay_in_its_tab(self, session, tmp_path):
+        context = session.new_context()
+        button = session.find_element(("id", "buy"))
+        context.find_element(("id", "other"))
+        session.click_on_element(button)
+        assert session.driver.elementCommands[-1] == ("clickElement", "main:buy")
+
+        context.find_element(("id", "other"))
+        found = session.waits.until(lambda d: d.find_element("id", "menu"), "menu")
+        found.click()
+        assert session.driver.elementCommands[-1] == ("clickElement", "main:menu")
+
+        context.navigateTo("https://a.example/")
+        assert session.getDriver().current_url == session.driver.pages["main"]["url"] != "https://a.example/"
+
+        context.navigateTo("https://b.example/")
+        session.execute_cdp_cmd("Emulation.setGeolocationOverride", {"latitude": 0, "longitude": 0})
+        assert session.driver.cdpWindows[-1] == ("Emulation.setGeolocationOverride", "main")
+
+        context.navigateTo("https://c.example/")
+        store = ArtifactStore(root=str(tmp_path), codec="none")
+        [dom] = session.capture_artifacts(kinds=("dom",), store=store)
+        store.close()
+        with open(dom.path) as handle:
+            assert handle.read() == f"<html>{session.driver.pages['main']['url']}</html>"
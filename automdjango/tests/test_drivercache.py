@@ -0,0 +1,93 @@
+import os
+import threading
+import pytest
+from automdjango.srcode.drivers import drivercache
+from automdjango.srcode.drivers.drivercache import resolve_chromedriver
+from automdjango.srcode.runtimesettings import reload_settings
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("CHROMEDRIVER_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.delenv("CHROMEDRIVER_OFFLINE", raising=False)
+    reload_settings()
+    return tmp_path
+
+
+def _downloader(tmp_path, calls):
+    def download(major):
+        calls.append(major)
+        source = tmp_path / f"downloaded-{major}"
+        source.write_text("#!/bin/sh\n")
+        return str(source)
+
+    return download
+
+
+class Test_drivercache:
+
+    def test_driver_is_downloaded_once_per_chrome_major(self, cache_dir):
+        calls = []
+        first = resolve_chromedriver("139", downloader=_downloader(cache_dir, calls))
+        second = resolve_chromedriver("139", downloader=_downloader(cache_dir, calls))
+        other = resolve_chromedriver("140", downloader=_downloader(cache_dir, calls))
+        assert first == second
+        assert os.access(first, os.X_OK)
+        assert other != first
+        assert calls == ["139", "140"]
+
+    def test_concurrent_workers_share_one_download(self, cache_dir):
+        calls = []
+        results = []
+        download = _downloader(cache_dir, calls)
+        threads = [
+            threading.Thread(target=lambda: results.append(resolve_chromedriver("139", downloader=download)))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert calls == ["139"]
+        assert len(set(results)) == 1
+
+    def test_offline_mode_never_downloads(self, cache_dir, monkeypatch):
+        monkeypatch.setenv("CHROMEDRIVER_OFFLINE", "1")
+        reload_settings()
+        calls = []
+        with pytest.raises(FileNotFoundError):
+            resolve_chromedriver("139", downloader=_downloader(cache_dir, calls))
+        assert calls == []
+
+    def test_download_requests_the_driver_for_the_chrome_major(self, monkeypatch):
+        from webdriver_manager import chrome
+
+        requested = []
+
+        class FakeManager:
+
+            def __init__(self, driver_version=None):
+                self.driverVersion = driver_version
+
+            def install(self):
+                return f"/wdm/{self.driverVersion}/chromedriver"
+
+        monkeypatch.setattr(chrome, "ChromeDriverManager", FakeManager)
+        monkeypatch.setattr(drivercache, "_latest_release", lambda major: requested.append(major) or f"{major}.0.7258.154")
+        assert drivercache._download("139") == "/wdm/139.0.7258.154/chromedriver"
+        assert requested == ["139"]
+
+    def test_undetected_chrome_bypasses_the_cache(self, cache_dir, monkeypatch):
+        monkeypatch.setattr(drivercache, "detect_chrome_major", lambda chrome_bin=None: None)
+        calls = []
+        path = resolve_chromedriver(downloader=_downloader(cache_dir, calls))
+        assert calls == [None]
+        assert path == str(cache_dir / "downloaded-None")
+        assert not os.path.exists(cache_dir / "cache" / "default")
+
+    def test_detection_uses_the_given_chrome_binary(self, tmp_path):
+        chrome = tmp_path / "chrome-140"
+        chrome.write_text("#!/bin/sh\necho 'Google Chrome 140.0.7339.80'\n")
+        chrome.chmod(0o755)
+        assert drivercache.detect_chrome_major(str(chrome)) == "140"
+        assert drivercache.detect_chrome_major(str(tmp_path / "missing")) is None
@@ -0,0 +1,124 @@
+import pytest
+from selenium.common import WebDriverException
+from automdjango.srcode.drivers.driverpool import DriverPool
+from automdjango.srcode.custom_exceptions.driver_pool_exhausted_exception import DriverPoolExhaustedException
+
+
+class FakeWebDriver:
+
+    def __init__(self):
+        self.current_url = "https://example.test/"
+        self.cookiesDeleted = 0
+        self.healthy = True
+
+    def __getattribute__(self, name):
+        if name == "current_url" and not object.__getattribute__(self, "healthy"):
+            raise WebDriverException("session deleted")
+        return object.__getattribute__(self, name)
+
+    def delete_all_cookies(self):
+        self.cookiesDeleted += 1
+
+    def execute_script(self, script, *args):
+        return None
+
+    def get(self, url):
+        self.current_url = url
+
+
+class FakeDriverPreparation:
+
+    def __init__(self):
+        self.driver = FakeWebDriver()
+        self.quitCalls = 0
+        self.exceeded = []
+
+    def getDriver(self):
+        return self.driver
+
+    def navigateTo(self, url):
+        self.driver.get(url)
+
+    def reset(self, verify=False):
+        self.driver.delete_all_cookies()
+        self.navigateTo("about:blank")
+        return []
+
+    def check_resources(self):
+        return self.exceeded
+
+    def quit(self):
+        self.quitCalls += 1
+
+
+class Test_driverpool:
+
+    def test_release_resets_and_reuses_session(self):
+        pool = DriverPool(size=1, max_uses=10, factory=FakeDriverPreparation)
+        first = pool.acquire()
+        pool.release(first)
+        assert first.getDriver().current_url == "about:blank"
+        assert first.getDriver().cookiesDeleted == 1
+        assert pool.acquire() is first
+        assert pool.stats()["created"] == 1
+
+    def test_session_is_recycled_after_max_uses(self):
+        pool = DriverPool(size=1, max_uses=2, factory=FakeDriverPreparation)
+        first = pool.acquire()
+        pool.release(first)
+        assert pool.acquire() is first
+        pool.release(first)
+        assert first.quitCalls == 1
+        assert pool.acquire() is not first
+        assert pool.stats()["recycled"] == 1
+
+    def test_session_over_resource_limit_is_recycled_on_release(self):
+        pool = DriverPool(size=1, max_uses=10, factory=FakeDriverPreparation)
+        first = pool.acquire()
+        first.exceeded = ["rss 900MB > 512MB"]
+        pool.release(first)
+        assert first.quitCalls == 1
+        assert first.getDriver().cookiesDeleted == 0
+        assert pool.acquire() is not first
+        assert pool.stats()["overLimit"] == 1
+
+    def test_unhealthy_session_is_replaced_on_acquire(self):
+        pool = DriverPool(size=1, factory=FakeDriverPreparation)
+        pool.warm()
+        first = pool.acquire()
+        pool.release(first)
+        first.getDriver().healthy = False
+        second = pool.acquire()
+        assert second is not first
+        assert first.quitCalls == 1
+
+    def test_acquire_times_out_when_pool_is_exhausted(self):
+        pool = DriverPool(size=1, factory=FakeDriverPreparation)
+        pool.acquire()
+        with pytest.raises(DriverPoolExhaustedException):
+            pool.acquire(timeout=0.05)
+
+    def test_pinned_session_does_not_starve_leases(self):
+        pool = DriverPool(size=1, acquire_timeout=0.1, factory=FakeDriverPreparation)
+        pinned = pool.pin()
+        with pool.lease() as leased:
+            assert leased is not pinned
+        assert pool.stats()["size"] == 2
+
+    def test_releasing_the_pinned_session_shrinks_the_pool_back(self):
+        pool = DriverPool(size=1, acquire_timeout=0.1, factory=FakeDriverPreparation)
+        for _ in range(3):
+            pool.release(pool.pin())
+        assert pool.stats()["size"] == 1
+        first = pool.acquire()
+        with pytest.raises(DriverPoolExhaustedException):
+            pool.acquire()
+        pool.release(first)
+
+    def test_close_quits_every_session(self):
+        pool = DriverPool(size=2, factory=FakeDriverPreparation)
+        pool.warm()
+        leased = pool.acquire()
+        pool.close()
+        assert leased.quitCalls == 1
+        pool.release(leased)
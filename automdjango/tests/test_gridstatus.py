@@ -0,0 +1,36 @@
+from automdjango.srcode.drivers.gridstatus import parse_grid_status, status_url
+
+
+def _node(slots, busy, maxSessions=None, availability="UP"):
+    node = {
+        "availability": availability,
+        "slots": [{"session": {"sessionId": str(i)} if i < busy else None} for i in range(slots)],
+    }
+    if maxSessions is not None:
+        node["maxSessions"] = maxSessions
+    return node
+
+
+class Test_gridstatus:
+
+    def test_status_url_strips_hub_path(self):
+        assert status_url("http://selenium:4444/wd/hub") == "http://selenium:4444/status"
+        assert status_url("http://selenium:4444/") == "http://selenium:4444/status"
+
+    def test_parse_counts_free_slots_across_nodes(self):
+        payload = {"value": {"ready": True, "nodes": [_node(4, 1), _node(2, 2), _node(3, 0, availability="DOWN")]}}
+        capacity = parse_grid_status(payload)
+        assert capacity.ready
+        assert capacity.totalSlots == 6
+        assert capacity.freeSlots == 3
+
+    def test_parse_respects_max_sessions(self):
+        capacity = parse_grid_status({"value": {"ready": True, "nodes": [_node(8, 1, maxSessions=2)]}})
+        assert capacity.totalSlots == 2
+        assert capacity.freeSlots == 1
+
+    def test_parse_without_nodes_reports_unknown_capacity(self):
+        capacity = parse_grid_status({"value": {"ready": True, "message": "ChromeDriver ready"}})
+        assert capacity.totalSlots is None
+        assert capacity.freeSlots is None
+
@@ -0,0 +1,88 @@
+import json
+from automdjango.srcode.drivers.harrecorder import HarRecorder, TimingSummary, har_timings
+from automdjango.srcode.drivers.waits import WaitEngine
+
+TIMING = {
+    "requestTime": 100.0, "dnsStart": 1.0, "dnsEnd": 11.0, "connectStart": 11.0, "connectEnd": 41.0,
+    "sslStart": 21.0, "sslEnd": 41.0, "sendStart": 41.5, "sendEnd": 42.0, "receiveHeadersEnd": 142.0,
+}
+
+
+def _entry(method: str, **params) -> dict:
+    return {"message": json.dumps({"message": {"method": method, "params": params}})}
+
+
+def _page_load() -> list:
+    return [
+        _entry("Network.requestWillBeSent", requestId="1", wallTime=1700000000.0, type="Document",
+               request={"url": "https://example.com/", "method": "GET", "headers": {"Accept": "*/*"}}),
+        _entry("Network.responseReceived", requestId="1", type="Document",
+               response={"status": 200, "statusText": "OK", "protocol": "h2", "mimeType": "text/html",
+                         "headers": {}, "timing": TIMING}),
+        _entry("Network.dataReceived", requestId="1", dataLength=5000),
+        _entry("Network.requestWillBeSent", requestId="2", wallTime=1700000000.1, type="Image",
+               request={"url": "https://example.com/a.png", "method": "GET"}),
+        _entry("Network.loadingFinished", requestId="1", timestamp=100.2, encodedDataLength=1200),
+        _entry("Network.loadingFailed", requestId="2", timestamp=100.21, errorText="net::ERR_BLOCKED_BY_CLIENT",
+               blockedReason="inspector", type="Image"),
+    ]
+
+
+class Test_harrecorder:
+
+    def test_timings_split_dns_connect_ttfb_and_download(self):
+        timings = har_timings(TIMING, finishedAt=100.2)
+        assert timings["dns"] == 10.0
+        assert timings["connect"] == 30.0
+        assert timings["ssl"] == 20.0
+        assert timings["wait"] == 100.0
+        assert timings["receive"] == 58.0
+        assert har_timings(None)["dns"] == -1
+
+    def test_entries_stream_to_a_valid_har_document(self, tmp_path):
+        path = str(tmp_path / "session.har")
+        recorder = HarRecorder(path)
+        recorder.start_page("https://example.com/")
+        recorder.observe(_page_load()[:5])
+        with open(path) as handle:
+            assert '"https://example.com/"' in handle.read()  # written before close
+        recorder.observe(_page_load()[5:])
+        summary = recorder.close()
+
+        with open(path) as handle:
+            har = json.load(handle)["log"]
+        assert [entry["request"]["url"] for entry in har["entries"]] == ["https://example.com/", "https://example.com/a.png"]
+        assert har["entries"][0]["pageref"] == har["pages"][0]["id"] == "page_1"
+        assert har["entries"][0]["response"]["status"] == 200
+        assert har["entries"][1]["_blockedReason"] == "inspector"
+        assert summary["requests"] == 2 and summary["blocked"] == 1
+        assert summary["transferredBytes"] == 1200
+        assert summary["phasesMs"]["ttfb"]["p95"] == 100.0
+        with open(path + ".summary.json") as handle:
+            assert json.load(handle) == summary
+
+    def test_summary_percentiles_match_the_results_api(self):
+        summary = TimingSummary()
+        for milliseconds in (40.0, 10.0, 30.0, 20.0):
+            timings = {"dns": -1, "connect": -1, "ssl": -1, "wait": milliseconds, "receive": 1.0}
+            summary.add({"request": {"url": "https://example.com/"}, "response": {}, "timings": timings, "time": milliseconds})
+        ttfb = summary.as_dict()["phasesMs"]["ttfb"]
+        # interpolated like percentile_cont, not the nearest sample
+        assert (ttfb["p50"], ttfb["p95"]) == (25.0, 38.5)
+
+    def test_ndjson_writes_one_entry_per_line(self, tmp_path):
+        path = str(tmp_path / "session.ndjson")
+        recorder = HarRecorder(path, format="ndjson")
+        recorder.observe(_page_load())
+        recorder.observe([_entry("Network.requestWillBeSent", requestId="3", wallTime=1.0, request={"url": "x"})])
+        recorder.close()
+        with open(path) as handle:
+            lines = [json.loads(line) for line in handle]
+        assert len(lines) == 3 and lines[2]["_error"] == "unfinished"
+
+    def test_wait_engine_forwards_performance_log_batches(self):
+        received = []
+        waits = WaitEngine(driver=None, timeout=1)
+        waits.networkListeners.append(received.append)
+        waits.observe_network_events(_page_load())
+        assert len(received) == 1 and len(received[0]) == 6
@@ -0,0 +1,173 @@
+import os
+import ssl
+import json
+import shutil
+import threading
+import http.client
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from automdjango.srcode.drivers.httpcache import CacheProxy, CachedResponse, HttpCache, tls_context
+from automdjango.srcode.runtimesettings import load_settings
+
+
+class FakeOrigin:
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, method, url, headers, body):
+        self.calls.append((method, url))
+        return CachedResponse(200, "OK", [["Content-Type", "text/html"]], b"<html>same</html>")
+
+
+class _Origin(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    hits = 0
+
+    def do_GET(self):
+        type(self).hits += 1
+        body = f"page {self.path}".encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Connection", "keep-alive")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def origin():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Origin)
+    _Origin.hits = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _get(proxy, url):
+    opener = urllib.request.build_opener(urllib.request.ProxyHandler({"http": proxy.url}))
+    try:
+        with opener.open(url, timeout=10) as response:
+            return response.status, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read()
+
+
+class Test_httpcache:
+
+    def test_record_then_replay_without_the_network(self, tmp_path):
+        origin = FakeOrigin()
+        recorder = HttpCache(str(tmp_path), "record", fetch=origin)
+        assert recorder.handle("GET", "https://example.test/", []).status == 200
+        assert recorder.handle("GET", "https://example.test/", []).body == b"<html>same</html>"
+        recorder.save()
+        assert len(origin.calls) == 1
+
+        offline = FakeOrigin()
+        replay = HttpCache(str(tmp_path), "replay", fetch=offline)
+        assert replay.handle("GET", "https://example.test/", []).body == b"<html>same</html>"
+        assert replay.handle("GET", "https://example.test/missing", []).status == 504
+        assert offline.calls == []
+        report = replay.report()
+        assert (report["hit"], report["miss"], report["misses"]) == (1, 1, ["https://example.test/missing"])
+
+    def test_identical_bodies_are_stored_once(self, tmp_path):
+        cache = HttpCache(str(tmp_path), "record", fetch=FakeOrigin())
+        cache.handle("GET", "https://example.test/a", [])
+        cache.handle("GET", "https://example.test/b", [])
+        cache.save()
+        bodies = [name for _, _, names in os.walk(tmp_path / "bodies") for name in names]
+        assert len(bodies) == 1
+        with open(tmp_path / "index.json") as handle:
+            assert len(json.load(handle)) == 2
+
+    def test_entries_reach_the_index_as_they_are_recorded(self, tmp_path):
+        recorder = HttpCache(str(tmp_path), "record", fetch=FakeOrigin())
+        recorder.handle("GET", "https://example.test/a", [])
+        # no save(): a worker killed here still leaves its recording usable
+        replay = HttpCache(str(tmp_path), "replay", fetch=FakeOrigin())
+        assert replay.handle("GET", "https://example.test/a", []).status == 200
+        recorder.handle("GET", "https://example.test/b", [])
+        recorder.save()
+        assert not (tmp_path / "index.jsonl").exists()
+        with open(tmp_path / "index.json") as handle:
+            assert len(json.load(handle)) == 2
+
+    def test_passthrough_always_fetches_and_reports_would_be_hits(self, tmp_path):
+        recorder = HttpCache(str(tmp_path), "record", fetch=FakeOrigin())
+        recorder.handle("GET", "https://example.test/", [])
+        recorder.save()
+        origin = FakeOrigin()
+        cache = HttpCache(str(tmp_path), "passthrough", fetch=origin)
+        cache.handle("GET", "https://example.test/", [])
+        cache.handle("GET", "https://example.test/other", [])
+        report = cache.report()
+        assert (report["hit"], report["miss"], report["stored"]) == (1, 1, 0)
+        assert len(origin.calls) == 2
+
+    def test_post_bodies_are_part_of_the_key(self, tmp_path):
+        origin = FakeOrigin()
+        cache = HttpCache(str(tmp_path), "record", fetch=origin)
+        cache.handle("POST", "https://example.test/search", [], b"q=1")
+        cache.handle("POST", "https://example.test/search", [], b"q=2")
+        cache.handle("POST", "https://example.test/search", [], b"q=1")
+        assert len(origin.calls) == 2
+
+    def test_proxy_records_and_replays_plain_http(self, tmp_path, origin):
+        recorder = CacheProxy(HttpCache(str(tmp_path), "record")).start()
+        try:
+            assert _get(recorder, f"{origin}/home") == (200, b"page /home")
+        finally:
+            assert recorder.stop()["stored"] == 1
+        replay = CacheProxy(HttpCache(str(tmp_path), "replay")).start()
+        try:
+            assert _get(replay, f"{origin}/home") == (200, b"page /home")
+            assert _get(replay, f"{origin}/other")[0] == 504
+        finally:
+            replay.stop()
+        assert _Origin.hits == 1
+
+    def test_chunked_request_bodies_are_read_off_keep_alive_connections(self, tmp_path):
+        bodies = []
+
+        def fetch(method, url, headers, body):
+            bodies.append(body)
+            return CachedResponse(200, "OK", [], b"ok")
+
+        proxy = CacheProxy(HttpCache(str(tmp_path), "record", fetch=fetch)).start()
+        try:
+            connection = http.client.HTTPConnection(*proxy.server.server_address, timeout=10)
+            connection.request("POST", "http://example.test/search", iter([b"q=", b"chunked"]),
+                               encode_chunked=True)
+            assert connection.getresponse().read() == b"ok"
+            connection.request("GET", "http://example.test/next")
+            assert connection.getresponse().read() == b"ok"
+            connection.close()
+        finally:
+            proxy.stop()
+        assert bodies == [b"q=chunked", b""]
+
+    @pytest.mark.skipif(shutil.which("openssl") is None, reason="needs openssl")
+    def test_https_is_intercepted_inside_connect_tunnels(self, tmp_path):
+        origin = FakeOrigin()
+        proxy = CacheProxy(HttpCache(str(tmp_path), "record", fetch=origin), tlsContext=tls_context(str(tmp_path))).start()
+        try:
+            host, port = proxy.server.server_address
+            connection = http.client.HTTPSConnection(host, port, context=ssl._create_unverified_context())
+            connection.set_tunnel("example.test", 443)
+            for _ in range(2):
+                connection.request("GET", "/search?q=1")
+                assert connection.getresponse().read() == b"<html>same</html>"
+            connection.close()
+        finally:
+            report = proxy.stop()
+        assert origin.calls == [("GET", "https://example.test/search?q=1")]
+        assert (report["hit"], report["miss"]) == (1, 1)
+
+    def test_mode_is_validated(self):
+        with pytest.raises(Exception, match="HTTP_CACHE_MODE"):
+            load_settings({"HTTP_CACHE_MODE": "sometimes"})
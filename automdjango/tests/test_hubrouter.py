@@ -0,0 +1,167 @@
+import asyncio
+import pytest
+from selenium.common import SessionNotCreatedException, WebDriverException
+from automdjango.srcode.drivers.gridstatus import GridCapacity
+from automdjango.srcode.drivers.hubrouter import HubRouter, get_hub_router
+from automdjango.srcode.drivers.instrumentation import metrics
+from automdjango.srcode.runtimesettings import load_settings
+
+HUB_A = "http://grid-a:4444/wd/hub"
+HUB_B = "http://grid-b:4444/wd/hub"
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def _router(free, settings=None, clock=None):
+    """A router over HUB_A/HUB_B whose /status reports ``free[url]`` free slots (None = unreachable)."""
+    clock = clock or FakeClock()
+    capacity = lambda url: None if free[url] is None else GridCapacity(True, 4, free[url])
+    return HubRouter([HUB_A, HUB_B], settings or load_settings({}), capacity, clock, clock.sleep)
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    metrics.reset()
+    yield
+
+
+class Test_hubrouter:
+
+    def test_remote_urls_split_on_commas(self):
+        settings = load_settings({"SELENIUM_REMOTE_URL": f"{HUB_A}, {HUB_B}"})
+        assert settings.remoteUrls == (HUB_A, HUB_B)
+        assert load_settings({}).remoteUrls == ()
+
+    def test_chooses_the_hub_with_most_free_slots(self):
+        router = _router({HUB_A: 1, HUB_B: 3})
+        assert router.choose() == HUB_B
+
+    def test_sessions_being_created_count_against_free_slots(self):
+        router = _router({HUB_A: 2, HUB_B: 3})
+        assert [router.choose() for _ in range(5)] == [HUB_B, HUB_A, HUB_B, HUB_A, HUB_B]
+        assert router.choose() is None
+
+    def test_slow_creation_is_penalized(self):
+        router = _router({HUB_A: 2, HUB_B: 2})
+        router.release(router.choose(), seconds=0.5)
+        assert router.hubs[HUB_A].createSeconds == 0.5
+        for _ in range(3):
+            url = router.choose()
+            router.release(url, seconds=8.0 if url == HUB_A else 0.5)
+        assert router.hubs[HUB_A].createSeconds > router.hubs[HUB_B].createSeconds
+        assert router.choose() == HUB_B
+
+    def test_failed_creation_retries_on_another_hub(self):
+        router = _router({HUB_A: 3, HUB_B: 1})
+        attempts = []
+
+        def factory(url):
+            attempts.append(url)
+            if url == HUB_A:
+                raise WebDriverException("connection refused")
+            return "session"
+
+        assert router.create_session(factory) == ("session", HUB_B)
+        assert attempts == [HUB_A, HUB_B]
+        assert router.hubs[HUB_A].consecutiveFailures == 1
+        assert metrics.counter("automdjango_grid_session_failures_total", {"hub": HUB_A, "reason": "error"}) == 1
+
+    def test_breaker_opens_and_half_opens_after_cooldown(self):
+        clock = FakeClock()
+        settings = load_settings({"GRID_BREAKER_FAILURES": "2", "GRID_BREAKER_COOLDOWN": "30"})
+        router = _router({HUB_A: 3, HUB_B: 1}, settings, clock)
+        for _ in range(2):
+            router.release(router.choose(avoid={HUB_B}), error=WebDriverException("down"))
+        assert router.hubs[HUB_A].breaker(clock()) == "open"
+        assert metrics.gauge("automdjango_grid_breaker_open", {"hub": HUB_A}) == 1
+        assert router.choose() == HUB_B
+
+        clock.now += 31
+        assert router.choose() == HUB_A
+        # only one trial session while half-open
+        assert router.choose() != HUB_A
+        router.release(HUB_A, seconds=1.0)
+        assert router.hubs[HUB_A].breaker(clock()) == "closed"
+        assert metrics.gauge("automdjango_grid_breaker_open", {"hub": HUB_A}) == 0
+
+    def test_busy_refusals_do_not_trip_the_breaker(self):
+        router = _router({HUB_A: 1, HUB_B: 0}, load_settings({"GRID_BREAKER_FAILURES": "1"}))
+        router.release(router.choose(), error=SessionNotCreatedException("no free slot"))
+        assert router.hubs[HUB_A].breaker(0) == "closed"
+
+    def test_gives_up_once_every_breaker_is_open(self):
+        router = _router({HUB_A: 1, HUB_B: 1}, load_settings({"GRID_BREAKER_FAILURES": "1"}))
+
+        def factory(url):
+            raise WebDriverException(f"{url} is down")
+
+        with pytest.raises(WebDriverException):
+            router.create_session(factory)
+        assert router.all_open()
+
+    def test_waits_for_a_free_slot(self):
+        clock = FakeClock()
+        free = {HUB_A: 0, HUB_B: 0}
+        router = _router(free, clock=clock)
+        original = clock.sleep
+
+        def sleep(seconds):
+            original(seconds)
+            free[HUB_B] = 1
+
+        router._sleep = sleep
+        assert router.create_session(lambda url: url) == (HUB_B, HUB_B)
+        assert clock.now > 1000.0
+
+    def test_without_waiting_tries_a_hub_anyway(self):
+        router = _router({HUB_A: 0, HUB_B: None})
+        router.hubs[HUB_B].capacity = GridCapacity(False, None, None)
+        session, url = router.create_session(lambda url: "session", waitForSlot=False)
+        assert session == "session"
+        assert router.hubs[url].creating == 0
+
+    def test_unreachable_status_is_a_last_resort_and_a_failure(self):
+        router = _router({HUB_A: None, HUB_B: 1}, load_settings({"GRID_BREAKER_FAILURES": "2"}))
+        assert router.choose() == HUB_B
+        assert router.hubs[HUB_A].consecutiveFailures == 1
+        router.release(HUB_B, seconds=1.0)
+        router.hubs[HUB_B].creating = 1
+        # HUB_B's only slot is taken and HUB_A's breaker opened on the second failed read
+        assert router.choose() is None
+        assert router.hubs[HUB_A].breaker(router._clock()) == "open"
+        assert metrics.gauge("automdjango_grid_breaker_open", {"hub": HUB_A}) == 1
+
+    def test_hubs_without_readable_status_are_tried_without_waiting(self):
+        clock = FakeClock()
+        router = HubRouter([HUB_A], load_settings({}), lambda url: None, clock, clock.sleep)
+        assert router.create_session(lambda url: "session") == ("session", HUB_A)
+        assert clock.now == 1000.0
+
+    def test_async_creation_retries_on_another_hub(self):
+        router = _router({HUB_A: 3, HUB_B: 1})
+        attempts = []
+
+        async def factory(url):
+            attempts.append(url)
+            if url == HUB_A:
+                raise ConnectionRefusedError("connection refused")
+            return "session"
+
+        assert asyncio.run(router.create_session_async(factory)) == ("session", HUB_B)
+        assert attempts == [HUB_A, HUB_B]
+        assert router.hubs[HUB_A].consecutiveFailures == 1 and router.hubs[HUB_A].creating == 0
+
+    def test_router_is_shared_per_hub_list(self):
+        settings = load_settings({"SELENIUM_REMOTE_URL": f"{HUB_A},{HUB_B}"})
+        assert get_hub_router(settings) is get_hub_router(settings)
+        assert list(get_hub_router(settings).hubs) == [HUB_A, HUB_B]
@@ -0,0 +1,86 @@
+import os
+import sys
+import json
+import logging
+import subprocess
+import pytest
+from automdjango.srcode.drivers.instrumentation import (
+    MetricsRegistry,
+    StartupProfiler,
+    metrics,
+    percentile,
+    timed_command,
+)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+class Test_instrumentation:
+
+    def test_prometheus_histogram_is_cumulative(self):
+        registry = MetricsRegistry()
+        for value in (0.003, 0.2, 7):
+            registry.observe("op_seconds", value, {"command": "navigateTo"}, help="latency")
+        registry.inc("op_errors_total", {"command": "navigateTo"})
+        text = registry.render_prometheus()
+        assert "# TYPE op_seconds histogram" in text
+        assert 'op_seconds_bucket{command="navigateTo",le="0.005"} 1' in text
+        assert 'op_seconds_bucket{command="navigateTo",le="0.25"} 2' in text
+        assert 'op_seconds_bucket{command="navigateTo",le="+Inf"} 3' in text
+        assert 'op_seconds_count{command="navigateTo"} 3' in text
+        assert 'op_errors_total{command="navigateTo"} 1' in text
+
+    def test_gauges_render_last_value_and_can_be_removed(self):
+        registry = MetricsRegistry()
+        registry.set_gauge("heap_bytes", 10, {"session": "a"}, help="heap")
+        registry.set_gauge("heap_bytes", 25, {"session": "a"})
+        registry.set_gauge("heap_bytes", 5, {"session": "b"})
+        registry.remove_gauge("heap_bytes", {"session": "b"})
+        text = registry.render_prometheus()
+        assert "# TYPE heap_bytes gauge" in text
+        assert 'heap_bytes{session="a"} 25' in text
+        assert 'session="b"' not in text
+        assert registry.gauge("heap_bytes", {"session": "a"}) == 25
+
+    def test_timed_command_records_latency_and_failures(self):
+        @timed_command("find_element")
+        def find(fail):
+            if fail:
+                raise RuntimeError("boom")
+            return "element"
+
+        assert find(False) == "element"
+        with pytest.raises(RuntimeError):
+            find(True)
+        assert metrics.histogram("automdjango_driver_command_seconds", {"command": "find_element"}).count == 2
+        assert metrics.counter("automdjango_driver_command_errors_total", {"command": "find_element"}) == 1
+
+    def test_startup_profiler_logs_phases_as_json(self, caplog):
+        profiler = StartupProfiler()
+        with profiler.phase("options"):
+            pass
+        with caplog.at_level(logging.INFO, logger="automdjango.timings"):
+            report = profiler.finish()
+        assert set(report["phases"]) == {"options"}
+        assert json.loads(caplog.records[-1].getMessage())["event"] == "driver_startup"
+        assert metrics.histogram("automdjango_driver_startup_phase_seconds", {"phase": "options"}).count == 1
+
+    def test_percentile_interpolates_like_percentile_cont(self):
+        assert percentile([1.0, 2.0, 3.0, 4.0], 0.5) == 2.5
+        assert percentile([], 0.95) is None
+
+    def test_exit_hook_does_not_resolve_settings(self):
+        probe = (
+            "import automdjango.srcode.drivers.instrumentation as i, automdjango.srcode.runtimesettings as r\n"
+            "r.load_settings = lambda environ=None: (_ for _ in ()).throw(RuntimeError('settings resolved at exit'))\n"
+        )
+        completed = subprocess.run([sys.executable, "-c", probe], cwd=ROOT, capture_output=True, text=True, timeout=60)
+        assert completed.returncode == 0, completed.stderr
+        assert "settings resolved at exit" not in completed.stderr
@@ -0,0 +1,74 @@
+import json
+import pytest
+from selenium import webdriver
+from automdjango.srcode.drivers.loadprofile import (
+    apply_to_options,
+    apply_to_session,
+    resolve_load_profile,
+    summarize_network_events,
+)
+from automdjango.srcode.runtimesettings import reload_settings
+
+
+def _event(method, **params):
+    return {"message": json.dumps({"message": {"method": method, "params": params}})}
+
+
+@pytest.fixture(autouse=True)
+def clean_env(monkeypatch):
+    for name in ("LOAD_PROFILE", "LOAD_BLOCK_PATTERNS", "LOAD_ALLOW_PATTERNS", "PAGE_LOAD_STRATEGY"):
+        monkeypatch.delenv(name, raising=False)
+    reload_settings()
+
+
+class Test_loadprofile:
+
+    def test_full_profile_blocks_nothing(self):
+        calls = []
+        profile = resolve_load_profile()
+        apply_to_session(profile, lambda cmd, params: calls.append(cmd))
+        assert profile.pageLoadStrategy == "normal"
+        assert calls == []
+
+    def test_dom_only_blocks_media_and_loads_eagerly(self):
+        profile = resolve_load_profile("dom-only")
+        options = webdriver.ChromeOptions()
+        apply_to_options(profile, options)
+        calls = []
+        apply_to_session(profile, lambda cmd, params: calls.append((cmd, params)))
+        assert options.to_capabilities()["pageLoadStrategy"] == "eager"
+        assert calls[-1][0] == "Network.setBlockedURLs"
+        assert "*.png" in calls[-1][1]["urls"]
+
+    def test_env_overlays_extend_and_exempt_patterns(self, monkeypatch):
+        monkeypatch.setenv("LOAD_PROFILE", "no-media")
+        monkeypatch.setenv("LOAD_BLOCK_PATTERNS", "*ads.example*, *.css")
+        monkeypatch.setenv("LOAD_ALLOW_PATTERNS", "*.svg")
+        monkeypatch.setenv("PAGE_LOAD_STRATEGY", "none")
+        reload_settings()
+        profile = resolve_load_profile()
+        assert "*ads.example*" in profile.blockedPatterns
+        assert "*.svg" not in profile.blockedPatterns
+        assert profile.pageLoadStrategy == "none"
+
+    def test_unknown_profile_is_rejected(self):
+        with pytest.raises(ValueError):
+            resolve_load_profile("text-only")
+
+    def test_navigation_report_counts_blocked_requests_and_bytes(self):
+        report = summarize_network_events(
+            "https://example.test/",
+            [
+                _event("Network.requestWillBeSent", requestId="1"),
+                _event("Network.loadingFinished", requestId="1", encodedDataLength=5120),
+                _event("Network.loadingFailed", requestId="2", type="Image", blockedReason="inspector"),
+                _event("Network.loadingFailed", requestId="3", type="Font", blockedReason="inspector"),
+            ],
+        )
+        assert report.as_dict() == {
+            "url": "https://example.test/",
+            "requests": 1,
+            "blockedRequests": 2,
+            "blockedByType": {"Image": 1, "Font": 1},
+            "transferredBytes": 5120,
+        }
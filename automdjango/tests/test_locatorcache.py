@@ -0,0 +1,63 @@
+from selenium.common import StaleElementReferenceException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webelement import WebElement
+from automdjango.srcode.drivers.locatorcache import LocatorCache
+
+
+class FakeWebDriver:
+
+    def __init__(self):
+        self.finds = 0
+        self.staleIds = set()
+        self.commands = []
+
+    def find_element(self, by, value):
+        self.finds += 1
+        return WebElement(self, f"element-{self.finds}")
+
+    def execute(self, command, params):
+        if params["id"] in self.staleIds:
+            raise StaleElementReferenceException("element is not attached to the page document")
+        self.commands.append((command, params["id"]))
+        return {"value": None}
+
+
+class Test_locatorcache:
+
+    searchBox = (By.ID, "APjFqb")
+
+    def test_repeated_lookups_hit_the_cache(self):
+        driver = FakeWebDriver()
+        cache = LocatorCache(driver)
+        cache.invalidate("https://example.test/")
+        first = cache.find(self.searchBox)
+        assert cache.find(self.searchBox) is first
+        assert driver.finds == 1
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_navigation_invalidates_cached_elements(self):
+        driver = FakeWebDriver()
+        cache = LocatorCache(driver)
+        cache.invalidate("https://example.test/")
+        first = cache.find(self.searchBox)
+        cache.invalidate("https://example.test/other")
+        assert cache.find(self.searchBox) is not first
+        assert driver.finds == 2
+
+    def test_stale_element_is_resolved_again_transparently(self):
+        driver = FakeWebDriver()
+        cache = LocatorCache(driver)
+        element = cache.find(self.searchBox)
+        driver.staleIds.add("element-1")
+        element.click()
+        assert driver.commands[-1][1] == "element-2"
+        assert element.id == "element-2"
+        assert cache.stats()["refreshes"] == 1
+
+    def test_remembered_elements_are_served_without_another_find(self):
+        driver = FakeWebDriver()
+        cache = LocatorCache(driver)
+        remembered = cache.remember(self.searchBox, WebElement(driver, "element-0"))
+        assert cache.find(self.searchBox) is remembered
+        assert driver.finds == 0
@@ -0,0 +1,124 @@
+import pytest
+from selenium.common import NoSuchElementException
+from selenium.webdriver.common.by import By
+from automdjango.srcode.pages.base_page import BasePage, Element
+from automdjango.srcode.pages.main_page import MainPage
+
+
+class FakeWaits:
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.calls = []
+
+    def presence(self, locator, timeout=None):
+        self.calls.append(("presence", locator))
+        return self.driver.find_element(*locator)
+
+    def clickable(self, locator, timeout=None):
+        self.calls.append(("clickable", locator))
+        return self.driver.find_element(*locator)
+
+    def until(self, condition, name="condition", timeout=None, message=""):
+        self.calls.append(("until", name))
+        return condition(self.driver)
+
+    def title_contains(self, text, timeout=None):
+        return text
+
+
+class FakeElement:
+
+    def __init__(self, locator):
+        self.locator = locator
+        self.keys = []
+
+    def send_keys(self, *keys):
+        self.keys.extend(keys)
+
+    def is_displayed(self):
+        return True
+
+
+class FakeWebDriver:
+
+    def __init__(self, missing=()):
+        self.finds = []
+        self.scripts = []
+        self.missing = list(missing)
+
+    def find_element(self, by, value):
+        self.finds.append((by, value))
+        return FakeElement((by, value))
+
+    def find_elements(self, by, value):
+        self.finds.append((by, value))
+        return [FakeElement((by, value)), FakeElement((by, value))]
+
+    def execute_script(self, script, fields):
+        self.scripts.append(fields)
+        return self.missing
+
+
+class FakeSession:
+
+    def __init__(self, missing=()):
+        self.driver = FakeWebDriver(missing)
+        self.waits = FakeWaits(self.driver)
+        self.locatorCache = None
+
+    def getDriver(self):
+        return self.driver
+
+
+class LoginPage(BasePage):
+
+    username = Element(By.NAME, "user")
+    password = Element((By.CSS_SELECTOR, "input[type=password]"), wait="visible")
+    rows = Element(By.CSS_SELECTOR, "tr", many=True)
+
+
+class Test_pages:
+
+    def test_elements_resolve_lazily_once_per_page_instance(self):
+        session = FakeSession()
+        page = LoginPage(session)
+        assert session.driver.finds == []
+        assert page.username is page.username
+        assert session.driver.finds == [(By.NAME, "user")]
+        assert session.waits.calls == [("presence", (By.NAME, "user"))]
+        assert LoginPage(session).username is not page.username
+        page.reset()
+        page.username
+        assert len(session.driver.finds) == 3
+
+    def test_visible_and_many_elements_wait_through_until(self):
+        session = FakeSession()
+        page = LoginPage(session)
+        assert page.password.locator == (By.CSS_SELECTOR, "input[type=password]")
+        assert len(page.rows) == 2
+        assert [call for call in session.waits.calls] == [("until", "visible password"), ("until", "elements rows")]
+
+    def test_fill_form_sets_every_field_in_one_script_call(self):
+        session = FakeSession()
+        LoginPage(session).fill_form({"username": "ann", "password": "secret", (By.ID, "remember"): True})
+        [fields] = session.driver.scripts
+        assert fields == [
+            {"using": "css", "value": '[name="user"]', "text": "ann"},
+            {"using": "css", "value": "input[type=password]", "text": "secret"},
+            {"using": "css", "value": '[id="remember"]', "text": True},
+        ]
+
+    def test_fill_form_reports_missing_fields(self):
+        page = LoginPage(FakeSession(missing=[1]))
+        with pytest.raises(NoSuchElementException, match="password"):
+            page.fill_form({"username": "ann", "password": "secret"})
+        with pytest.raises(KeyError):
+            page.fill_form({"nickname": "ann"})
+
+    def test_main_page_types_the_query_into_the_clickable_search_box(self):
+        session = FakeSession()
+        page = MainPage(session)
+        page.getQueryField()
+        assert page.searchBox.keys[0] == "java"
+        assert session.waits.calls == [("clickable", (By.ID, "APjFqb"))]
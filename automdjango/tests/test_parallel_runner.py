@@ -0,0 +1,32 @@
+import pytest
+from automdjango.srcode.drivers import gridstatus
+from automdjango.srcode.drivers.gridstatus import GridCapacity
+from automdjango.srcode.plugins.parallel_runner import merge_exit_codes, parse_shard, resolve_worker_count, shard_items
+from automdjango.srcode.runtimesettings import reload_settings
+
+
+class Test_parallel_runner:
+
+    def test_shards_cover_every_item_once(self):
+        items = list(range(10))
+        shards = [shard_items(items, index, 3)[0] for index in range(3)]
+        assert sorted(sum(shards, [])) == items
+        assert shards[0] == [0, 3, 6, 9]
+
+    def test_parse_shard_rejects_out_of_range_index(self):
+        assert parse_shard("1/4") == (1, 4)
+        with pytest.raises(ValueError):
+            parse_shard("4/4")
+
+    def test_worker_count_is_capped_by_grid_capacity(self, monkeypatch):
+        monkeypatch.setenv("SELENIUM_REMOTE_URL", "http://selenium:4444/wd/hub")
+        reload_settings()
+        monkeypatch.setattr(gridstatus, "fetch_grid_capacity", lambda url: GridCapacity(True, 3, 3))
+        assert resolve_worker_count("8") == 3
+        assert resolve_worker_count("auto") == 3
+        assert resolve_worker_count("2") == 2
+
+    def test_merge_exit_codes(self):
+        assert merge_exit_codes([0, 5]) == pytest.ExitCode.OK
+        assert merge_exit_codes([0, 1, 5]) == 1
+        assert merge_exit_codes([5, 5]) == pytest.ExitCode.NO_TESTS_COLLECTED
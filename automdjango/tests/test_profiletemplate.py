@@ -0,0 +1,43 @@
+import os
+from automdjango.srcode.drivers.profiletemplate import PRIMED_MARKER, ProfileReaper, clone_profile, ensure_template
+
+
+def _primer(calls):
+    def prime(path):
+        calls.append(path)
+        os.makedirs(os.path.join(path, "Default", "Cache"))
+        with open(os.path.join(path, "Default", "Preferences"), "w") as handle:
+            handle.write("{}")
+        with open(os.path.join(path, "Local State"), "w") as handle:
+            handle.write("{}")
+
+    return prime
+
+
+class Test_profiletemplate:
+
+    def test_template_is_primed_once_without_disposable_caches(self, tmp_path):
+        calls = []
+        template = str(tmp_path / "template")
+        ensure_template(template, _primer(calls))
+        ensure_template(template, _primer(calls))
+        assert calls == [template]
+        assert os.path.exists(os.path.join(template, "Default", "Preferences"))
+        assert not os.path.exists(os.path.join(template, "Default", "Cache"))
+
+    def test_clones_are_independent_copies(self, tmp_path):
+        template = ensure_template(str(tmp_path / "template"), _primer([]))
+        clone = clone_profile(template, root=str(tmp_path))
+        with open(os.path.join(clone, "Default", "Preferences"), "w") as handle:
+            handle.write('{"changed": true}')
+        with open(os.path.join(template, "Default", "Preferences")) as handle:
+            assert handle.read() == "{}"
+        assert not os.path.exists(os.path.join(clone, PRIMED_MARKER))
+
+    def test_reaper_removes_profiles_in_the_background(self, tmp_path):
+        profile = tmp_path / "profile"
+        (profile / "Default").mkdir(parents=True)
+        reaper = ProfileReaper()
+        reaper.discard(str(profile))
+        reaper.drain()
+        assert not profile.exists()
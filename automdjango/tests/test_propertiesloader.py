@@ -0,0 +1,56 @@
+import os
+import dataclasses
+import pytest
+import propertiesloader
+from propertiesloader import PropertiesLoader, load_config
+
+CONFIG = """[details]
+browserName:chrome
+protocol:https://
+url:www.google.com.sa
+path:/
+
+[staging]
+url:staging.example.test
+"""
+
+
+@pytest.fixture
+def config_file(tmp_path, monkeypatch):
+    path = tmp_path / "configinfo.properties"
+    path.write_text(CONFIG)
+    monkeypatch.setenv("AUTOMD_CONFIG", str(path))
+    for name in ("AUTOMD_ENV", "AUTOMD_BROWSERNAME", "AUTOMD_PROTOCOL", "AUTOMD_URL", "AUTOMD_PATH"):
+        monkeypatch.delenv(name, raising=False)
+    return path
+
+
+class Test_propertiesloader:
+
+    def test_config_is_parsed_once_and_frozen(self, config_file, monkeypatch):
+        first = load_config()
+        monkeypatch.setattr(propertiesloader, "_parse", lambda path, environment: pytest.fail("re-parsed"))
+        assert load_config() is first
+        assert PropertiesLoader().getWebsite() == "https://www.google.com.sa/"
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            first.url = "elsewhere"
+
+    def test_changed_file_is_reloaded(self, config_file):
+        first = load_config()
+        config_file.write_text(CONFIG.replace("www.google.com.sa", "www.google.com"))
+        stat = os.stat(config_file)
+        os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert load_config().url == "www.google.com"
+        assert first.url == "www.google.com.sa"
+
+    def test_environment_section_and_env_overlay(self, config_file, monkeypatch):
+        monkeypatch.setenv("AUTOMD_ENV", "staging")
+        assert load_config().website == "https://staging.example.test/"
+        monkeypatch.setenv("AUTOMD_PATH", "/search")
+        loader = PropertiesLoader()
+        assert loader.getWebsite() == "https://staging.example.test/search"
+        assert loader.getProperty("details", "browserName") == "chrome"
+
+    def test_unknown_environment_is_rejected(self, config_file):
+        with pytest.raises(KeyError):
+            load_config("production")
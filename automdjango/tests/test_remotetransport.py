@@ -0,0 +1,188 @@
+import gzip
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+import urllib3
+from selenium import webdriver
+from automdjango.srcode.drivers.backends import RemoteBackend
+from automdjango.srcode.drivers.driverpreparation import DriverPreparation
+from automdjango.srcode.drivers.instrumentation import StartupProfiler, metrics
+from automdjango.srcode.drivers.remotetransport import PooledRemoteConnection, RemoteTransport
+from automdjango.srcode.runtimesettings import load_settings
+
+
+class FakeHub:
+    """A W3C endpoint on localhost that counts TCP connections and can gzip or stall responses."""
+
+    def __init__(self, delay: float = 0):
+        hub = self
+        self.delay = delay
+        self.connections = set()
+        self.acceptEncodings = []
+        self.sessions = 0
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_POST(self):
+                self.__respond()
+
+            def do_GET(self):
+                self.__respond()
+
+            def do_DELETE(self):
+                self.__respond()
+
+            def __respond(self):
+                hub.connections.add(self.client_address)
+                hub.acceptEncodings.append(self.headers.get("Accept-Encoding"))
+                length = int(self.headers.get("Content-Length") or 0)
+                if length:
+                    self.rfile.read(length)
+                if self.path == "/session" and self.command == "POST":
+                    hub.sessions += 1
+                    value = {"sessionId": f"s{hub.sessions}", "capabilities": {"browserName": "chrome"}}
+                elif self.path.endswith("/title"):
+                    time.sleep(hub.delay)
+                    value = "Fixture " * 50
+                else:
+                    value = None
+                body = json.dumps({"value": value}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                if "gzip" in (self.headers.get("Accept-Encoding") or ""):
+                    body = gzip.compress(body)
+                    self.send_header("Content-Encoding", "gzip")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        # the read timeout test hangs up before the stalled response is written
+        self.server.handle_error = lambda request, client_address: None
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def hub():
+    hub = FakeHub()
+    yield hub
+    hub.stop()
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    metrics.reset()
+    yield
+
+
+def _remote(transport, hub):
+    return webdriver.Remote(command_executor=transport.connection(hub.url), options=webdriver.ChromeOptions())
+
+
+class Test_remotetransport:
+
+    def test_sessions_share_keep_alive_connections(self, hub, monkeypatch):
+        monkeypatch.delenv("HTTP_PROXY", raising=False)
+        monkeypatch.delenv("http_proxy", raising=False)
+        transport = RemoteTransport(load_settings({}))
+        first = _remote(transport, hub)
+        assert first.title.startswith("Fixture")
+        first.quit()
+        second = _remote(transport, hub)
+        assert second.title.startswith("Fixture")
+        second.quit()
+        # quitting the first session did not tear the pool down
+        assert len(hub.connections) == 1
+        assert transport.report()["commands"]["newSession"]["newConnections"] == 1
+
+    def test_compression_is_requested_and_decoded(self, hub):
+        transport = RemoteTransport(load_settings({"REMOTE_COMPRESSION": "1"}))
+        driver = _remote(transport, hub)
+        assert driver.title == "Fixture " * 50
+        driver.quit()
+        assert all(encoding == "gzip, deflate" for encoding in hub.acceptEncodings)
+
+    def test_read_timeout_applies(self):
+        hub = FakeHub(delay=1)
+        try:
+            transport = RemoteTransport(load_settings({"REMOTE_READ_TIMEOUT": "0.2"}))
+            driver = _remote(transport, hub)
+            start = time.monotonic()
+            with pytest.raises(urllib3.exceptions.MaxRetryError) as raised:
+                driver.title
+            assert isinstance(raised.value.reason, urllib3.exceptions.ReadTimeoutError)
+            # not retried: the command may still be running in the browser
+            assert time.monotonic() - start < 0.6
+        finally:
+            hub.stop()
+
+    def test_browser_time_is_first_byte_above_the_floor(self):
+        transport = RemoteTransport(load_settings({}))
+        transport.record("status", "hub:4444", firstByte=0.002, total=0.003)
+        transport.record("getTitle", "hub:4444", firstByte=0.052, total=0.054)
+        # a new connection's handshake does not lower or raise the floor
+        transport.record("getTitle", "hub:4444", firstByte=0.010, total=0.012, newConnections=1)
+        title = transport.report()["commands"]["getTitle"]
+        assert title["count"] == 2
+        assert title["browserSeconds"] == pytest.approx(0.050 + 0.008)
+        assert title["wireSeconds"] == pytest.approx(0.004 + 0.004)
+        assert title["newConnections"] == 1
+        assert metrics.counter("automdjango_remote_connections_total", {"host": "hub:4444"}) == 1
+        assert metrics.histogram("automdjango_remote_command_wire_seconds", {"command": "getTitle"}).count == 2
+
+    def test_pool_size_covers_concurrent_commands(self):
+        assert RemoteTransport(load_settings({})).poolSize == 10
+        assert RemoteTransport(load_settings({"DRIVER_POOL_SIZE": "16"})).poolSize == 16
+        assert RemoteTransport(load_settings({"DRIVER_POOL_SIZE": "6", "REMOTE_POOL_SIZE": "3"})).poolSize == 3
+
+    def test_concurrent_sessions_reuse_pooled_connections(self, monkeypatch):
+        monkeypatch.delenv("HTTP_PROXY", raising=False)
+        monkeypatch.delenv("http_proxy", raising=False)
+        hub = FakeHub(delay=0.05)
+        try:
+            transport = RemoteTransport(load_settings({}))
+            drivers = [_remote(transport, hub) for _ in range(4)]
+            threads = [threading.Thread(target=lambda d=d: [d.title for _ in range(5)]) for d in drivers]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            pool = transport.manager.connection_from_url(hub.url)
+            # every connection the burst needed went back into the pool instead of being closed
+            assert sum(1 for connection in list(pool.pool.queue) if connection is not None) == 4
+            for driver in drivers:
+                driver.quit()
+        finally:
+            hub.stop()
+
+    def test_cdp_command_is_registered_once_per_session(self, hub, monkeypatch):
+        added = []
+        original = PooledRemoteConnection.add_command
+        monkeypatch.setattr(PooledRemoteConnection, "add_command",
+                            lambda self, name, *args: (added.append(name), original(self, name, *args)))
+        settings = load_settings({"SELENIUM_REMOTE_URL": hub.url, "GRID_WAIT_FOR_SLOT": "0"})
+        driver = RemoteBackend().start(webdriver.ChromeOptions(), settings, StartupProfiler())
+        monkeypatch.setattr(DriverPreparation, "_DriverPreparation__initializeDriver",
+                            lambda self: setattr(self, "driver", driver))
+        session = DriverPreparation(settings)
+        for _ in range(3):
+            session.execute_cdp_cmd("Browser.getVersion")
+        session.quit()
+        assert added == ["executeCdpCommand"]
+        assert hub.sessions == 1
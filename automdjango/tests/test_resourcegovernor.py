@@ -0,0 +1,127 @@
+import os
+import pytest
+from selenium.common import WebDriverException
+from automdjango.srcode.drivers import driverpreparation
+from automdjango.srcode.drivers.driverpreparation import DriverPreparation
+from automdjango.srcode.drivers.instrumentation import metrics
+from automdjango.srcode.drivers.resourcegovernor import (
+    MB,
+    ResourceGovernor,
+    process_tree,
+    process_tree_usage,
+    resolve_resource_profile,
+)
+from automdjango.srcode.runtimesettings import load_settings
+
+
+class FakeCdp:
+
+    def __init__(self, heapMb=50, nodes=1200, fail=False):
+        self.heapMb = heapMb
+        self.nodes = nodes
+        self.fail = fail
+        self.calls = []
+
+    def __call__(self, cmd, params):
+        self.calls.append(cmd)
+        if self.fail:
+            raise WebDriverException("Performance domain unavailable")
+        if cmd == "Performance.getMetrics":
+            return {"metrics": [
+                {"name": "JSHeapUsedSize", "value": self.heapMb * MB},
+                {"name": "JSHeapTotalSize", "value": 2 * self.heapMb * MB},
+                {"name": "Nodes", "value": self.nodes},
+                {"name": "Documents", "value": 3},
+            ]}
+        return {}
+
+
+class FakeBrowser:
+
+    def __init__(self, cdp: FakeCdp):
+        self.session_id = "abcd1234efgh"
+        self.execute_cdp_cmd = cdp
+        self.visited = []
+        self.quit_called = False
+
+    def get(self, url):
+        self.visited.append(url)
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+class Test_resourcegovernor:
+
+    def test_dense_profile_caps_heap_and_renderers(self):
+        args = resolve_resource_profile("dense").chrome_args()
+        assert "--js-flags=--max-old-space-size=512" in args
+        assert "--renderer-process-limit=2" in args
+        assert resolve_resource_profile("default").chrome_args() == []
+
+    def test_unknown_profile_is_rejected_by_settings(self):
+        with pytest.raises(Exception, match="RESOURCE_PROFILE"):
+            load_settings({"RESOURCE_PROFILE": "tiny"})
+
+    def test_sample_publishes_gauges_and_enables_performance_once(self):
+        governor = ResourceGovernor(load_settings({}))
+        cdp = FakeCdp()
+        sample = governor.sample("abcd1234", cdp)
+        governor.sample("abcd1234", cdp)
+        assert sample.jsHeapUsed == 50 * MB and sample.domNodes == 1200
+        assert cdp.calls.count("Performance.enable") == 1
+        assert metrics.gauge("automdjango_session_js_heap_bytes", {"session": "abcd1234"}) == 50 * MB
+        governor.forget("abcd1234")
+        assert metrics.gauge("automdjango_session_js_heap_bytes", {"session": "abcd1234"}) is None
+
+    def test_check_reports_exceeded_limits(self):
+        governor = ResourceGovernor(load_settings({"RESOURCE_MAX_JS_HEAP_MB": "100"}))
+        assert governor.check("s", FakeCdp(heapMb=80)) == []
+        assert governor.check("s", FakeCdp(heapMb=150)) == ["js_heap 150MB > 100MB"]
+        assert metrics.counter("automdjango_session_limit_exceeded_total", {"limit": "js_heap"}) == 1
+
+    def test_missing_performance_domain_is_not_a_violation(self):
+        governor = ResourceGovernor(load_settings({"RESOURCE_MAX_JS_HEAP_MB": "1"}))
+        assert governor.check("s", FakeCdp(fail=True)) == []
+
+    @pytest.mark.skipif(not os.path.isdir("/proc"), reason="needs /proc")
+    def test_process_tree_usage_covers_the_current_process(self):
+        assert process_tree(os.getpid())[0] == os.getpid()
+        rss, cpu = process_tree_usage(os.getpid())
+        assert rss > 0 and cpu >= 0
+        governor = ResourceGovernor(load_settings({"RESOURCE_MAX_RSS_MB": "1"}))
+        governor.sample("local", FakeCdp(), pid=os.getpid())
+        second = governor.sample("local", FakeCdp(), pid=os.getpid())
+        assert second.cpuPercent is not None
+        assert governor.violations(second)[0].startswith("rss ")
+
+    def test_standalone_session_is_relaunched_between_tests_not_mid_test(self, monkeypatch):
+        browsers = [FakeBrowser(FakeCdp(heapMb=150)), FakeBrowser(FakeCdp(heapMb=50))]
+        monkeypatch.setattr(DriverPreparation, "_DriverPreparation__initializeDriver",
+                            lambda self: setattr(self, "driver", browsers.pop(0)))
+        session = DriverPreparation(load_settings({"RESOURCE_MAX_JS_HEAP_MB": "100"}))
+        first = session.driver
+        session.navigateTo("https://example.com/next")
+        assert session.driver is first and not first.quit_called
+        assert session.relaunch_if_over_limits()
+        assert first.quit_called
+        assert session.driver is not first and session.relaunches == 1
+        assert not session.relaunch_if_over_limits()
+        assert session.relaunches == 1
+
+    def test_quit_keeps_a_user_supplied_profile(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(DriverPreparation, "_DriverPreparation__initializeDriver",
+                            lambda self: setattr(self, "driver", FakeBrowser(FakeCdp())))
+        session = DriverPreparation(load_settings({"USER_DATA_DIR": str(tmp_path)}))
+        session.user_data_dir = str(tmp_path)
+        discarded = []
+        monkeypatch.setattr(driverpreparation.reaper, "discard", discarded.append)
+        session.quit()
+        assert discarded == [] and tmp_path.is_dir()
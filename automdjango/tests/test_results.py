@@ -0,0 +1,114 @@
+import json
+from datetime import timedelta
+import pytest
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment
+from django.utils import timezone
+
+
+@pytest.fixture(scope="module")
+def models(django_app):
+    from automdjango.results import models
+
+    return models
+
+
+@pytest.fixture(scope="module")
+def database(models):
+    """A throwaway test database (shared-cache in-memory SQLite, visible to the flush thread)"""
+    setup_test_environment()
+    name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    yield name
+    connection.creation.destroy_test_db(name, verbosity=0)
+    teardown_test_environment()
+
+
+@pytest.fixture
+def run(database, models):
+    run = models.TestRun.objects.create(key="run-1", name="nightly")
+    yield run
+    models.TestRun.objects.all().delete()
+
+
+class Test_results:
+
+    def test_recorder_writes_batches_with_steps_and_artifacts(self, run, models):
+        from automdjango.results.recorder import ResultRecorder
+
+        recorder = ResultRecorder(run, batch_size=50, flush_interval=0.05)
+        for index in range(120):
+            recorder.record(
+                f"tests/test_a.py::test_{index % 3}", "passed", 0.5, worker="gw0",
+                steps=[("open", 0.1), ("search", 0.4)],
+                artifacts=[{"kind": "screenshot", "path": f"/tmp/{index}.png", "sha256": "ab" * 32, "size": 10}],
+            )
+        recorder.close()
+
+        assert recorder.written == 120
+        assert models.TestCaseResult.objects.filter(run=run).count() == 120
+        assert models.StepTiming.objects.filter(result__run=run).count() == 240
+        assert models.Artifact.objects.filter(result__run=run).count() == 120
+        assert list(models.TestCaseResult.objects.first().steps.values_list("name", flat=True)) == ["open", "search"]
+        run.refresh_from_db()
+        assert run.finished_at is not None
+
+    def test_workers_join_the_same_run_by_key(self, run):
+        from automdjango.results.recorder import ResultRecorder
+
+        first = ResultRecorder.for_run(key="run-1")
+        second = ResultRecorder.for_run(key="run-1")
+        from automdjango.results import recorder
+
+        assert {first, second} <= recorder._open
+        first.close()
+        second.close()
+        assert first.run.pk == second.run.pk == run.pk
+        # closed recorders leave the shared exit hook
+        assert not {first, second} & recorder._open
+
+    def test_stats_report_pass_rate_and_p95_per_test_and_day(self, run, models):
+        now = timezone.now()
+        rows = [
+            models.TestCaseResult(run=run, nodeid="t::a", outcome="passed", duration=float(seconds), started_at=now)
+            for seconds in range(1, 20)
+        ]
+        rows.append(models.TestCaseResult(run=run, nodeid="t::a", outcome="failed", duration=20.0, started_at=now))
+        rows.append(models.TestCaseResult(run=run, nodeid="t::b", outcome="skipped", duration=0.0, started_at=now))
+        rows += [models.TestCaseResult(run=run, nodeid="t::c", outcome="passed", duration=seconds, started_at=now)
+                 for seconds in (3.0, 1.0)]
+        rows.append(models.TestCaseResult(run=run, nodeid="t::a", outcome="passed", duration=1.0,
+                                          started_at=now - timedelta(days=30)))
+        models.TestCaseResult.objects.bulk_create(rows)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = Client().get("/results/api/tests/stats/", {"bucket": "day"})
+        assert response.status_code == 200
+        # the groups and one pass over their durations, however many groups there are
+        assert len(queries) <= 2
+        tests = {test["nodeid"]: test["series"] for test in json.loads(response.content)["tests"]}
+        [point] = tests["t::a"]
+        assert point["total"] == 20
+        assert point["passRate"] == 0.95
+        assert point["p95Duration"] == pytest.approx(19.05)
+        assert tests["t::b"][0]["passRate"] is None
+        assert tests["t::c"][0]["p95Duration"] == pytest.approx(2.9)
+
+    def test_stats_reject_unknown_buckets(self, database):
+        assert Client().get("/results/api/tests/stats/", {"bucket": "week"}).status_code == 400
+
+    def test_runs_list_outcome_counts(self, run, models):
+        models.TestCaseResult.objects.bulk_create([
+            models.TestCaseResult(run=run, nodeid="t::a", outcome="passed", duration=1.0),
+            models.TestCaseResult(run=run, nodeid="t::b", outcome="error", duration=1.0),
+        ])
+        [listed] = json.loads(Client().get("/results/api/runs/").content)["runs"]
+        assert (listed["key"], listed["passed"], listed["failed"]) == ("run-1", 1, 1)
+        assert Client().get("/results/api/runs/missing/").status_code == 404
+
+    def test_runs_limit_is_validated_and_clamped(self, run):
+        assert Client().get("/results/api/runs/", {"limit": "abc"}).status_code == 400
+        for limit in ("-5", "0", "1000"):
+            response = Client().get("/results/api/runs/", {"limit": limit})
+            assert response.status_code == 200
+            assert len(json.loads(response.content)["runs"]) == 1
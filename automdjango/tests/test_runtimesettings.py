@@ -0,0 +1,72 @@
+import dataclasses
+import pytest
+from automdjango.srcode.custom_exceptions.invalid_setting_exception import InvalidSettingException
+from automdjango.srcode.drivers.driverpool import DriverPool
+from automdjango.srcode.runtimesettings import get_settings, load_settings, reload_settings
+
+
+class Test_runtimesettings:
+
+    def test_defaults_when_environment_is_empty(self):
+        settings = load_settings({})
+        assert settings.enableStealth is False
+        assert settings.setAcceptLanguage is True
+        assert settings.waitTimeout == 10.0
+        assert settings.loadBlockPatterns == ()
+        assert settings.networkEvents is False
+
+    def test_network_events_follow_network_idle_or_har(self):
+        assert load_settings({"ENABLE_NETWORK_EVENTS": "1"}).networkEvents
+        assert load_settings({"HAR_DIR": "/tmp/har"}).networkEvents
+        assert load_settings({"LOAD_PROFILE": "no-media"}).networkEvents
+        assert load_settings({"LOAD_BLOCK_PATTERNS": "*.css"}).networkEvents
+        assert not load_settings({"LOAD_PROFILE": "full"}).networkEvents
+
+    def test_flags_accept_one_spelling_set_case_insensitively(self):
+        settings = load_settings({"ENABLE_STEALTH": "TRUE", "INCOGNITO": "on", "LOCATOR_CACHE": "No"})
+        assert settings.enableStealth and settings.incognito
+        assert settings.locatorCache is False
+
+    @pytest.mark.parametrize("environ", [
+        {"ENABLE_STEALTH": "maybe"},
+        {"WAIT_TIMEOUT": "soon"},
+        {"PAGE_LOAD_STRATEGY": "lazy"},
+        {"LOAD_PROFILE": "text-only"},
+        {"ENABLE_RECAPTCHA_SOLVER": "1"},
+    ])
+    def test_misconfiguration_fails_fast(self, environ):
+        with pytest.raises(InvalidSettingException):
+            load_settings(environ)
+
+    def test_settings_are_immutable_and_overridable_per_session(self):
+        settings = load_settings({})
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            settings.incognito = True
+        variant = settings.override(incognito=True, driverPoolSize=3)
+        assert variant.incognito and not settings.incognito
+        with pytest.raises(InvalidSettingException):
+            settings.override(driverPoolSize=0)
+
+    def test_report_masks_secrets(self):
+        report = load_settings({"ENABLE_RECAPTCHA_SOLVER": "1", "RECAPTCHA_API_KEY": "secret"}).report()
+        assert report["ENABLE_RECAPTCHA_SOLVER"] is True
+        assert report["RECAPTCHA_API_KEY"] == "***"
+
+    def test_settings_are_resolved_once_per_process(self, monkeypatch):
+        first = get_settings()
+        monkeypatch.setenv("WAIT_TIMEOUT", "3")
+        assert get_settings() is first
+        assert reload_settings().waitTimeout == 3.0
+
+    def test_pool_passes_its_settings_to_every_session(self):
+        created = []
+
+        def factory(settings=None):
+            created.append(settings)
+            return object()
+
+        settings = load_settings({}).override(incognito=True, driverPoolSize=2)
+        pool = DriverPool(factory=factory, settings=settings)
+        pool.warm()
+        assert pool.size == 2
+        assert created == [settings, settings]
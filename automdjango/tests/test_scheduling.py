@@ -0,0 +1,41 @@
+import json
+from automdjango.srcode.plugins.parallel_runner import shard_items
+from automdjango.srcode.plugins.scheduling import DurationStore, WorkQueue, lpt_partition
+
+DURATIONS = {"slow": 30.0, "mid": 12.0, "a": 10.0, "b": 9.0, "c": 8.0, "d": 1.0}
+
+
+class Test_scheduling:
+
+    def test_lpt_balances_estimated_time_not_test_counts(self):
+        shards = lpt_partition(list(DURATIONS), 2, DURATIONS.get)
+        loads = sorted(sum(DURATIONS[key] for key in shard) for shard in shards)
+        assert shards == [["slow", "c"], ["mid", "a", "b", "d"]] and loads == [32.0, 38.0]
+        assert shard_items(list(DURATIONS), 0, 2, DURATIONS.get) == (["slow", "c"], ["mid", "a", "b", "d"])
+
+    def test_durations_are_smoothed_and_merged_across_workers(self, tmp_path):
+        path = str(tmp_path / "durations.json")
+        first = DurationStore(path)
+        first.observe("t::a", 4.0)
+        first.observe("t::a", 2.0)  # setup + call of the same test
+        first.save()
+        second = DurationStore(path)
+        second.observe("t::a", 2.0)
+        second.observe("t::b", 1.0)
+        second.save()
+        with open(path) as handle:
+            assert json.load(handle) == {"t::a": 4.0, "t::b": 1.0}
+        assert DurationStore(path).estimate("t::new") == 2.5
+
+    def test_idle_workers_steal_from_the_most_loaded_queue(self, tmp_path):
+        path = str(tmp_path / "queue.json")
+        fast, slow = WorkQueue(path, 0, 2), WorkQueue(path, 1, 2)
+        fast.initialize(list(DURATIONS), DURATIONS.get)
+        slow.initialize(["ignored"], lambda nodeid: 1.0)  # the first plan wins
+        assert fast.claim() == "slow"
+        claimed = [slow.claim() for _ in range(2)]
+        assert claimed == ["mid", "a"]
+        assert fast.claim() == "c"
+        assert fast.claim() == "d"  # fast drained its own queue: steal the tail of the other
+        assert fast.stolen == 1
+        assert [slow.claim(), slow.claim(), fast.claim()] == ["b", None, None]
@@ -0,0 +1,111 @@
+import pytest
+from automdjango.srcode.drivers.driverpreparation import DriverPreparation
+from automdjango.srcode.drivers.sessionreset import frame_origins, origin_of
+
+
+class FakeSwitch:
+
+    def __init__(self, browser):
+        self.browser = browser
+
+    def window(self, handle):
+        self.browser.current_window_handle = handle
+
+
+class FakeChrome:
+
+    def __init__(self):
+        self.window_handles = ["main"]
+        self.current_window_handle = "main"
+        self.urls = {"main": "about:blank"}
+        self.switch_to = FakeSwitch(self)
+        self.cdp = []
+        self.cookies = []
+
+    @property
+    def current_url(self):
+        return self.urls[self.current_window_handle]
+
+    def get(self, url):
+        self.urls[self.current_window_handle] = url
+
+    def open_tab(self, url):
+        self.window_handles.append("popup")
+        self.urls["popup"] = url
+
+    def close(self):
+        self.window_handles.remove(self.current_window_handle)
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.cdp.append((cmd, params))
+        if cmd == "Page.getFrameTree":
+            return {"frameTree": {"frame": {"url": self.current_url},
+                                  "childFrames": [{"frame": {"url": "https://ads.example.net/frame"}}]}}
+        if cmd == "Page.addScriptToEvaluateOnNewDocument":
+            return {"identifier": "7"}
+        if cmd == "Browser.getVersion":
+            return {"userAgent": "Mozilla/5.0 HeadlessChrome"}
+        if cmd == "Network.clearBrowserCookies":
+            self.cookies = []
+        if cmd == "Network.getAllCookies":
+            return {"cookies": self.cookies}
+        if cmd == "Storage.getUsageAndQuota":
+            return {"usageBreakdown": [{"storageType": "indexeddb", "usage": 0}]}
+        return {}
+
+
+@pytest.fixture
+def session(monkeypatch):
+    browser = FakeChrome()
+    monkeypatch.setattr(DriverPreparation, "_DriverPreparation__initializeDriver",
+                        lambda self: setattr(self, "driver", browser))
+    return DriverPreparation()
+
+
+class Test_sessionreset:
+
+    def test_reset_clears_state_of_every_visited_origin_and_closes_tabs(self, session):
+        browser = session.driver
+        session.navigateTo("https://shop.example.com/cart")
+        browser.open_tab("https://login.example.org/")
+        browser.cookies = [{"domain": ".example.com"}]
+
+        assert session.reset(verify=True) == []
+
+        commands = [cmd for cmd, _ in browser.cdp]
+        cleared = sorted(params["origin"] for cmd, params in browser.cdp if cmd == "Storage.clearDataForOrigin")
+        assert browser.window_handles == ["main"] and browser.current_url == "about:blank"
+        assert "https://shop.example.com" in cleared and "https://login.example.org" in cleared
+        assert "https://ads.example.net" in cleared
+        assert {"Network.clearBrowserCookies", "Network.clearBrowserCache", "Browser.resetPermissions"} <= set(commands)
+
+    def test_overrides_issued_by_the_test_are_undone(self, session):
+        browser = session.driver
+        session.execute_cdp_cmd("Emulation.setDeviceMetricsOverride", {"width": 400, "height": 800})
+        session.execute_cdp_cmd("Network.setUserAgentOverride", {"userAgent": "robot"})
+        session.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": "1"})
+        browser.cdp.clear()
+        session.reset()
+        assert ("Emulation.clearDeviceMetricsOverride", {}) in browser.cdp
+        assert ("Network.setUserAgentOverride", {"userAgent": "Mozilla/5.0 HeadlessChrome"}) in browser.cdp
+        assert ("Page.removeScriptToEvaluateOnNewDocument", {"identifier": "7"}) in browser.cdp
+
+        browser.cdp.clear()
+        session.reset()
+        assert not [cmd for cmd, _ in browser.cdp if cmd.startswith("Emulation.")]
+
+    def test_verification_reports_leaks(self, session, monkeypatch):
+        browser = session.driver
+        monkeypatch.setattr(browser, "close", lambda: None)  # a tab that refuses to close
+        browser.open_tab("https://example.com/")
+        original = browser.execute_cdp_cmd
+        monkeypatch.setattr(browser, "execute_cdp_cmd", lambda cmd, params: (
+            {"cookies": [{"domain": "example.com"}]} if cmd == "Network.getAllCookies" else original(cmd, params)
+        ))
+        leaks = session.reset(verify=True)
+        assert leaks == ["1 extra tabs still open", "1 cookies left (example.com)"]
+
+    def test_origins(self):
+        assert origin_of("https://www.google.com.sa/search?q=java") == "https://www.google.com.sa"
+        assert origin_of("about:blank") is None
+        assert frame_origins({"frameTree": {"frame": {"url": "http://a.test/x"}}}) == {"http://a.test"}
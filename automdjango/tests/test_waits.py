@@ -0,0 +1,102 @@
+import json
+import pytest
+from selenium.common import NoSuchElementException, TimeoutException, WebDriverException
+from automdjango.srcode.drivers import waits
+from automdjango.srcode.drivers.waits import WaitEngine
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class FakeWebDriver:
+
+    def __init__(self):
+        self.title = ""
+        self.elementAfterPolls = None
+        self.polls = 0
+        self.logs = []
+
+    def find_element(self, by, value):
+        self.polls += 1
+        if self.elementAfterPolls is None or self.polls < self.elementAfterPolls:
+            raise NoSuchElementException(value)
+        return object()
+
+    def get_log(self, logType):
+        return self.logs.pop(0) if self.logs else []
+
+
+def _network_event(method, requestId):
+    return {"message": json.dumps({"message": {"method": method, "params": {"requestId": requestId}}})}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(waits.time, "monotonic", fake.monotonic)
+    monkeypatch.setattr(waits.time, "sleep", fake.sleep)
+    return fake
+
+
+class Test_waits:
+
+    def test_presence_returns_as_soon_as_element_appears(self, clock):
+        driver = FakeWebDriver()
+        driver.elementAfterPolls = 3
+        engine = WaitEngine(driver, timeout=5)
+        assert engine.presence(("id", "q")) is not None
+        assert driver.polls == 3
+        assert clock.now < 0.5
+
+    def test_poll_interval_grows_up_to_the_cap(self, clock):
+        engine = WaitEngine(FakeWebDriver(), timeout=3, min_poll=0.1, max_poll=0.4)
+        with pytest.raises(TimeoutException):
+            engine.presence(("id", "missing"))
+        assert clock.sleeps[:4] == pytest.approx([0.1, 0.15, 0.225, 0.3375])
+        assert max(clock.sleeps) == pytest.approx(0.4)
+
+    def test_metrics_record_latency_and_timeouts(self, clock):
+        driver = FakeWebDriver()
+        driver.title = "java - Search"
+        engine = WaitEngine(driver, timeout=1)
+        engine.title_contains("java")
+        with pytest.raises(TimeoutException):
+            engine.title_contains("python")
+        stats = engine.metrics.stats()["title_contains"]
+        assert stats["count"] == 2
+        assert stats["timeouts"] == 1
+        assert stats["max"] == pytest.approx(1.0)
+
+    def test_network_idle_waits_for_inflight_requests(self, clock):
+        driver = FakeWebDriver()
+        driver.logs = [
+            [_network_event("Network.requestWillBeSent", "1")],
+            [],
+            [_network_event("Network.loadingFinished", "1")],
+        ]
+        engine = WaitEngine(driver, timeout=10)
+        assert engine.network_idle(idle_time=0.5)
+        assert engine.metrics.stats()["network_idle"]["count"] == 1
+
+    def test_network_idle_falls_back_to_dom_quiescence(self, clock, monkeypatch):
+        driver = FakeWebDriver()
+
+        def noPerformanceLog(logType):
+            raise WebDriverException("log type 'performance' not found")
+
+        driver.get_log = noPerformanceLog
+        driver.execute_script = lambda script: 1000
+        engine = WaitEngine(driver, timeout=1)
+        assert engine.network_idle(idle_time=0.5)
+        assert "dom_quiescent" in engine.metrics.stats()
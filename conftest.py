@@ -0,0 +1,13 @@
+import logging
+
+# Root conftest so the plugins are registered before command-line handling, whichever directory pytest is pointed at
+pytest_plugins = [
+    "automdjango.srcode.plugins.parallel_runner",
+    "automdjango.srcode.plugins.results_recorder",
+    "automdjango.srcode.plugins.artifact_capture",
+]
+
+
+def pytest_configure(config):
+    # driver modules only log; the entry point decides where the messages go
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
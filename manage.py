@@ -2,13 +2,16 @@
 """Django's command-line utility for administrative tasks."""
 import os
 import sys
+import logging
 
-from automdjango.tests.test_examine import Test_examine, driver
 
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "automdjango.settings")
+    from django.core.management import execute_from_command_line
+
+    execute_from_command_line(sys.argv)
 
-def main(driver):
-    Test_examine().test_main_program(driver)
 
 if __name__ == '__main__':
-    m_instance_driver = Test_examine().drivernation()
-    main(m_instance_driver)
+    main()
@@ -1,28 +1,100 @@
 import os
-from jproperties import Properties
+import threading
 import configparser
+from dataclasses import dataclass
+from types import MappingProxyType
+
+DEFAULT_SECTION = "details"
+CONFIG_FIELDS = ("browserName", "protocol", "url", "path")
+
+
+@dataclass(frozen=True, slots=True)
+class SiteConfig:
+    """Parsed, immutable view of configinfo.properties for one environment."""
+    browserName: str
+    protocol: str
+    url: str
+    path: str
+    environment: str
+    sections: MappingProxyType
+
+    @property
+    def website(self) -> str:
+        return self.protocol + self.url + self.path
+
+
+_cache = {}
+_cacheLock = threading.Lock()
+
+
+def config_path() -> str:
+    """AUTOMD_CONFIG, else configinfo.properties next to this module (independent of the working directory)."""
+    return os.environ.get("AUTOMD_CONFIG") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "configinfo.properties")
+
+
+def _parse(path: str, environment: str) -> SiteConfig:
+    parser = configparser.RawConfigParser()
+    if not parser.read(path):
+        raise FileNotFoundError(f"Config file not found: {path}")
+    if environment != DEFAULT_SECTION and not parser.has_section(environment):
+        raise KeyError(f"Environment section [{environment}] is not defined in {path}")
+
+    values = dict(parser.items(DEFAULT_SECTION)) if parser.has_section(DEFAULT_SECTION) else {}
+    if environment != DEFAULT_SECTION:
+        values.update(parser.items(environment))
+    for field in CONFIG_FIELDS:
+        # environment variables win, e.g. AUTOMD_URL=www.example.com
+        override = os.environ.get(f"AUTOMD_{field.upper()}")
+        if override is not None:
+            values[field.lower()] = override
+    missing = [field for field in CONFIG_FIELDS if field.lower() not in values]
+    if missing:
+        raise KeyError(f"Missing config keys {missing} for environment [{environment}] in {path}")
+
+    sections = MappingProxyType({
+        section: MappingProxyType(dict(parser.items(section))) for section in parser.sections()
+    })
+    return SiteConfig(environment=environment, sections=sections, **{field: values[field.lower()] for field in CONFIG_FIELDS})
+
+
+def load_config(environment: str = None, path: str = None) -> SiteConfig:
+    """Process-wide cached config; the file is re-parsed only when its mtime changes.
+
+    ``environment`` (default AUTOMD_ENV, else ``details``) names a section whose keys
+    override ``[details]``.
+    """
+    path = path or config_path()
+    environment = environment or os.environ.get("AUTOMD_ENV", DEFAULT_SECTION)
+    overlays = tuple(os.environ.get(f"AUTOMD_{field.upper()}") for field in CONFIG_FIELDS)
+    key = (path, environment, overlays)
+    mtime = os.stat(path).st_mtime_ns
+    with _cacheLock:
+        cached = _cache.get(key)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        config = _parse(path, environment)
+        _cache[key] = (mtime, config)
+        return config
+
 
 class PropertiesLoader:
-    properties = Properties()
-    configLoader = configparser.RawConfigParser()
-    browserName = ""
-    protocol=""
-    url=""
-    path=""
-
-    def __init__(self):
-        self.initializeProperties()
-        self.setBrowserName(self.getProperty('details','browserName'))
-        self.setProtocol(self.getProperty('details', 'protocol'))
-        self.setUrl(self.getProperty('details', 'url'))
-        self.setPath(self.getProperty('details', 'path'))
-
-    def initializeProperties(self):
-        configPath = "configinfo.properties"
-        self.configLoader.read(configPath)
+    """Getter-style access to the cached SiteConfig, kept for existing callers."""
+
+    def __init__(self, environment: str = None):
+        self.config = load_config(environment)
+        self.browserName = self.config.browserName
+        self.protocol = self.config.protocol
+        self.url = self.config.url
+        self.path = self.config.path
 
     def getProperty(self, section, option) -> str:
-        return self.configLoader.get(section,option)
+        if section not in self.config.sections:
+            raise configparser.NoSectionError(section)
+        try:
+            # option names are case-insensitive, as with RawConfigParser
+            return self.config.sections[section][option.lower()]
+        except KeyError:
+            raise configparser.NoOptionError(option, section)
 
 
     def getBrowserName(self) -> str:
@@ -61,4 +133,4 @@ class PropertiesLoader:
             print("Path is not defined")
 
     def getWebsite(self) -> str:
-        return self.getProtocol()+self.getUrl()+self.getPath()
\ No newline at end of file
+        return self.getProtocol()+self.getUrl()+self.getPath()